@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CatalogConfig(AppConfig):
     name = 'catalog'
+
+    def ready(self) -> None:
+        from catalog import signals  # noqa: F401, PLC0415
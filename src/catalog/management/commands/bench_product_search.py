@@ -0,0 +1,76 @@
+import random
+import statistics
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from catalog.models import Brand, Category, Product
+from catalog.services.search import IcontainsBackend, SearchBackend, get_backend
+from utils.perf import Stopwatch, throwaway_transaction
+
+WORDS = (
+    "arroz feijao macarrao azeite oleo acucar cafe leite iogurte queijo manteiga pao biscoito "
+    "chocolate suco refrigerante agua sabao detergente amaciante shampoo condicionador "
+    "integral tradicional light zero organico premium familia economica tipo parboilizado"
+).split()
+QUERIES = ("arroz", "cafe tradicional", "choc", "leite integral", "sabao premium", "xyz")
+SYLLABLES = (
+    "ba be bi bo bu ca ce ci co cu da de di do du fa fe fi fo fu la le li lo lu ma me".split()
+)
+
+
+class Command(BaseCommand):
+    help = "Compara a busca indexada de produtos com a busca ingênua por icontains."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--products", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rng = random.Random(options["seed"])
+        with throwaway_transaction():
+            self._seed(rng, options["products"])
+            indexed = get_backend()
+            for backend in (IcontainsBackend(), indexed):
+                self._measure(backend, options["repeat"])
+
+    def _seed(self, rng: random.Random, count: int) -> None:
+        brands = Brand.objects.bulk_create(
+            [Brand(name=f"Marca {word}", description="") for word in WORDS[:10]]
+        )
+        categories = Category.objects.bulk_create(
+            [Category(name=f"Categoria {word}", description="") for word in WORDS[10:20]]
+        )
+        # Catálogos reais têm vocabulário amplo: palavras sintéticas tornam os termos seletivos.
+        vocabulary = [*WORDS, *("".join(rng.sample(SYLLABLES, 3)) for _ in range(5_000))]
+        stopwatch = Stopwatch()
+        Product.objects.bulk_create(
+            (
+                Product(
+                    name=" ".join(rng.sample(vocabulary, 3)),
+                    description=" ".join(rng.sample(vocabulary, 8)),
+                    price=rng.randint(100, 10_000) / 100,
+                    sku=f"BENCH-{i}",
+                    barcode=f"BENCH-{i}",
+                    brand=rng.choice(brands),
+                    category=rng.choice(categories),
+                )
+                for i in range(count)
+            ),
+            batch_size=5_000,
+        )
+        get_backend().rebuild()
+        self.stdout.write(f"{count} produtos semeados e indexados em {stopwatch.elapsed:.2f}s")
+
+    def _measure(self, backend: SearchBackend, repeat: int) -> None:
+        self.stdout.write(type(backend).__name__)
+        for query in QUERIES:
+            timings = []
+            for _ in range(repeat):
+                stopwatch = Stopwatch()
+                backend.search(query, limit=20)
+                timings.append(stopwatch.elapsed * 1000)
+            self.stdout.write(
+                f"  {query!r:>20}: p50 {statistics.median(timings):.2f}ms, max {max(timings):.2f}ms"
+            )
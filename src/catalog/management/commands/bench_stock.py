@@ -0,0 +1,94 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections, connections
+
+from catalog.models import Product
+from catalog.services import stock
+from utils.perf import Stopwatch
+
+SKU_PREFIX = "BENCH-STOCK-"
+
+
+def _naive_checkout(quantities: dict[int, int]) -> None:
+    # O padrão antigo: lê, confere e grava o saldo em Python (perde atualizações concorrentes).
+    for product_id, quantity in quantities.items():
+        product = Product.objects.get(pk=product_id)
+        if product.stock >= quantity:
+            product.stock -= quantity
+            product.save(update_fields=["stock"])
+
+
+MODES = {"naive": _naive_checkout, "atomic": stock.decrement}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a vazão de baixas de estoque concorrentes sobre os mesmos SKUs e confere se "
+        "houve atualizações perdidas. Grava e remove produtos BENCH-STOCK-* (use um banco "
+        "de teste em arquivo ou PostgreSQL)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--orders", type=int, default=200, help="Pedidos por worker")
+        parser.add_argument("--hot-skus", type=int, default=5)
+        parser.add_argument("--items", type=int, default=3, help="Itens por pedido")
+        parser.add_argument("--mode", choices=[*MODES, "all"], default="all")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        modes = list(MODES) if options["mode"] == "all" else [options["mode"]]
+        for mode in modes:
+            self._run(mode, options)
+
+    def _run(self, mode: str, options: dict[str, Any]) -> None:
+        workers, orders, items = options["workers"], options["orders"], options["items"]
+        initial = workers * orders * items  # nunca falta: toda baixa deveria entrar
+        product_ids = [
+            product.pk
+            for product in Product.objects.bulk_create(
+                Product(
+                    name=f"Bench {i}",
+                    description="",
+                    price=1,
+                    sku=f"{SKU_PREFIX}{i}",
+                    barcode=f"{SKU_PREFIX}{i}",
+                    stock=initial,
+                )
+                for i in range(options["hot_skus"])
+            )
+        ]
+        checkout = MODES[mode]
+
+        def worker(seed: int) -> int:
+            rng = random.Random(seed)
+            taken = 0
+            try:
+                for _ in range(orders):
+                    picked = rng.sample(product_ids, min(items, len(product_ids)))
+                    checkout(dict.fromkeys(picked, 1))
+                    taken += len(picked)
+            finally:
+                close_old_connections()
+                connections.close_all()
+            return taken
+
+        try:
+            stopwatch = Stopwatch()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                taken = sum(pool.map(worker, range(workers)))
+            elapsed = stopwatch.elapsed
+            remaining = sum(
+                Product.objects.filter(pk__in=product_ids).values_list("stock", flat=True)
+            )
+        finally:
+            Product.objects.filter(sku__startswith=SKU_PREFIX).delete()
+
+        lost = remaining - (initial * len(product_ids) - taken)
+        self.stdout.write(
+            f"{mode:>7}: {workers * orders / elapsed:,.0f} pedidos/s "
+            f"({workers} workers x {orders} pedidos em {elapsed:.2f}s), "
+            f"atualizações perdidas: {lost}"
+        )
@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from catalog.services.basket import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_BASKET,
+    DEFAULT_MIN_ORDERS,
+    DEFAULT_TOP_K,
+    rebuild,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula os produtos comprados juntos (top-K por produto) a partir dos itens de "
+        "pedidos não cancelados e substitui a tabela de produtos relacionados."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+        parser.add_argument(
+            "--min-orders",
+            type=int,
+            default=DEFAULT_MIN_ORDERS,
+            help="Pedidos em comum mínimos para relacionar dois produtos",
+        )
+        parser.add_argument("--max-basket", type=int, default=DEFAULT_MAX_BASKET)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        report = rebuild(
+            top_k=options["top_k"],
+            min_orders=options["min_orders"],
+            max_basket=options["max_basket"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.orders} pedidos, {report.products} produtos, {report.pairs} pares: "
+                f"{report.rows_written} relações gravadas em {report.elapsed_seconds:.2f}s"
+            )
+        )
@@ -0,0 +1,44 @@
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from catalog.services.importer import DEFAULT_CHUNK_SIZE, ProductImporter
+from utils.records import ImportFormat, iter_records
+
+
+class Command(BaseCommand):
+    help = "Importa produtos de um arquivo CSV ou NDJSON (upsert por SKU), em lotes."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--format", choices=[f.value for f in ImportFormat], default=None)
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: Path = options["path"]
+        if not path.is_file():
+            msg = f"Arquivo não encontrado: {path}"
+            raise CommandError(msg)
+        fmt = ImportFormat(options["format"]) if options["format"] else None
+        fmt = fmt or ImportFormat.from_filename(path.name)
+
+        try:
+            importer = ProductImporter(chunk_size=options["chunk_size"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        with path.open(encoding="utf-8-sig", newline="") as stream:
+            report = importer.run(iter_records(stream, fmt))
+
+        for error in report.errors:
+            self.stderr.write(f"linha {error.line} [{error.key}]: {error.message}")
+        if report.error_count > len(report.errors):
+            self.stderr.write(f"... e mais {report.error_count - len(report.errors)} erros")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.rows_upserted}/{report.rows_read} produtos importados "
+                f"em {report.elapsed_seconds:.2f}s ({report.rows_per_second:.0f} linhas/s), "
+                f"{report.brands_created} marcas e {report.categories_created} categorias criadas"
+            )
+        )
@@ -0,0 +1,23 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog.services.search import get_backend
+from utils.perf import Stopwatch
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o índice de busca de produtos a partir do catálogo."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        backend = get_backend()
+        stopwatch = Stopwatch()
+        with transaction.atomic():
+            backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Índice de busca ({type(backend).__name__}) reconstruído em "
+                f"{stopwatch.elapsed:.2f}s"
+            )
+        )
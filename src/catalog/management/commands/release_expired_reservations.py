@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from catalog.services.stock import release_expired
+
+
+class Command(BaseCommand):
+    help = "Devolve ao estoque as reservas ativas que já expiraram (agende via cron)."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        released = release_expired()
+        self.stdout.write(self.style.SUCCESS(f"{released} reservas expiradas liberadas"))
@@ -0,0 +1,48 @@
+from decimal import Decimal
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from catalog.services.repricing import DEFAULT_CHUNK_SIZE, PriceRule, reprice
+
+
+class Command(BaseCommand):
+    help = (
+        "Reajusta preços por percentual, filtrando por categoria e/ou marca "
+        "(ex.: --category 3 --percentage 5). Use --dry-run para só ver a diferença."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--percentage", type=Decimal, required=True)
+        parser.add_argument("--category", type=int, default=None)
+        parser.add_argument("--brand", type=int, default=None)
+        parser.add_argument("--reason", default="")
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            rule = PriceRule(
+                percentage=options["percentage"],
+                category_id=options["category"],
+                brand_id=options["brand"],
+            )
+            report = reprice(
+                [rule],
+                dry_run=options["dry_run"],
+                reason=options["reason"],
+                chunk_size=options["chunk_size"],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["verbosity"] > 1:
+            for change in report.changes:
+                self.stdout.write(f"{change.product_id}: {change.old_price} -> {change.new_price}")
+        prefix = "[dry-run] " if report.dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{report.products_changed}/{report.products_matched} preços alterados "
+                f"em {report.elapsed_seconds:.2f}s (total {report.old_total} -> {report.new_total})"
+            )
+        )
@@ -0,0 +1,92 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:58
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS catalog_product_fts USING fts5(
+        name, brand, category, description,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS catalog_product_fts"]
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE TABLE IF NOT EXISTS catalog_product_search (
+        product_id integer PRIMARY KEY REFERENCES catalog_product (id) ON DELETE CASCADE,
+        document tsvector NOT NULL,
+        body text NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS catalog_product_search_document_idx "
+    "ON catalog_product_search USING gin (document)",
+    "CREATE INDEX IF NOT EXISTS catalog_product_search_body_trgm_idx "
+    "ON catalog_product_search USING gin (body gin_trgm_ops)",
+]
+POSTGRES_BACKWARD = ["DROP TABLE IF EXISTS catalog_product_search"]
+
+# Carga inicial congelada aqui: a migração não depende do código atual da busca.
+SOURCE = """
+    SELECT p.id, p.name, COALESCE(b.name, ''), COALESCE(c.name, ''), p.description
+    FROM {product} p
+    LEFT JOIN {brand} b ON b.id = p.brand_id
+    LEFT JOIN {category} c ON c.id = p.category_id
+"""
+POPULATE = {
+    "sqlite": [
+        "DELETE FROM catalog_product_fts",
+        "INSERT INTO catalog_product_fts (rowid, name, brand, category, description) " + SOURCE,
+    ],
+    "postgresql": [
+        """
+        INSERT INTO catalog_product_search (product_id, document, body)
+        SELECT id,
+               setweight(to_tsvector('portuguese', name), 'A')
+               || setweight(to_tsvector('portuguese', brand), 'B')
+               || setweight(to_tsvector('portuguese', category), 'C')
+               || setweight(to_tsvector('portuguese', description), 'D'),
+               lower(name || ' ' || brand || ' ' || category)
+        FROM ("""
+        + SOURCE
+        + """) AS src (id, name, brand, category, description)
+        ON CONFLICT (product_id) DO UPDATE
+        SET document = EXCLUDED.document, body = EXCLUDED.body
+        """,
+    ],
+}
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+def populate(apps, schema_editor):
+    tables = {
+        name.lower(): apps.get_model('catalog', name)._meta.db_table
+        for name in ('Product', 'Brand', 'Category')
+    }
+    for statement in POPULATE.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement.format(**tables))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
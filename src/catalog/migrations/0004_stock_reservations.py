@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:53
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_product_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockReservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='Token')),
+                ('reference', models.CharField(blank=True, max_length=255, verbose_name='Referência')),
+                ('status', models.CharField(choices=[('ACTIVE', 'Ativa'), ('CONFIRMED', 'Confirmada'), ('RELEASED', 'Liberada'), ('EXPIRED', 'Expirada')], default='ACTIVE', max_length=20, verbose_name='Status')),
+                ('expires_at', models.DateTimeField(verbose_name='Expira em')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Data de criação')),
+            ],
+            options={
+                'verbose_name': 'Reserva de estoque',
+                'verbose_name_plural': 'Reservas de estoque',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='stock_reservation_expiry_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockReservationItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(verbose_name='Quantidade')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='catalog.product', verbose_name='Produto')),
+                ('reservation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='catalog.stockreservation', verbose_name='Reserva')),
+            ],
+            options={
+                'verbose_name': 'Item da reserva',
+                'verbose_name_plural': 'Itens da reserva',
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:56
+
+from django.db import migrations, models
+from django.db.models import Count
+
+DIMENSION_FIELDS = {
+    'category': 'category_id',
+    'brand': 'brand_id',
+    'status': 'status',
+    'unit': 'unit',
+}
+
+
+def populate(apps, schema_editor):
+    Product = apps.get_model('catalog', 'Product')
+    ProductFacetCount = apps.get_model('catalog', 'ProductFacetCount')
+    ProductFacetCount.objects.bulk_create(
+        ProductFacetCount(dimension=dimension, value='' if value is None else str(value), count=count)
+        for dimension, field in DIMENSION_FIELDS.items()
+        for value, count in Product.objects.order_by().values_list(field).annotate(count=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_stock_reservations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('category', 'Categoria'), ('brand', 'Marca'), ('status', 'Status'), ('unit', 'Unidade')], max_length=20, verbose_name='Dimensão')),
+                ('value', models.CharField(blank=True, max_length=255, verbose_name='Valor')),
+                ('count', models.IntegerField(default=0, verbose_name='Quantidade')),
+            ],
+            options={
+                'verbose_name': 'Contagem de faceta',
+                'verbose_name_plural': 'Contagens de facetas',
+                'ordering': ['dimension', '-count'],
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'value'), name='product_facet_unique')],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
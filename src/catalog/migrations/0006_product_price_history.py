@@ -0,0 +1,32 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:57
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0005_product_facet_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductPriceHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('old_price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Preço anterior')),
+                ('new_price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Novo preço')),
+                ('reason', models.CharField(blank=True, max_length=255, verbose_name='Motivo')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Data da alteração')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_history', to='catalog.product', verbose_name='Produto')),
+            ],
+            options={
+                'verbose_name': 'Histórico de preço',
+                'verbose_name_plural': 'Históricos de preço',
+                'ordering': ['-changed_at'],
+                'indexes': [models.Index(fields=['product', 'changed_at'], name='price_history_product_idx')],
+            },
+        ),
+    ]
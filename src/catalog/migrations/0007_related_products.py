@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_product_price_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Posição')),
+                ('orders', models.PositiveIntegerField(verbose_name='Pedidos em comum')),
+                ('confidence', models.FloatField(verbose_name='Confiança')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_products', to='catalog.product', verbose_name='Produto')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='catalog.product', verbose_name='Produto relacionado')),
+            ],
+            options={
+                'verbose_name': 'Produto relacionado',
+                'verbose_name_plural': 'Produtos relacionados',
+                'ordering': ['product', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('product', 'rank'), name='related_product_rank_unique')],
+            },
+        ),
+    ]
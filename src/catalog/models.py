@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import uuid
+
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -90,6 +93,135 @@ class Product(models.Model):
         verbose_name = _("Produto")
         verbose_name_plural = _("Produtos")
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["created_at", "id"], name="product_keyset_idx")]
 
     def __str__(self) -> str:
         return f"{self.name} - {self.category!s}"
+
+
+class StockReservation(models.Model):
+    class Status(models.TextChoices):
+        ACTIVE = "ACTIVE", _("Ativa")
+        CONFIRMED = "CONFIRMED", _("Confirmada")
+        RELEASED = "RELEASED", _("Liberada")
+        EXPIRED = "EXPIRED", _("Expirada")
+
+    token = models.UUIDField(_("Token"), unique=True, default=uuid.uuid4, editable=False)
+    reference = models.CharField(_("Referência"), max_length=255, blank=True)
+    status = models.CharField(
+        _("Status"), max_length=20, choices=Status.choices, default=Status.ACTIVE
+    )
+    expires_at = models.DateTimeField(_("Expira em"))
+    created_at = models.DateTimeField(_("Data de criação"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Reserva de estoque")
+        verbose_name_plural = _("Reservas de estoque")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "expires_at"], name="stock_reservation_expiry_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.token} - {self.status}"
+
+
+class StockReservationItem(models.Model):
+    reservation = models.ForeignKey[StockReservation](
+        StockReservation,
+        on_delete=models.CASCADE,
+        related_name="items",
+        verbose_name=_("Reserva"),
+    )
+    product = models.ForeignKey[Product](
+        Product,
+        on_delete=models.CASCADE,
+        related_name="reservations",
+        verbose_name=_("Produto"),
+    )
+    quantity = models.PositiveIntegerField(_("Quantidade"))
+
+    class Meta:
+        verbose_name = _("Item da reserva")
+        verbose_name_plural = _("Itens da reserva")
+
+    def __str__(self) -> str:
+        return f"{self.product_id} x {self.quantity}"
+
+
+class ProductFacetCount(models.Model):
+    class Dimension(models.TextChoices):
+        CATEGORY = "category", _("Categoria")
+        BRAND = "brand", _("Marca")
+        STATUS = "status", _("Status")
+        UNIT = "unit", _("Unidade")
+
+    dimension = models.CharField(_("Dimensão"), max_length=20, choices=Dimension.choices)
+    # Id da categoria/marca ou valor do campo; vazio para produtos sem categoria/marca.
+    value = models.CharField(_("Valor"), max_length=255, blank=True)
+    count = models.IntegerField(_("Quantidade"), default=0)
+
+    class Meta:
+        verbose_name = _("Contagem de faceta")
+        verbose_name_plural = _("Contagens de facetas")
+        ordering = ["dimension", "-count"]
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "value"], name="product_facet_unique")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.dimension}={self.value}: {self.count}"
+
+
+class ProductPriceHistory(models.Model):
+    product = models.ForeignKey[Product](
+        Product,
+        on_delete=models.CASCADE,
+        related_name="price_history",
+        verbose_name=_("Produto"),
+    )
+    old_price = models.DecimalField(_("Preço anterior"), max_digits=10, decimal_places=2)
+    new_price = models.DecimalField(_("Novo preço"), max_digits=10, decimal_places=2)
+    reason = models.CharField(_("Motivo"), max_length=255, blank=True)
+    changed_at = models.DateTimeField(_("Data da alteração"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Histórico de preço")
+        verbose_name_plural = _("Históricos de preço")
+        ordering = ["-changed_at"]
+        indexes = [models.Index(fields=["product", "changed_at"], name="price_history_product_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.product_id}: {self.old_price} -> {self.new_price}"
+
+
+class RelatedProduct(models.Model):
+    """Top-K produtos comprados junto com ``product``, por pedidos em comum; recalculado em lote."""
+
+    product = models.ForeignKey[Product](
+        Product,
+        on_delete=models.CASCADE,
+        related_name="related_products",
+        verbose_name=_("Produto"),
+    )
+    related = models.ForeignKey[Product](
+        Product,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Produto relacionado"),
+    )
+    rank = models.PositiveSmallIntegerField(_("Posição"))
+    orders = models.PositiveIntegerField(_("Pedidos em comum"))
+    # Fração dos pedidos de ``product`` que também levaram ``related``.
+    confidence = models.FloatField(_("Confiança"))
+
+    class Meta:
+        verbose_name = _("Produto relacionado")
+        verbose_name_plural = _("Produtos relacionados")
+        ordering = ["product", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["product", "rank"], name="related_product_rank_unique")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.product_id} -> {self.related_id} (#{self.rank}, {self.orders})"
@@ -0,0 +1,147 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from ninja import Field, Schema
+
+from catalog.services.importer import DEFAULT_CHUNK_SIZE, MAX_CHUNK_SIZE
+from catalog.services.repricing import MIN_PERCENTAGE
+from utils.records import ImportFormat
+
+
+class ProductImportInput(Schema):
+    # Sem formato informado, vale a extensão do arquivo.
+    fmt: ImportFormat | None = None
+    chunk_size: int = Field(DEFAULT_CHUNK_SIZE, gt=0, le=MAX_CHUNK_SIZE)
+
+
+class ImportRowErrorSchema(Schema):
+    line: int
+    sku: str = Field(..., alias="key")
+    message: str
+
+
+class ImportReportSchema(Schema):
+    rows_read: int
+    rows_upserted: int
+    error_count: int
+    brands_created: int
+    categories_created: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: list[ImportRowErrorSchema]
+
+
+class BarcodeProductSchema(Schema):
+    id: int
+    barcode: str
+    sku: str
+    name: str
+    price: Decimal
+    unit: str
+    status: str
+
+
+class CacheStatsSchema(Schema):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_ratio: float
+
+
+class ProductSchema(Schema):
+    id: int
+    name: str
+    sku: str
+    barcode: str
+    price: Decimal
+    stock: int
+    status: str
+    unit: str
+    brand_id: int | None
+    category_id: int | None
+    created_at: datetime
+
+
+class RelatedProductSchema(Schema):
+    id: int = Field(..., alias="related_id")
+    name: str = Field(..., alias="related.name")
+    sku: str = Field(..., alias="related.sku")
+    price: Decimal = Field(..., alias="related.price")
+    rank: int
+    orders: int
+    confidence: float
+
+
+class ProductSearchInput(Schema):
+    q: str = Field(..., min_length=1, max_length=200)
+    page: int = Field(1, gt=0)
+    page_size: int = Field(20, gt=0, le=100)
+
+
+class ProductSearchHitSchema(ProductSchema):
+    brand_name: str | None = Field(None, alias="brand.name")
+    category_name: str | None = Field(None, alias="category.name")
+    rank: float
+
+
+class ProductSearchPageSchema(Schema):
+    page: int
+    page_size: int
+    has_next: bool
+    results: list[ProductSearchHitSchema]
+
+
+class StockItemSchema(Schema):
+    product_id: int
+    quantity: int = Field(..., gt=0)
+
+
+class StockReservationInput(Schema):
+    items: list[StockItemSchema] = Field(..., min_length=1)
+    ttl_seconds: int = Field(900, gt=0, le=86_400)
+    reference: str = Field("", max_length=255)
+
+
+class StockReservationSchema(Schema):
+    token: UUID
+    reference: str
+    status: str
+    expires_at: datetime
+
+
+class ProductFacetsSchema(Schema):
+    category: dict[str, int]
+    brand: dict[str, int]
+    status: dict[str, int]
+    unit: dict[str, int]
+
+
+class PriceRuleSchema(Schema):
+    percentage: Decimal = Field(..., gt=MIN_PERCENTAGE, max_digits=7, decimal_places=3)
+    category_id: int | None = None
+    brand_id: int | None = None
+
+
+class RepricingInput(Schema):
+    rules: list[PriceRuleSchema] = Field(..., min_length=1)
+    dry_run: bool = False
+    reason: str = Field("", max_length=255)
+
+
+class PriceChangeSchema(Schema):
+    product_id: int
+    old_price: Decimal
+    new_price: Decimal
+
+
+class RepricingReportSchema(Schema):
+    dry_run: bool
+    products_matched: int
+    products_changed: int
+    old_total: Decimal
+    new_total: Decimal
+    elapsed_seconds: float
+    changes: list[PriceChangeSchema]
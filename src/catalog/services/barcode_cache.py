@@ -0,0 +1,54 @@
+"""Per-worker LRU of compact product records for POS barcode scans."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.conf import settings
+
+from catalog.models import Product
+from utils.lru import LRUCache
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from decimal import Decimal
+
+DEFAULT_SIZE = 50_000
+DEFAULT_TTL = 300.0
+
+
+class BarcodeRecord(NamedTuple):
+    # Estoque fica de fora: muda a cada venda e é atualizado sem passar por save().
+    id: int
+    barcode: str
+    sku: str
+    name: str
+    price: Decimal
+    unit: str
+    status: str
+
+
+RECORD_FIELDS = BarcodeRecord._fields
+
+cache: LRUCache[str, BarcodeRecord] = LRUCache(
+    maxsize=getattr(settings, "BARCODE_CACHE_SIZE", DEFAULT_SIZE),
+    ttl=getattr(settings, "BARCODE_CACHE_TTL", DEFAULT_TTL),
+)
+
+
+def lookup(code: str) -> BarcodeRecord | None:
+    """Return the product scanned as ``code``, hitting the database only on a cache miss."""
+    record = cache.get(code)
+    if record is not None:
+        return record
+    row = Product.objects.filter(barcode=code).values_list(*RECORD_FIELDS).first()
+    if row is None:
+        return None
+    record = BarcodeRecord(*row)
+    cache.set(code, record)
+    return record
+
+
+def invalidate(barcodes: Iterable[str]) -> None:
+    for barcode in barcodes:
+        cache.delete(barcode)
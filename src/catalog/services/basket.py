@@ -0,0 +1,199 @@
+"""Market-basket co-occurrence: "frequently bought together" products, computed offline.
+
+Order items are streamed as ``(order_id, product_id)`` rows sorted by order, a chunk at a time;
+live and archived items are read as two sorted streams and merged (archived orders keep their
+ids, so the two never share an order).
+Within each chunk the pairs of every basket are generated at once with NumPy (one
+``triu_indices`` per basket size) and encoded as single int64 keys ``a << 32 | b`` with
+``a < b``; a :class:`PairCounter` keeps the sparse counts as sorted key/count arrays, compacted
+with ``np.unique`` instead of a Python dict. The top-K of every product is then ranked in one
+``lexsort`` and stored in ``RelatedProduct``, so serving is a single indexed lookup.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from dataclasses import dataclass
+from itertools import batched
+
+import numpy as np
+from django.db import transaction
+
+from catalog.models import RelatedProduct
+from sales.models import ArchivedOrderItem, Order, OrderItem
+from utils.perf import Stopwatch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_TOP_K = 10
+DEFAULT_MIN_ORDERS = 2
+# Pedidos maiores que isso (atacado, inventário) geram pares demais e pouco sinal: ficam de fora.
+DEFAULT_MAX_BASKET = 50
+KEY_SHIFT = 32
+KEY_MASK = (1 << KEY_SHIFT) - 1
+
+
+class PairCounter:
+    """Sparse symmetric counts of product pairs, backed by parallel NumPy arrays.
+
+    Added arrays pile up until they outgrow both ``compact_every`` and the compacted arrays, so
+    every compaction at least doubles what it merges and the total work stays linear.
+    """
+
+    def __init__(self, compact_every: int = 5_000_000) -> None:
+        self.compact_every = compact_every
+        self._keys: list[np.ndarray] = []
+        self._counts: list[np.ndarray] = []
+        self._compacted = 0
+        self._pending = 0
+
+    def add(self, keys: np.ndarray) -> None:
+        if not len(keys):
+            return
+        keys, counts = np.unique(keys, return_counts=True)
+        self._keys.append(keys)
+        self._counts.append(counts)
+        self._pending += len(keys)
+        if self._pending >= max(self.compact_every, self._compacted):
+            self.compact()
+
+    def compact(self) -> tuple[np.ndarray, np.ndarray]:
+        """Merge the pending arrays into one sorted ``(keys, counts)`` pair and return it."""
+        if not self._keys:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        keys, inverse = np.unique(np.concatenate(self._keys), return_inverse=True)
+        counts = np.bincount(inverse, weights=np.concatenate(self._counts)).astype(np.int64)
+        self._keys, self._counts = [keys], [counts]
+        self._compacted = len(keys)
+        self._pending = 0
+        return keys, counts
+
+
+def basket_pairs(orders: np.ndarray, products: np.ndarray, max_basket: int) -> np.ndarray:
+    """Pair keys of every basket in ``orders``/``products``, which must be sorted by order."""
+    starts = np.flatnonzero(np.r_[True, orders[1:] != orders[:-1]])
+    sizes = np.diff(np.r_[starts, len(orders)])
+    pairs = []
+    for size in np.unique(sizes):
+        if size < 2 or size > max_basket:  # noqa: PLR2004
+            continue
+        first, second = np.triu_indices(size, 1)
+        offsets = starts[sizes == size][:, None]
+        pairs.append((products[offsets + first] << KEY_SHIFT | products[offsets + second]).ravel())
+    return np.concatenate(pairs) if pairs else np.empty(0, dtype=np.int64)
+
+
+@dataclass(slots=True)
+class BasketReport:
+    orders: int = 0
+    products: int = 0
+    pairs: int = 0
+    rows_written: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def rebuild(
+    *,
+    top_k: int = DEFAULT_TOP_K,
+    min_orders: int = DEFAULT_MIN_ORDERS,
+    max_basket: int = DEFAULT_MAX_BASKET,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BasketReport:
+    """Recount co-occurrences over non-cancelled orders and replace ``RelatedProduct``."""
+    stopwatch = Stopwatch()
+    report = BasketReport()
+    counter = PairCounter()
+    support: dict[int, int] = {}
+    rows = heapq.merge(
+        *(
+            model.objects.exclude(order__status=Order.Status.CANCELLED)
+            .order_by("order_id", "product_id")
+            .values_list("order_id", "product_id")
+            .distinct()
+            .iterator(chunk_size=chunk_size)
+            for model in (OrderItem, ArchivedOrderItem)
+        )
+    )
+    carry = np.empty((0, 2), dtype=np.int64)
+    for chunk in batched(rows, chunk_size):
+        block = np.concatenate([carry, np.array(chunk, dtype=np.int64)])
+        # O último pedido do bloco pode continuar no próximo: fica para a próxima volta.
+        last = np.searchsorted(block[:, 0], block[-1, 0])
+        block, carry = block[:last], block[last:]
+        _count(block, counter, support, max_basket, report)
+    _count(carry, counter, support, max_basket, report)
+
+    keys, counts = counter.compact()
+    report.pairs = len(keys)
+    report.products = len(support)
+    related = _top(keys, counts, support, top_k, min_orders)
+    with transaction.atomic():
+        RelatedProduct.objects.all().delete()
+        for batch in batched(related, 5_000):
+            report.rows_written += len(RelatedProduct.objects.bulk_create(batch))
+
+    report.elapsed_seconds = stopwatch.elapsed
+    logger.info(
+        "Related products: %d orders, %d pairs, %d rows in %.2fs",
+        report.orders,
+        report.pairs,
+        report.rows_written,
+        report.elapsed_seconds,
+    )
+    return report
+
+
+def _count(
+    block: np.ndarray,
+    counter: PairCounter,
+    support: dict[int, int],
+    max_basket: int,
+    report: BasketReport,
+) -> None:
+    if not len(block):
+        return
+    orders, products = block[:, 0], block[:, 1]
+    report.orders += int(np.count_nonzero(np.r_[True, orders[1:] != orders[:-1]]))
+    ids, counts = np.unique(products, return_counts=True)
+    for product_id, count in zip(ids.tolist(), counts.tolist(), strict=True):
+        support[product_id] = support.get(product_id, 0) + count
+    counter.add(basket_pairs(orders, products, max_basket))
+
+
+def _top(
+    keys: np.ndarray,
+    counts: np.ndarray,
+    support: dict[int, int],
+    top_k: int,
+    min_orders: int,
+) -> list[RelatedProduct]:
+    frequent = counts >= min_orders
+    keys, counts = keys[frequent], counts[frequent]
+    first, second = keys >> KEY_SHIFT, keys & KEY_MASK
+    # Cada par vale nos dois sentidos.
+    source = np.concatenate([first, second])
+    target = np.concatenate([second, first])
+    together = np.concatenate([counts, counts])
+    order = np.lexsort((target, -together, source))
+    source, target, together = source[order], target[order], together[order]
+    starts = np.flatnonzero(np.r_[True, source[1:] != source[:-1]]) if len(source) else []
+    rank = np.arange(len(source)) - np.repeat(starts, np.diff(np.r_[starts, len(source)]))
+    keep = rank < top_k
+    return [
+        RelatedProduct(
+            product_id=product_id,
+            related_id=related_id,
+            rank=position + 1,
+            orders=orders,
+            confidence=orders / support[product_id],
+        )
+        for product_id, related_id, position, orders in zip(
+            source[keep].tolist(),
+            target[keep].tolist(),
+            rank[keep].tolist(),
+            together[keep].tolist(),
+            strict=True,
+        )
+    ]
@@ -0,0 +1,100 @@
+"""Product counts per category, brand, status and unit, maintained incrementally."""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from catalog.models import Product, ProductFacetCount
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+Dimension = ProductFacetCount.Dimension
+
+# Campo do produto que alimenta cada dimensão.
+DIMENSION_FIELDS = {
+    Dimension.CATEGORY: "category_id",
+    Dimension.BRAND: "brand_id",
+    Dimension.STATUS: "status",
+    Dimension.UNIT: "unit",
+}
+FACET_FIELDS = tuple(DIMENSION_FIELDS.values())
+
+
+class FacetKey(NamedTuple):
+    dimension: str
+    value: str
+
+
+def facet_keys(values: Mapping[str, object]) -> list[FacetKey]:
+    """Facet keys of one product given its ``FACET_FIELDS`` values."""
+    return [
+        FacetKey(dimension, "" if values[field] is None else str(values[field]))
+        for dimension, field in DIMENSION_FIELDS.items()
+    ]
+
+
+def product_values(product: Product) -> dict[str, object]:
+    return {field: getattr(product, field) for field in FACET_FIELDS}
+
+
+def diff(
+    before: Mapping[str, object] | None, after: Mapping[str, object] | None
+) -> Counter[FacetKey]:
+    """Deltas that move one product from ``before`` to ``after`` (``None`` = absent)."""
+    deltas: Counter[FacetKey] = Counter()
+    if before is not None:
+        deltas.subtract(facet_keys(before))
+    if after is not None:
+        deltas.update(facet_keys(after))
+    return deltas
+
+
+def apply(deltas: Counter[FacetKey] | Iterable[tuple[FacetKey, int]]) -> None:
+    """Add ``deltas`` to the stored counts with ``count = count + n`` updates."""
+    items = deltas.items() if isinstance(deltas, Counter) else deltas
+    for key, delta in items:
+        if not delta:
+            continue
+        rows = ProductFacetCount.objects.filter(dimension=key.dimension, value=key.value)
+        if rows.update(count=F("count") + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ProductFacetCount.objects.create(
+                    dimension=key.dimension, value=key.value, count=delta
+                )
+        except IntegrityError:
+            # Outro processo criou a linha entre o UPDATE e o INSERT.
+            rows.update(count=F("count") + delta)
+
+
+def rebuild() -> int:
+    """Recount everything from ``Product`` (one GROUP BY per dimension) and replace the table."""
+    rows = [
+        ProductFacetCount(dimension=key.dimension, value=key.value, count=count)
+        for dimension, field in DIMENSION_FIELDS.items()
+        for key, count in (
+            (FacetKey(dimension, "" if value is None else str(value)), count)
+            for value, count in Product.objects.order_by()
+            .values_list(field)
+            .annotate(count=Count("pk"))
+        )
+    ]
+    with transaction.atomic():
+        ProductFacetCount.objects.all().delete()
+        ProductFacetCount.objects.bulk_create(rows)
+    return len(rows)
+
+
+def snapshot() -> dict[str, dict[str, int]]:
+    """All non-zero counts as ``{dimension: {value: count}}``, read from the precomputed table."""
+    facets: dict[str, dict[str, int]] = {dimension: {} for dimension in Dimension.values}
+    rows = ProductFacetCount.objects.filter(count__gt=0).values_list("dimension", "value", "count")
+    for dimension, value, count in rows:
+        facets[dimension][value] = count
+    return facets
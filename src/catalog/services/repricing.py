@@ -0,0 +1,188 @@
+"""Bulk repricing: percentage rules applied chunk by chunk with one UPDATE per chunk."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, Q, Value, When
+from django.utils import timezone
+
+from catalog.models import Product, ProductPriceHistory
+from catalog.services import barcode_cache
+from utils.perf import Stopwatch
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 10_000
+MAX_REPORTED_CHANGES = 1_000
+CENT = Decimal("0.01")
+# Um desconto de 100% ou mais zeraria (ou negativaria) o preço.
+MIN_PERCENTAGE = Decimal(-100)
+
+
+@dataclass(slots=True, frozen=True)
+class PriceRule:
+    """Change the price of matching products by ``percentage`` (``-10`` = 10% off).
+
+    ``None`` filters match anything; a product matching several rules gets them all, in order.
+    """
+
+    percentage: Decimal
+    category_id: int | None = None
+    brand_id: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.percentage <= MIN_PERCENTAGE:
+            msg = f"O percentual precisa ser maior que {MIN_PERCENTAGE}"
+            raise ValueError(msg)
+
+    @property
+    def condition(self) -> Q:
+        condition = Q()
+        if self.category_id is not None:
+            condition &= Q(category_id=self.category_id)
+        if self.brand_id is not None:
+            condition &= Q(brand_id=self.brand_id)
+        return condition
+
+    def matches(self, category_id: int | None, brand_id: int | None) -> bool:
+        return (self.category_id is None or self.category_id == category_id) and (
+            self.brand_id is None or self.brand_id == brand_id
+        )
+
+    def apply(self, price: Decimal) -> Decimal:
+        return (price * (100 + self.percentage) / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@dataclass(slots=True, frozen=True)
+class PriceChange:
+    product_id: int
+    old_price: Decimal
+    new_price: Decimal
+
+
+@dataclass(slots=True)
+class RepricingReport:
+    dry_run: bool
+    products_matched: int = 0
+    products_changed: int = 0
+    old_total: Decimal = Decimal(0)
+    new_total: Decimal = Decimal(0)
+    elapsed_seconds: float = 0.0
+    # Only the first changes are kept; totals above cover all of them.
+    changes: list[PriceChange] = field(default_factory=list)
+
+
+def reprice(
+    rules: Sequence[PriceRule],
+    *,
+    dry_run: bool = False,
+    reason: str = "",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> RepricingReport:
+    """Apply ``rules`` to the catalog walking it in primary-key chunks.
+
+    New prices are computed in Python with exact decimal rounding, so a dry run reports the
+    very same diff a real run writes. A real run writes each chunk with one
+    ``UPDATE ... SET price = CASE id ... END`` plus one bulk INSERT of history rows.
+    """
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        msg = f"chunk_size deve estar entre 1 e {MAX_CHUNK_SIZE}"
+        raise ValueError(msg)
+    report = RepricingReport(dry_run=dry_run)
+    if not rules:
+        return report
+    stopwatch = Stopwatch()
+    products = Product.objects.order_by("pk")
+    conditions = [rule.condition for rule in rules]
+    # Uma regra sem filtro casa o catálogo inteiro (e Q() num OR seria simplesmente descartado).
+    if all(conditions):
+        matching = Q()
+        for condition in conditions:
+            matching |= condition
+        products = products.filter(matching)
+
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            chunk = products.filter(pk__gt=last_pk)
+            if not dry_run:
+                chunk = chunk.select_for_update()
+            rows = list(
+                chunk.values_list("pk", "price", "barcode", "category_id", "brand_id")[:chunk_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            changes, barcodes = _diff(rules, rows)
+            report.products_matched += len(rows)
+            _record(report, changes)
+            if changes and not dry_run:
+                _write(changes, reason)
+        if changes and not dry_run:
+            barcode_cache.invalidate(barcodes)
+
+    report.elapsed_seconds = stopwatch.elapsed
+    logger.info(
+        "Repricing%s: %d matched, %d changed in %.2fs",
+        " (dry run)" if dry_run else "",
+        report.products_matched,
+        report.products_changed,
+        report.elapsed_seconds,
+    )
+    return report
+
+
+def _diff(
+    rules: Sequence[PriceRule],
+    rows: list[tuple[int, Decimal, str, int | None, int | None]],
+) -> tuple[list[PriceChange], list[str]]:
+    changes: list[PriceChange] = []
+    barcodes: list[str] = []
+    for pk, price, barcode, category_id, brand_id in rows:
+        new_price = price
+        for rule in rules:
+            if rule.matches(category_id, brand_id):
+                new_price = rule.apply(new_price)
+        if new_price != price:
+            changes.append(PriceChange(pk, price, new_price))
+            barcodes.append(barcode)
+    return changes, barcodes
+
+
+def _record(report: RepricingReport, changes: list[PriceChange]) -> None:
+    report.products_changed += len(changes)
+    for change in changes:
+        report.old_total += change.old_price
+        report.new_total += change.new_price
+    room = MAX_REPORTED_CHANGES - len(report.changes)
+    report.changes.extend(changes[: max(room, 0)])
+
+
+def _write(changes: list[PriceChange], reason: str) -> None:
+    now = timezone.now()
+    Product.objects.filter(pk__in=[change.product_id for change in changes]).update(
+        price=Case(
+            *(When(pk=change.product_id, then=Value(change.new_price)) for change in changes),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        ),
+        updated_at=now,
+    )
+    ProductPriceHistory.objects.bulk_create(
+        ProductPriceHistory(
+            product_id=change.product_id,
+            old_price=change.old_price,
+            new_price=change.new_price,
+            reason=reason,
+            changed_at=now,
+        )
+        for change in changes
+    )
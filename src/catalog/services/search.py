@@ -0,0 +1,237 @@
+"""Ranked product search over a side index kept in sync with Product, Brand and Category.
+
+The backend follows the database picked by ``DATABASE_URL``: an FTS5 virtual table on SQLite,
+a tsvector + trigram table on PostgreSQL, and a plain ``icontains`` scan anywhere else (also
+used as the baseline by ``bench_product_search``).
+"""
+
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from itertools import batched
+from typing import TYPE_CHECKING, ClassVar
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from catalog.models import Product
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.db.backends.base.base import BaseDatabaseWrapper
+
+SQLITE_TABLE = "catalog_product_fts"
+POSTGRES_TABLE = "catalog_product_search"
+ID_BATCH_SIZE = 500
+
+# Texto indexado por produto: nome, marca, categoria e descrição (nessa ordem de peso).
+_SOURCE_SQL = """
+    SELECT p.id, p.name, COALESCE(b.name, ''), COALESCE(c.name, ''), p.description
+    FROM catalog_product p
+    LEFT JOIN catalog_brand b ON b.id = p.brand_id
+    LEFT JOIN catalog_category c ON c.id = p.category_id
+"""
+
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    product_id: int
+    rank: float
+
+
+def tokenize(query: str) -> list[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+class SearchBackend(ABC):
+    vendor: ClassVar[str] = ""
+
+    def __init__(self, conn: BaseDatabaseWrapper | None = None) -> None:
+        self.connection = conn or connection
+
+    @abstractmethod
+    def search(self, query: str, limit: int, offset: int = 0) -> list[SearchHit]: ...
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        """(Re)index the given products; ids that no longer exist are dropped from the index."""
+        for batch in batched(product_ids, ID_BATCH_SIZE):
+            placeholders = ", ".join(["%s"] * len(batch))
+            with transaction.atomic(using=self.connection.alias):
+                self._delete(f"{{pk}} IN ({placeholders})", batch)
+                self._insert(f"p.id IN ({placeholders})", batch)
+
+    def index_brand(self, brand_id: int) -> None:
+        self._reindex_where("p.brand_id = %s", [brand_id])
+
+    def index_category(self, category_id: int) -> None:
+        self._reindex_where("p.category_id = %s", [category_id])
+
+    def rebuild(self) -> None:
+        self._delete("1 = 1", [])
+        self._insert("1 = 1", [])
+
+    def _reindex_where(self, condition: str, params: list[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"SELECT p.id FROM catalog_product p WHERE {condition}", params)
+            ids = [row[0] for row in cursor.fetchall()]
+        self.index_products(ids)
+
+    @abstractmethod
+    def _delete(self, condition: str, params: Iterable[int]) -> None:
+        """Drop the index rows matching ``condition`` (``{pk}`` names the product id column)."""
+
+    @abstractmethod
+    def _insert(self, condition: str, params: Iterable[int]) -> None:
+        """Index the products of ``_SOURCE_SQL`` matching ``condition`` (aliased ``p``)."""
+
+
+class SqliteFtsBackend(SearchBackend):
+    vendor = "sqlite"
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        # Cada termo vira prefixo ("arr" casa "arroz"); todos precisam casar.
+        match = " ".join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+        sql = (
+            f"SELECT rowid, bm25({SQLITE_TABLE}, 10.0, 5.0, 3.0, 1.0) AS score "
+            f"FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s "
+            "ORDER BY score, rowid DESC LIMIT %s OFFSET %s"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [match, limit, offset])
+            # bm25 is "lower is better"; flip it so rank grows with relevance on every backend.
+            return [SearchHit(product_id, -score) for product_id, score in cursor.fetchall()]
+
+    def _delete(self, condition: str, params: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SQLITE_TABLE} WHERE {condition.format(pk='rowid')}",
+                list(params),
+            )
+
+    def _insert(self, condition: str, params: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, name, brand, category, description) "
+                f"{_SOURCE_SQL} WHERE {condition}",
+                list(params),
+            )
+
+
+class PostgresSearchBackend(SearchBackend):
+    vendor = "postgresql"
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        # Upsert instead of delete + insert: concurrent saves of one product would otherwise
+        # race on the primary key. Deleted products leave the index through ON DELETE CASCADE.
+        for batch in batched(product_ids, ID_BATCH_SIZE):
+            placeholders = ", ".join(["%s"] * len(batch))
+            self._insert(f"p.id IN ({placeholders})", batch)
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        tsquery = " & ".join(f"{token}:*" for token in tokens)
+        text = " ".join(tokens)
+        # tsvector ranks whole/prefix words; trigram similarity catches typos and word middles.
+        sql = (
+            "SELECT product_id, ts_rank(document, q) + similarity(body, %s) AS rank "
+            f"FROM {POSTGRES_TABLE}, to_tsquery('portuguese', %s) q "
+            "WHERE document @@ q OR body %% %s "
+            "ORDER BY rank DESC, product_id DESC LIMIT %s OFFSET %s"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, [text, tsquery, text, limit, offset])
+            return [SearchHit(product_id, float(rank)) for product_id, rank in cursor.fetchall()]
+
+    def _delete(self, condition: str, params: Iterable[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {POSTGRES_TABLE} WHERE {condition.format(pk='product_id')}",
+                list(params),
+            )
+
+    def _insert(self, condition: str, params: Iterable[int]) -> None:
+        sql = f"""
+            INSERT INTO {POSTGRES_TABLE} (product_id, document, body)
+            SELECT id,
+                   setweight(to_tsvector('portuguese', name), 'A')
+                   || setweight(to_tsvector('portuguese', brand), 'B')
+                   || setweight(to_tsvector('portuguese', category), 'C')
+                   || setweight(to_tsvector('portuguese', description), 'D'),
+                   lower(name || ' ' || brand || ' ' || category)
+            FROM ({_SOURCE_SQL} WHERE {condition}) AS src (id, name, brand, category, description)
+            ON CONFLICT (product_id) DO UPDATE
+            SET document = EXCLUDED.document, body = EXCLUDED.body
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, list(params))
+
+
+class IcontainsBackend(SearchBackend):
+    """Unindexed fallback: scans name/description/brand with ``icontains``, no ranking."""
+
+    def search(self, query: str, limit: int, offset: int = 0) -> list[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        condition = Q()
+        for token in tokens:
+            condition &= (
+                Q(name__icontains=token)
+                | Q(description__icontains=token)
+                | Q(brand__name__icontains=token)
+                | Q(category__name__icontains=token)
+            )
+        ids = Product.objects.filter(condition).order_by("-id").values_list("id", flat=True)
+        return [SearchHit(product_id, 0.0) for product_id in ids[offset : offset + limit]]
+
+    def index_products(self, product_ids: Iterable[int]) -> None:
+        pass
+
+    def index_brand(self, brand_id: int) -> None:
+        pass
+
+    def index_category(self, category_id: int) -> None:
+        pass
+
+    def rebuild(self) -> None:
+        pass
+
+    def _delete(self, condition: str, params: Iterable[int]) -> None:
+        pass
+
+    def _insert(self, condition: str, params: Iterable[int]) -> None:
+        pass
+
+
+BACKENDS: dict[str, type[SearchBackend]] = {
+    SqliteFtsBackend.vendor: SqliteFtsBackend,
+    PostgresSearchBackend.vendor: PostgresSearchBackend,
+}
+
+
+def get_backend(conn: BaseDatabaseWrapper | None = None) -> SearchBackend:
+    conn = conn or connection
+    return BACKENDS.get(conn.vendor, IcontainsBackend)(conn)
+
+
+def search_products(query: str, limit: int, offset: int = 0) -> list[Product]:
+    """Ranked products for ``query``, best match first, each with a ``rank`` attribute."""
+    hits = get_backend().search(query, limit, offset)
+    products = Product.objects.select_related("brand", "category").in_bulk(
+        [hit.product_id for hit in hits]
+    )
+    ranked = []
+    for hit in hits:
+        product = products.get(hit.product_id)
+        if product is not None:
+            product.rank = hit.rank  # type: ignore[attr-defined]
+            ranked.append(product)
+    return ranked
@@ -0,0 +1,152 @@
+"""Atomic stock movements: one conditional UPDATE per order instead of read-modify-write."""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from catalog.models import Product, StockReservation, StockReservationItem
+
+if TYPE_CHECKING:
+    import uuid
+    from collections.abc import Iterable, Mapping
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESERVATION_TTL = timedelta(minutes=15)
+
+
+class InsufficientStock(Exception):  # noqa: N818
+    def __init__(self, product_ids: list[int]) -> None:
+        self.product_ids = product_ids
+        super().__init__(f"Estoque insuficiente para os produtos {product_ids}")
+
+
+class ReservationNotActive(Exception):  # noqa: N818
+    """The reservation was already confirmed, released or expired."""
+
+
+def _normalize(quantities: Mapping[int, int] | Iterable[tuple[int, int]]) -> dict[int, int]:
+    """Merge repeated products and drop zero quantities."""
+    items = quantities.items() if isinstance(quantities, dict) else quantities
+    merged: Counter[int] = Counter()
+    for product_id, quantity in items:
+        if quantity < 0:
+            msg = "Quantidade não pode ser negativa"
+            raise ValueError(msg)
+        merged[product_id] += quantity
+    return {product_id: quantity for product_id, quantity in merged.items() if quantity}
+
+
+def _per_product(quantities: dict[int, int]) -> Case:
+    return Case(
+        *(When(pk=product_id, then=Value(qty)) for product_id, qty in quantities.items()),
+        output_field=IntegerField(),
+    )
+
+
+def decrement(quantities: Mapping[int, int] | Iterable[tuple[int, int]]) -> None:
+    """Take stock for every product in a single ``UPDATE ... WHERE stock >= n``, all or nothing.
+
+    The check and the write happen in the same statement, so concurrent callers can neither
+    oversell nor lose updates, and no row is locked longer than that statement. Raises
+    :class:`InsufficientStock` (rolling back the whole batch) if any product is short.
+    """
+    wanted = _normalize(quantities)
+    if not wanted:
+        return
+    amount = _per_product(wanted)
+    with transaction.atomic():
+        updated = Product.objects.filter(pk__in=wanted, stock__gte=amount).update(
+            stock=F("stock") - amount
+        )
+        if updated == len(wanted):
+            return
+        # Os produtos que tinham saldo já foram decrementados; desfaz o lote inteiro.
+        transaction.set_rollback(True)
+    stock = dict(Product.objects.filter(pk__in=wanted).values_list("pk", "stock"))
+    raise InsufficientStock(sorted(pk for pk, qty in wanted.items() if stock.get(pk, 0) < qty))
+
+
+def increment(quantities: Mapping[int, int] | Iterable[tuple[int, int]]) -> None:
+    """Give stock back in a single UPDATE (releases, cancellations, returns)."""
+    wanted = _normalize(quantities)
+    if wanted:
+        Product.objects.filter(pk__in=wanted).update(stock=F("stock") + _per_product(wanted))
+
+
+def reserve(
+    quantities: Mapping[int, int] | Iterable[tuple[int, int]],
+    ttl: timedelta = DEFAULT_RESERVATION_TTL,
+    reference: str = "",
+) -> StockReservation:
+    """Hold stock for a checkout until it is confirmed, released or expires."""
+    wanted = _normalize(quantities)
+    with transaction.atomic():
+        decrement(wanted)
+        reservation = StockReservation.objects.create(
+            reference=reference, expires_at=timezone.now() + ttl
+        )
+        StockReservationItem.objects.bulk_create(
+            StockReservationItem(reservation=reservation, product_id=product_id, quantity=qty)
+            for product_id, qty in wanted.items()
+        )
+    return reservation
+
+
+def _close(
+    token: uuid.UUID, status: StockReservation.Status, *, restock: bool, unexpired: bool = False
+) -> None:
+    active = StockReservation.objects.filter(token=token, status=StockReservation.Status.ACTIVE)
+    if unexpired:
+        active = active.filter(expires_at__gt=timezone.now())
+    with transaction.atomic():
+        # The status flip is the claim: only one caller (confirm, release or sweeper) wins it.
+        claimed = active.update(status=status)
+        if not claimed:
+            raise ReservationNotActive(str(token))
+        if restock:
+            increment(
+                StockReservationItem.objects.filter(reservation__token=token).values_list(
+                    "product_id", "quantity"
+                )
+            )
+
+
+def confirm(token: uuid.UUID) -> None:
+    """Turn the held stock into a sale; the stock was already taken when reserving."""
+    _close(token, StockReservation.Status.CONFIRMED, restock=False, unexpired=True)
+
+
+def release(token: uuid.UUID) -> None:
+    _close(token, StockReservation.Status.RELEASED, restock=True)
+
+
+def release_expired(now: datetime | None = None, batch_size: int = 500) -> int:
+    """Return the stock of every expired active reservation; safe to run from many workers."""
+    now = now or timezone.now()
+    released = 0
+    while True:
+        tokens = list(
+            StockReservation.objects.filter(
+                status=StockReservation.Status.ACTIVE, expires_at__lte=now
+            ).values_list("token", flat=True)[:batch_size]
+        )
+        if not tokens:
+            break
+        for token in tokens:
+            try:
+                _close(token, StockReservation.Status.EXPIRED, restock=True)
+            except ReservationNotActive:
+                continue
+            released += 1
+    if released:
+        logger.info("Released %d expired stock reservations", released)
+    return released
@@ -0,0 +1,92 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from catalog.models import Brand, Category, Product
+from catalog.services import barcode_cache, facets, search
+
+# Campos do produto que entram no índice de busca; saves de outros campos não reindexam.
+SEARCH_FIELDS = frozenset({"name", "description", "brand", "brand_id", "category", "category_id"})
+PREVIOUS_STATE_FIELDS = frozenset({"barcode", "brand", "category", *facets.FACET_FIELDS})
+
+
+@receiver(pre_save, sender=Product, dispatch_uid="catalog.product.pre_save")
+def remember_previous_state(sender: type[Product], instance: Product, **kwargs: Any) -> None:
+    instance._previous_state = None  # noqa: SLF001
+    update_fields = kwargs.get("update_fields")
+    if instance.pk is None or (
+        update_fields is not None and not PREVIOUS_STATE_FIELDS.intersection(update_fields)
+    ):
+        return
+    # Um código de barras trocado deixaria a entrada antiga servindo o produto errado, e as
+    # facetas precisam saber de onde o produto saiu.
+    instance._previous_state = (  # noqa: SLF001
+        sender.objects.filter(pk=instance.pk).values("barcode", *facets.FACET_FIELDS).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=Product, dispatch_uid="catalog.barcode_cache.invalidate")
+def invalidate_barcode_cache(sender: type[Product], instance: Product, **kwargs: Any) -> None:
+    previous = getattr(instance, "_previous_state", None) or {}
+    barcode_cache.invalidate(code for code in (instance.barcode, previous.get("barcode")) if code)
+
+
+@receiver(post_save, sender=Product, dispatch_uid="catalog.facets.post_save")
+def count_saved_product(
+    sender: type[Product], instance: Product, *, created: bool, **kwargs: Any
+) -> None:
+    previous = getattr(instance, "_previous_state", None)
+    if created or previous is not None:
+        facets.apply(facets.diff(previous, facets.product_values(instance)))
+
+
+@receiver(post_delete, sender=Product, dispatch_uid="catalog.facets.post_delete")
+def uncount_deleted_product(sender: type[Product], instance: Product, **kwargs: Any) -> None:
+    facets.apply(facets.diff(facets.product_values(instance), None))
+
+
+@receiver([post_save, post_delete], sender=Product, dispatch_uid="catalog.search.product")
+def reindex_product(sender: type[Product], instance: Product, **kwargs: Any) -> None:
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    search.get_backend().index_products([instance.pk])
+
+
+@receiver(post_save, sender=Brand, dispatch_uid="catalog.search.brand")
+def reindex_brand_products(sender: type[Brand], instance: Brand, **kwargs: Any) -> None:
+    search.get_backend().index_brand(instance.pk)
+
+
+@receiver(post_save, sender=Category, dispatch_uid="catalog.search.category")
+def reindex_category_products(sender: type[Category], instance: Category, **kwargs: Any) -> None:
+    search.get_backend().index_category(instance.pk)
+
+
+@receiver(pre_delete, sender=Brand, dispatch_uid="catalog.search.brand_pre_delete")
+@receiver(pre_delete, sender=Category, dispatch_uid="catalog.search.category_pre_delete")
+def remember_affected_products(
+    sender: type[Brand | Category], instance: Brand | Category, **kwargs: Any
+) -> None:
+    # O SET_NULL acontece num UPDATE sem sinais; guardamos os produtos antes que percam o vínculo.
+    instance._affected_product_ids = list(  # noqa: SLF001
+        instance.products.values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Brand, dispatch_uid="catalog.search.brand_post_delete")
+@receiver(post_delete, sender=Category, dispatch_uid="catalog.search.category_post_delete")
+def reindex_affected_products(
+    sender: type[Brand | Category], instance: Brand | Category, **kwargs: Any
+) -> None:
+    affected = getattr(instance, "_affected_product_ids", [])
+    search.get_backend().index_products(affected)
+    if affected:
+        dimension = facets.Dimension.BRAND if sender is Brand else facets.Dimension.CATEGORY
+        facets.apply(
+            [
+                (facets.FacetKey(dimension, str(instance.pk)), -len(affected)),
+                (facets.FacetKey(dimension, ""), len(affected)),
+            ]
+        )
@@ -1,3 +1,54 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils import timezone
+
+from catalog.models import Product, StockReservation
+from catalog.services import stock
+
+
+class StockReservationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.products = Product.objects.bulk_create(
+            Product(
+                name=f"Produto {i}",
+                description="",
+                price=Decimal(10),
+                sku=f"STK-{i}",
+                barcode=f"STK-{i}",
+                stock=5,
+            )
+            for i in range(2)
+        )
+
+    def _stock(self) -> list[int]:
+        return [product.stock for product in Product.objects.order_by("pk")]
+
+    def test_reservation_beyond_stock_rejects_the_whole_batch(self) -> None:
+        first, second = self.products
+
+        with self.assertRaises(stock.InsufficientStock) as caught:
+            stock.reserve({first.pk: 2, second.pk: 6})
+
+        self.assertEqual(caught.exception.product_ids, [second.pk])
+        self.assertEqual(self._stock(), [5, 5])
+        self.assertFalse(StockReservation.objects.exists())
+
+    def test_release_expired_gives_stock_back(self) -> None:
+        first, second = self.products
+        expired = stock.reserve({first.pk: 2, second.pk: 3}, ttl=timedelta(minutes=1))
+        active = stock.reserve({first.pk: 1}, ttl=timedelta(hours=1))
+        self.assertEqual(self._stock(), [2, 2])
+
+        released = stock.release_expired(now=timezone.now() + timedelta(minutes=5))
 
-# Create your tests here.
+        self.assertEqual(released, 1)
+        self.assertEqual(self._stock(), [4, 5])
+        expired.refresh_from_db()
+        active.refresh_from_db()
+        self.assertEqual(expired.status, StockReservation.Status.EXPIRED)
+        self.assertEqual(active.status, StockReservation.Status.ACTIVE)
+        with self.assertRaises(stock.ReservationNotActive):
+            stock.confirm(expired.token)
@@ -1,3 +1,173 @@
-from django.shortcuts import render
+import io
+import logging
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
 
-# Create your views here.
+from django.db.models import QuerySet
+from ninja import File, Query, UploadedFile
+from ninja_extra import (
+    ControllerBase,
+    api_controller,
+    http_delete,
+    http_get,
+    http_post,
+    paginate,
+    status,
+)
+from ninja_extra.exceptions import NotFound
+
+from catalog.models import Product, RelatedProduct, StockReservation
+from catalog.schemas import (
+    BarcodeProductSchema,
+    CacheStatsSchema,
+    ImportReportSchema,
+    ProductFacetsSchema,
+    ProductImportInput,
+    ProductSchema,
+    ProductSearchInput,
+    ProductSearchPageSchema,
+    RelatedProductSchema,
+    RepricingInput,
+    RepricingReportSchema,
+    StockItemSchema,
+    StockReservationInput,
+    StockReservationSchema,
+)
+from catalog.services import barcode_cache, facets, repricing, search, stock
+from catalog.services.barcode_cache import BarcodeRecord
+from catalog.services.importer import ImportReport, ProductImporter
+from utils.exceptions import Conflict
+from utils.lru import CacheStats
+from utils.pagination import CursorPage, KeysetPagination
+from utils.records import ImportFormat, iter_records
+
+logger = logging.getLogger(__name__)
+
+
+@api_controller("/products", tags=["Produtos"])
+class ProductController(ControllerBase):
+    @http_get("", response=CursorPage[ProductSchema])
+    @paginate(KeysetPagination, ordering_field="created_at")
+    def list_products(self) -> QuerySet[Product]:
+        """Newest products first, paginated by cursor."""
+        return Product.objects.all()
+
+    @http_post("/import", response=ImportReportSchema)
+    def import_products(
+        self,
+        file: File[UploadedFile],
+        query: Query[ProductImportInput],
+    ) -> ImportReport:
+        """Upsert products from a CSV or NDJSON upload, streamed in chunks."""
+        fmt = query.fmt or ImportFormat.from_filename(file.name or "")
+        # Large uploads are spooled to disk by Django; wrapping keeps reading line by line.
+        stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+        report = ProductImporter(chunk_size=query.chunk_size).run(iter_records(stream, fmt))
+        logger.info(
+            "Product import %s: %d rows, %d errors, %.0f rows/s",
+            file.name,
+            report.rows_read,
+            report.error_count,
+            report.rows_per_second,
+        )
+        return report
+
+    @http_post("/reprice", response=RepricingReportSchema)
+    def reprice(self, payload: RepricingInput) -> repricing.RepricingReport:
+        """Apply percentage rules by category/brand; ``dry_run`` only computes the diff."""
+        rules = [
+            repricing.PriceRule(
+                percentage=rule.percentage, category_id=rule.category_id, brand_id=rule.brand_id
+            )
+            for rule in payload.rules
+        ]
+        return repricing.reprice(rules, dry_run=payload.dry_run, reason=payload.reason)
+
+    @http_get("/by-barcode/{code}", response=BarcodeProductSchema)
+    def by_barcode(self, code: str) -> BarcodeRecord:
+        """POS scan lookup, served from the per-worker barcode cache when warm."""
+        record = barcode_cache.lookup(code)
+        if record is None:
+            msg = f"Produto não encontrado para o código de barras {code}"
+            raise NotFound(msg)
+        return record
+
+    @http_get("/barcode-cache/stats", response=CacheStatsSchema)
+    def barcode_cache_stats(self) -> CacheStats:
+        """Hit/miss/eviction counters of this worker's barcode cache."""
+        return barcode_cache.cache.stats()
+
+    @http_get("/facets", response=ProductFacetsSchema)
+    def product_facets(self) -> dict[str, dict[str, int]]:
+        """Product counts per category/brand id, status and unit, from the precomputed table."""
+        return facets.snapshot()
+
+    @http_get("/search", response=ProductSearchPageSchema)
+    def search_products(self, filters: Query[ProductSearchInput]) -> dict[str, Any]:
+        """Ranked full-text search over name, brand, category and description."""
+        offset = (filters.page - 1) * filters.page_size
+        # One extra hit tells whether there is a next page without counting every match.
+        products = search.search_products(filters.q, filters.page_size + 1, offset)
+        return {
+            "page": filters.page,
+            "page_size": filters.page_size,
+            "has_next": len(products) > filters.page_size,
+            "results": products[: filters.page_size],
+        }
+
+    @http_get("/{product_id}/related", response=list[RelatedProductSchema])
+    def related_products(self, product_id: int) -> list[RelatedProduct]:
+        """Products most often bought together with this one, from the precomputed top-K."""
+        related = list(
+            RelatedProduct.objects.filter(product_id=product_id)
+            .select_related("related")
+            .order_by("rank")
+        )
+        if not related and not Product.objects.filter(pk=product_id).exists():
+            msg = f"Produto {product_id} não encontrado"
+            raise NotFound(msg)
+        return related
+
+
+@api_controller("/stock", tags=["Estoque"])
+class StockController(ControllerBase):
+    @http_post("/decrement", response={204: None})
+    def decrement(self, items: list[StockItemSchema]) -> tuple[int, None]:
+        """Take stock for a whole order in one conditional UPDATE (all or nothing)."""
+        try:
+            stock.decrement((item.product_id, item.quantity) for item in items)
+        except stock.InsufficientStock as exc:
+            raise Conflict({"detail": str(exc), "product_ids": exc.product_ids}) from exc
+        return status.HTTP_204_NO_CONTENT, None
+
+    @http_post("/reservations", response={201: StockReservationSchema})
+    def reserve(self, payload: StockReservationInput) -> tuple[int, StockReservation]:
+        """Hold stock for a checkout; it returns to the shelf if not confirmed in time."""
+        try:
+            reservation = stock.reserve(
+                ((item.product_id, item.quantity) for item in payload.items),
+                ttl=timedelta(seconds=payload.ttl_seconds),
+                reference=payload.reference,
+            )
+        except stock.InsufficientStock as exc:
+            raise Conflict({"detail": str(exc), "product_ids": exc.product_ids}) from exc
+        return status.HTTP_201_CREATED, reservation
+
+    @http_post("/reservations/{token}/confirm", response={204: None})
+    def confirm(self, token: UUID) -> tuple[int, None]:
+        try:
+            stock.confirm(token)
+        except stock.ReservationNotActive as exc:
+            msg = "Reserva inexistente, expirada ou já encerrada"
+            raise Conflict(msg) from exc
+        return status.HTTP_204_NO_CONTENT, None
+
+    @http_delete("/reservations/{token}", response={204: None})
+    def release(self, token: UUID) -> tuple[int, None]:
+        try:
+            stock.release(token)
+        except stock.ReservationNotActive as exc:
+            msg = "Reserva inexistente ou já encerrada"
+            raise Conflict(msg) from exc
+        return status.HTTP_204_NO_CONTENT, None
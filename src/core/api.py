@@ -5,6 +5,17 @@ from django.http import HttpRequest
 from ninja import Schema
 from ninja_extra import NinjaExtraAPI
 
+from catalog.views import ProductController, StockController
+from customer.views import CustomerController
+from group.views import StoreController
+from marketing.views import (
+    CampaignController,
+    CartController,
+    CouponController,
+    SegmentController,
+)
+from sales.views import OrderController, SalesReportController
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,6 +25,18 @@ class HelloWorldResponse(Schema):
 
 
 api = NinjaExtraAPI(title="API", description="API for the project")
+api.register_controllers(
+    ProductController,
+    StockController,
+    CustomerController,
+    StoreController,
+    SegmentController,
+    CampaignController,
+    CartController,
+    CouponController,
+    OrderController,
+    SalesReportController,
+)
 
 
 @api.get("")
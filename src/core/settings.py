@@ -55,3 +55,33 @@ AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.NumericPasswordValidator"},
 ]
 AUTH_USER_MODEL = "customer.Customer"
+
+# Per-worker LRU of products by barcode (POS scans); TTL bounds staleness across workers.
+BARCODE_CACHE_SIZE = 50_000
+BARCODE_CACHE_TTL = 300.0
+
+# Per-worker nearest-store grid: cell size in degrees (~28 km) and full reload interval.
+STORE_GRID_DEGREES = 0.25
+STORE_INDEX_TTL = 600.0
+
+# Loyalty tier thresholds (customer.services.tiers.TierPolicy fields); empty keeps the defaults.
+LOYALTY_TIER_POLICY: dict[str, object] = {}
+
+# Closed orders older than this many days move to the archive tables (archive_orders command).
+ORDER_ARCHIVE_AFTER_DAYS = 730
+# Seconds the newest archived sale date stays cached (readers use it to skip the archive).
+ORDER_ARCHIVE_CACHE_TTL = 300
+
+# Per-worker product -> offer index used by cart pricing; reloaded after this many seconds.
+OFFER_INDEX_TTL = 60.0
+
+# Per-worker Bloom filter of coupon codes: target false-positive rate, seconds between loads of
+# new coupons and seconds between full rebuilds.
+COUPON_FILTER_ERROR_RATE = 0.001
+COUPON_FILTER_REFRESH = 5.0
+COUPON_FILTER_TTL = 3_600.0
+# Coupon ids re-read below the highest one loaded, for coupons committed out of id order.
+COUPON_FILTER_OVERLAP = 1_000
+
+# Seconds a campaign report stays cached; orders landing in the campaign window drop it earlier.
+CAMPAIGN_REPORT_CACHE_TTL = 300
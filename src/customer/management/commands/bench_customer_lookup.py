@@ -0,0 +1,83 @@
+import random
+import statistics
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from customer.models import Customer, CustomerDocument, LoyaltyProgram
+from customer.services.lookup import find_by_document
+from utils.perf import Stopwatch, throwaway_transaction
+
+SEED_CHUNK_SIZE = 20_000
+
+
+def _format_cpf(number: str) -> str:
+    return f"{number[:3]}.{number[3:6]}.{number[6:9]}-{number[9:]}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a busca de clientes por CPF (com pontuação, como digitada no atendimento) sobre "
+        "uma base sintética. Tudo roda numa transação desfeita ao final."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--customers", type=int, default=10_000_000)
+        parser.add_argument("--lookups", type=int, default=1_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rng = random.Random(options["seed"])
+        count = options["customers"]
+        with throwaway_transaction():
+            self._seed(count, verbose=options["verbosity"] > 1)
+            numbers = [f"{rng.randrange(count):011d}" for _ in range(options["lookups"])]
+            plan = (
+                Customer.objects.select_related("document", "loyalty")
+                .filter(document__document_type="CPF", document__document_number=numbers[0])
+                .explain()
+            )
+            self.stdout.write(f"Plano:\n{plan}")
+
+            timings = []
+            misses = 0
+            for number in numbers:
+                stopwatch = Stopwatch()
+                customer = find_by_document(CustomerDocument.DocumentType.CPF, _format_cpf(number))
+                timings.append(stopwatch.elapsed * 1000)
+                misses += customer is None
+            timings.sort()
+            self.stdout.write(
+                f"{count:,} clientes, {len(timings)} buscas: "
+                f"p50 {statistics.median(timings):.3f}ms, "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:.3f}ms, "
+                f"máx {timings[-1]:.3f}ms, não encontrados: {misses}"
+            )
+
+    def _seed(self, count: int, *, verbose: bool) -> None:
+        stopwatch = Stopwatch()
+        for start in range(0, count, SEED_CHUNK_SIZE):
+            stop = min(start + SEED_CHUNK_SIZE, count)
+            documents = CustomerDocument.objects.bulk_create(
+                CustomerDocument(document_type="CPF", document_number=f"{i:011d}")
+                for i in range(start, stop)
+            )
+            customers = Customer.objects.bulk_create(
+                Customer(
+                    username=f"bench-{i}@example.com",
+                    email=f"bench-{i}@example.com",
+                    password="!",
+                    first_name=f"Cliente {i}",
+                    phone="11999999999",
+                    document_id=document.pk,
+                )
+                for i, document in zip(range(start, stop), documents, strict=True)
+            )
+            # Um terço da base no programa de fidelidade.
+            LoyaltyProgram.objects.bulk_create(
+                LoyaltyProgram(customer_id=customer.pk, points=customer.pk % 5_000)
+                for customer in customers[::3]
+            )
+            if verbose:
+                self.stdout.write(f"{stop:,} clientes semeados ({stopwatch.rate(stop):.0f}/s)")
+        self.stdout.write(f"{count:,} clientes semeados em {stopwatch.elapsed:.1f}s")
@@ -0,0 +1,48 @@
+from collections.abc import Iterator
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from customer.services.onboarding import DEFAULT_CHUNK_SIZE, CustomerOnboarder
+from utils.perf import throwaway_transaction
+
+
+def _records(count: int, tag: str) -> Iterator[tuple[int, dict[str, Any]]]:
+    for i in range(count):
+        yield (
+            i + 1,
+            {
+                "email": f"bench-{tag}-{i}@example.com",
+                "first_name": f"Cliente {i}",
+                "phone": f"119{i:08d}"[:11],
+                "document_type": "CPF",
+                "document_number": f"{i:011d}",
+                "password": f"senha-{i}",
+            },
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a vazão do cadastro em lote de clientes (linhas/s e hashes/s) para cada "
+        "quantidade de workers de hash. Tudo roda numa transação desfeita ao final."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--customers", type=int, default=2_000)
+        parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        baseline = 0.0
+        for workers in options["workers"]:
+            onboarder = CustomerOnboarder(chunk_size=options["chunk_size"], workers=workers)
+            with throwaway_transaction():
+                report = onboarder.run(_records(options["customers"], f"w{workers}"))
+            baseline = baseline or report.rows_per_second
+            speedup = report.rows_per_second / baseline if baseline else 0.0
+            self.stdout.write(
+                f"{workers:>3} workers: {report.customers_created} clientes em "
+                f"{report.elapsed_seconds:.2f}s | {report.rows_per_second:8.0f} linhas/s | "
+                f"{report.hashes_per_second:8.0f} hashes/s | {speedup:.1f}x"
+            )
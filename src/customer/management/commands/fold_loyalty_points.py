@@ -0,0 +1,24 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from customer.services.loyalty import DEFAULT_FOLD_BATCH_SIZE, fold
+
+
+class Command(BaseCommand):
+    help = (
+        "Consolida os movimentos pendentes do livro de pontos em LoyaltyProgram.points "
+        "(agende via cron; várias instâncias podem rodar ao mesmo tempo)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_FOLD_BATCH_SIZE,
+            help="Clientes por transação",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        folded = fold(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"{folded} movimentos de pontos consolidados"))
@@ -0,0 +1,32 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from customer.services.loyalty import fold
+from customer.services.tiers import DEFAULT_CHUNK_SIZE, recalculate
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula o nível de fidelidade (BRONZE/SILVER/GOLD) de todos os clientes a partir "
+        "dos pontos e do gasto recente. Use --dry-run para só ver as mudanças."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not options["dry_run"]:
+            # Os níveis usam os pontos consolidados: traz o livro em dia antes.
+            fold()
+        report = recalculate(dry_run=options["dry_run"], chunk_size=options["chunk_size"])
+        for (old, new), count in sorted(report.transitions.items()):
+            self.stdout.write(f"{old} -> {new}: {count}")
+        prefix = "[dry-run] " if report.dry_run else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}{report.programs_changed}/{report.programs_read} níveis alterados "
+                f"em {report.elapsed_seconds:.2f}s"
+            )
+        )
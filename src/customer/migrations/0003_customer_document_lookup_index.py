@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customerdocument',
+            index=models.Index(fields=['document_type', 'document_number'], name='customer_document_lookup_idx'),
+        ),
+    ]
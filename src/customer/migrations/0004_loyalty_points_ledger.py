@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fix_bronze_tier(apps, schema_editor):
+    # O default antigo gravava o rótulo ("Bronze") em vez do valor da escolha.
+    LoyaltyProgram = apps.get_model('customer', 'LoyaltyProgram')
+    LoyaltyProgram.objects.filter(tier='Bronze').update(tier='BRONZE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0003_customer_document_lookup_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loyaltyprogram',
+            name='tier',
+            field=models.CharField(choices=[('BRONZE', 'Bronze'), ('SILVER', 'Prata'), ('GOLD', 'Ouro')], default='BRONZE', max_length=20, verbose_name='Nível'),
+        ),
+        migrations.RunPython(fix_bronze_tier, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='LoyaltyPointsEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.IntegerField(verbose_name='Pontos')),
+                ('reason', models.CharField(blank=True, max_length=255, verbose_name='Motivo')),
+                ('folded', models.BooleanField(default=False, verbose_name='Consolidado')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Data de criação')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_entries', to=settings.AUTH_USER_MODEL, verbose_name='Cliente')),
+            ],
+            options={
+                'verbose_name': 'Movimento de pontos',
+                'verbose_name_plural': 'Movimentos de pontos',
+                'ordering': ['-id'],
+                'indexes': [models.Index(condition=models.Q(('folded', False)), fields=['customer'], name='loyalty_entry_pending_idx')],
+            },
+        ),
+    ]
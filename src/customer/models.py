@@ -41,27 +41,38 @@ class CustomerDocument(models.Model):
         verbose_name = _("Documento do cliente")
         verbose_name_plural = _("Documentos do cliente")
         ordering = ["-id"]
+        indexes = [
+            models.Index(
+                fields=["document_type", "document_number"], name="customer_document_lookup_idx"
+            )
+        ]
 
     def __str__(self) -> str:
         return f"{self.document_type} - {self.document_number}"
 
     def save(self, *args: Any, **kwargs: Any) -> None:
+        self.document_number = self.normalize_number(self.document_type, self.document_number)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def normalize_number(cls, document_type: str, document_number: str) -> str:
+        """Validate and clean a number the way it is stored (also for bulk paths and lookups)."""
         # Remover caracteres não numéricos
-        clean_number = re.sub(r"\D", "", self.document_number)
+        clean_number = re.sub(r"\D", "", document_number)
 
-        if self.document_type == self.DocumentType.CPF:
+        if document_type == cls.DocumentType.CPF:
             # CPF: 11 dígitos
             if not re.fullmatch(r"\d{11}", clean_number):
                 raise ValidationError(_("CPF deve conter exatamente 11 dígitos numéricos."))
-            self.document_number = clean_number
+            return clean_number
 
-        elif self.document_type == self.DocumentType.CNPJ:
+        if document_type == cls.DocumentType.CNPJ:
             # CNPJ: 14 dígitos
             if not re.fullmatch(r"\d{14}", clean_number):
                 raise ValidationError(_("CNPJ deve conter exatamente 14 dígitos numéricos."))
-            self.document_number = clean_number
+            return clean_number
 
-        super().save(*args, **kwargs)
+        return document_number
 
 
 class Address(models.Model):
@@ -134,12 +145,19 @@ class Customer(AbstractUser):
         verbose_name = _("Cliente")
         verbose_name_plural = _("Clientes")
         ordering = ["-date_joined"]
+        indexes = [models.Index(fields=["date_joined", "id"], name="customer_keyset_idx")]
 
     def __str__(self) -> str:
-        return f"{self.get_full_name()} - ({self.document!s})"
+        # Sem acessar ``document``: o __str__ não pode disparar consulta (admin, logs, listas).
+        return f"{self.get_full_name()} - ({self.email})"
 
 
 class LoyaltyProgram(models.Model):
+    class Tier(models.TextChoices):
+        BRONZE = "BRONZE", _("Bronze")
+        SILVER = "SILVER", _("Prata")
+        GOLD = "GOLD", _("Ouro")
+
     customer = models.OneToOneField(
         Customer, on_delete=models.CASCADE, related_name="loyalty", verbose_name=_("Cliente")
     )
@@ -147,8 +165,8 @@ class LoyaltyProgram(models.Model):
     tier = models.CharField(
         _("Nível"),
         max_length=20,
-        choices=[("BRONZE", _("Bronze")), ("SILVER", _("Prata")), ("GOLD", _("Ouro"))],
-        default=_("Bronze"),
+        choices=Tier.choices,
+        default=Tier.BRONZE,
     )
 
     class Meta:
@@ -157,8 +175,46 @@ class LoyaltyProgram(models.Model):
         ordering = ["-points"]
 
     def __str__(self) -> str:
-        return f"{self.customer.get_full_name()} - ({self.points})"
+        return f"Cliente #{self.customer_id} - ({self.points} pontos)"
+
+    def add_points(self, amount: int, reason: str = "") -> LoyaltyPointsEntry:
+        """Record a credit of ``amount`` in the ledger; ``points`` only changes when folded.
+
+        Debits go through :func:`customer.services.loyalty.redeem`, which checks the balance.
+        """
+        if amount <= 0:
+            msg = "A quantidade de pontos deve ser positiva"
+            raise ValueError(msg)
+        return LoyaltyPointsEntry.objects.create(
+            customer_id=self.customer_id, amount=amount, reason=reason
+        )
+
+
+class LoyaltyPointsEntry(models.Model):
+    """Movimento de pontos (positivo ou negativo), somado a ``LoyaltyProgram.points`` em lote."""
 
-    def add_points(self, amount: int) -> None:
-        self.points += amount
-        self.save()
+    customer = models.ForeignKey[Customer](
+        Customer,
+        on_delete=models.CASCADE,
+        related_name="points_entries",
+        verbose_name=_("Cliente"),
+    )
+    amount = models.IntegerField(_("Pontos"))
+    reason = models.CharField(_("Motivo"), max_length=255, blank=True)
+    folded = models.BooleanField(_("Consolidado"), default=False)
+    created_at = models.DateTimeField(_("Data de criação"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Movimento de pontos")
+        verbose_name_plural = _("Movimentos de pontos")
+        ordering = ["-id"]
+        indexes = [
+            models.Index(
+                fields=["customer"],
+                condition=models.Q(folded=False),
+                name="loyalty_entry_pending_idx",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.customer_id} - {self.amount:+d}"
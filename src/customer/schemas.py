@@ -0,0 +1,102 @@
+from datetime import datetime
+from decimal import Decimal
+
+from ninja import Field, Schema
+from pydantic import field_validator
+
+from customer.models import CustomerDocument
+
+
+class CustomerSchema(Schema):
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    phone: str
+    is_active: bool
+    date_joined: datetime
+
+
+class CustomerDocumentSchema(Schema):
+    document_type: str
+    document_number: str
+
+
+class LoyaltyProgramSchema(Schema):
+    points: int
+    tier: str
+
+
+class CustomerDetailSchema(CustomerSchema):
+    document: CustomerDocumentSchema
+    # Clientes sem programa de fidelidade vêm com null.
+    loyalty: LoyaltyProgramSchema | None = None
+
+
+class AddressSchema(Schema):
+    id: int
+    name: str
+    street: str
+    number: str
+    complement: str
+    neighborhood: str
+    city: str
+    state: str
+    zip_code: str
+    main: bool
+
+
+class OwnedGroupSchema(Schema):
+    id: int
+    name: str
+    status: bool
+
+
+class OverviewOrderItemSchema(Schema):
+    product_id: int
+    product_name: str = Field(..., alias="product.name")
+    quantity: int
+    price: Decimal
+
+
+class OverviewOrderSchema(Schema):
+    id: int
+    external_id: str
+    total_amount: Decimal
+    discount_applied: Decimal
+    sale_date: datetime
+    status: str
+    items: list[OverviewOrderItemSchema]
+
+
+class CustomerOverviewSchema(CustomerDetailSchema):
+    addresses: list[AddressSchema] = Field(..., alias="adresses")
+    owned_groups: list[OwnedGroupSchema]
+    recent_orders: list[OverviewOrderSchema]
+
+
+class DocumentLookupInput(Schema):
+    document_type: CustomerDocument.DocumentType = CustomerDocument.DocumentType.CPF
+    number: str = Field(..., min_length=1, max_length=255)
+
+
+class LoyaltyBalanceSchema(Schema):
+    customer_id: int
+    points: int
+    pending_points: int
+    balance: int
+    tier: str | None
+
+
+class LoyaltyEntryInput(Schema):
+    # Positivo credita, negativo resgata (só se houver saldo).
+    amount: int
+    reason: str = Field("", max_length=255)
+
+    @field_validator("amount")
+    @classmethod
+    def nonzero(cls, value: int) -> int:
+        if value == 0:
+            msg = "A quantidade de pontos não pode ser zero"
+            raise ValueError(msg)
+        return value
@@ -0,0 +1,20 @@
+"""Customer lookup by CPF/CNPJ (or any other document), normalized like ``CustomerDocument``."""
+
+from __future__ import annotations
+
+from customer.models import Customer, CustomerDocument
+
+
+def find_by_document(document_type: str, document_number: str) -> Customer | None:
+    """The customer holding the document, with ``document`` and ``loyalty`` already loaded.
+
+    The input is cleaned exactly as ``CustomerDocument.save`` stores it (so ``123.456.789-01``
+    finds ``12345678901``) and matched through ``customer_document_lookup_idx`` in a single
+    query. Raises ``ValidationError`` for a malformed CPF/CNPJ.
+    """
+    number = CustomerDocument.normalize_number(document_type, document_number)
+    return (
+        Customer.objects.select_related("document", "loyalty")
+        .filter(document__document_type=document_type, document__document_number=number)
+        .first()
+    )
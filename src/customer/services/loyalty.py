@@ -0,0 +1,158 @@
+"""Loyalty points ledger: checkouts append entries, a batch job folds them into the balance.
+
+Earning points is an INSERT into ``LoyaltyPointsEntry`` and never touches the
+``LoyaltyProgram`` row, so concurrent purchases neither lose increments nor contend on it.
+:func:`fold` later adds the pending entries to ``LoyaltyProgram.points`` with one
+``points = points + CASE ...`` UPDATE per batch.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from customer.models import Customer, LoyaltyPointsEntry, LoyaltyProgram
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FOLD_BATCH_SIZE = 500
+
+
+class InsufficientPoints(Exception):  # noqa: N818
+    def __init__(self, customer_id: int, available: int) -> None:
+        self.customer_id = customer_id
+        self.available = available
+        super().__init__(f"Saldo de pontos insuficiente ({available} disponíveis)")
+
+
+class LoyaltyBalance(NamedTuple):
+    customer_id: int
+    # Pontos já consolidados em LoyaltyProgram.points.
+    points: int
+    # Movimentos do livro ainda não consolidados.
+    pending_points: int
+    tier: str | None
+
+    @property
+    def balance(self) -> int:
+        return self.points + self.pending_points
+
+
+def earn(customer_id: int, amount: int, reason: str = "") -> LoyaltyPointsEntry:
+    """Append a credit; no lock and no write to ``LoyaltyProgram``."""
+    if amount <= 0:
+        msg = "A quantidade de pontos deve ser positiva"
+        raise ValueError(msg)
+    return LoyaltyPointsEntry.objects.create(customer_id=customer_id, amount=amount, reason=reason)
+
+
+def redeem(customer_id: int, amount: int, reason: str = "") -> LoyaltyPointsEntry:
+    """Append a debit if the balance covers it; raises :class:`InsufficientPoints` otherwise.
+
+    Debits lock the customer's program row, so two redemptions cannot both spend the same
+    points; credits and folding never wait on them for longer than that check.
+    """
+    if amount <= 0:
+        msg = "A quantidade de pontos deve ser positiva"
+        raise ValueError(msg)
+    with transaction.atomic():
+        LoyaltyProgram.objects.select_for_update().get_or_create(customer_id=customer_id)
+        available = balances([customer_id])[customer_id].balance
+        if available < amount:
+            raise InsufficientPoints(customer_id, available)
+        return LoyaltyPointsEntry.objects.create(
+            customer_id=customer_id, amount=-amount, reason=reason
+        )
+
+
+def balances(customer_ids: Iterable[int]) -> dict[int, LoyaltyBalance]:
+    """Folded points plus pending ledger sum for each existing customer, in one query."""
+    pending = (
+        LoyaltyPointsEntry.objects.filter(customer=OuterRef("pk"), folded=False)
+        .order_by()
+        .values("customer")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    rows = (
+        Customer.objects.filter(pk__in=customer_ids)
+        .order_by()
+        .values_list("pk", "loyalty__points", "loyalty__tier")
+        .annotate(pending=Coalesce(Subquery(pending, output_field=IntegerField()), 0))
+    )
+    return {
+        pk: LoyaltyBalance(pk, points or 0, pending_points, tier)
+        for pk, points, tier, pending_points in rows
+    }
+
+
+def fold(batch_size: int = DEFAULT_FOLD_BATCH_SIZE) -> int:
+    """Move pending entries into ``LoyaltyProgram.points``; returns how many were folded.
+
+    Walks the customers with pending entries in ``customer_id`` order, ``batch_size`` customers
+    per transaction. Each batch locks those customers' ``LoyaltyProgram`` rows (the lock
+    :func:`redeem` takes) with ``SKIP LOCKED`` where the database supports it and folds all of
+    their pending entries at once, so a debit is never applied without the credits that
+    covered it. Customers held by another folder or a redemption are left for the next run.
+    """
+    folded = 0
+    after = 0
+    while True:
+        customer_ids = list(
+            LoyaltyPointsEntry.objects.filter(folded=False, customer_id__gt=after)
+            .order_by("customer_id")
+            .values_list("customer_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not customer_ids:
+            break
+        after = customer_ids[-1]
+        # Clientes que ainda não têm programa entram com 0 pontos, para haver linha a travar.
+        LoyaltyProgram.objects.bulk_create(
+            [LoyaltyProgram(customer_id=customer_id) for customer_id in customer_ids],
+            ignore_conflicts=True,
+        )
+        with transaction.atomic():
+            locked = list(
+                LoyaltyProgram.objects.filter(customer_id__in=customer_ids)
+                .select_for_update(skip_locked=True)
+                .values_list("customer_id", flat=True)
+            )
+            rows = list(
+                LoyaltyPointsEntry.objects.filter(folded=False, customer_id__in=locked)
+                .order_by("pk")
+                .values_list("pk", "customer_id", "amount")
+            )
+            deltas: Counter[int] = Counter()
+            for _, customer_id, amount in rows:
+                deltas[customer_id] += amount
+            _apply(deltas)
+            LoyaltyPointsEntry.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(folded=True)
+        folded += len(rows)
+    if folded:
+        logger.info("Folded %d loyalty ledger entries", folded)
+    return folded
+
+
+def _apply(deltas: Counter[int]) -> None:
+    deltas = Counter({customer_id: delta for customer_id, delta in deltas.items() if delta})
+    if not deltas:
+        return
+    LoyaltyProgram.objects.filter(customer_id__in=deltas).update(
+        points=F("points")
+        + Case(
+            *(
+                When(customer_id=customer_id, then=Value(delta))
+                for customer_id, delta in deltas.items()
+            ),
+            output_field=IntegerField(),
+        )
+    )
@@ -0,0 +1,221 @@
+"""Bulk customer onboarding: passwords hashed in a process pool, rows inserted in chunks."""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import batched
+from typing import TYPE_CHECKING, Any
+
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from customer.models import Customer, CustomerDocument
+from utils.hashing import PasswordHasherPool
+from utils.perf import Stopwatch
+from utils.records import MAX_REPORTED_ERRORS, RowError, RowFailure, text
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1_000
+MAX_CHUNK_SIZE = 10_000
+# O e-mail também vai para ``username``, que tem esse limite.
+USERNAME_MAX_LENGTH = Customer._meta.get_field("username").max_length  # noqa: SLF001
+
+
+@dataclass(slots=True)
+class OnboardingReport:
+    workers: int
+    rows_read: int = 0
+    customers_created: int = 0
+    passwords_hashed: int = 0
+    error_count: int = 0
+    elapsed_seconds: float = 0.0
+    hashing_seconds: float = 0.0
+    errors: list[RowFailure] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def hashes_per_second(self) -> float:
+        return self.passwords_hashed / self.hashing_seconds if self.hashing_seconds > 0 else 0.0
+
+    def add_error(self, line: int, email: str, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(RowFailure(line=line, key=email, message=message))
+
+
+@dataclass(slots=True)
+class _Row:
+    line: int
+    customer: Customer
+    document: CustomerDocument
+    # Senha em texto puro ainda por hashear; vazia quando o hash veio pronto.
+    password: str = ""
+
+
+class CustomerOnboarder:
+    """Creates ``CustomerDocument``/``Customer`` pairs chunk by chunk with ``bulk_create``.
+
+    Each record carries either ``password`` (hashed here, across ``workers`` processes) or an
+    already hashed ``password_hash`` in Django's ``algorithm$...`` format, which is stored as
+    is. Records without either get an unusable password. E-mails already taken, in the
+    database or earlier in the file, are reported as row errors.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int | None = None) -> None:
+        if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+            msg = f"chunk_size deve estar entre 1 e {MAX_CHUNK_SIZE}"
+            raise ValueError(msg)
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self._document_types = set(CustomerDocument.DocumentType.values)
+        self._genders = set(Customer.Gender.values)
+
+    def run(self, records: Iterable[tuple[int, dict[str, Any]]]) -> OnboardingReport:
+        stopwatch = Stopwatch()
+        with PasswordHasherPool(self.workers) as hasher:
+            report = OnboardingReport(workers=hasher.workers)
+            seen: set[str] = set()
+            for chunk in batched(records, self.chunk_size):
+                report.rows_read += len(chunk)
+                self._onboard_chunk(chunk, hasher, seen, report)
+                logger.info(
+                    "Onboarded %d customers (%d errors) at %.0f rows/s with %d workers",
+                    report.customers_created,
+                    report.error_count,
+                    stopwatch.rate(report.rows_read),
+                    report.workers,
+                )
+        report.elapsed_seconds = stopwatch.elapsed
+        return report
+
+    def _onboard_chunk(
+        self,
+        chunk: tuple[tuple[int, dict[str, Any]], ...],
+        hasher: PasswordHasherPool,
+        seen: set[str],
+        report: OnboardingReport,
+    ) -> None:
+        rows: dict[str, _Row] = {}
+        for line, record in chunk:
+            email = text(record, "email")
+            try:
+                row = self._build(line, record)
+            except RowError as exc:
+                report.add_error(line, email, str(exc))
+                continue
+            email = row.customer.email
+            if email in seen or email in rows:
+                report.add_error(line, email, "E-mail repetido no arquivo")
+                continue
+            rows[email] = row
+        seen.update(rows)
+
+        # Checked before hashing so rejected rows cost no CPU.
+        for email in Customer.objects.filter(email__in=rows).values_list("email", flat=True):
+            report.add_error(rows.pop(email).line, email, "E-mail já cadastrado")
+        if not rows:
+            return
+
+        pending = [row for row in rows.values() if row.password]
+        if pending:
+            stopwatch = Stopwatch()
+            hashes = hasher.hash([row.password for row in pending])
+            report.hashing_seconds += stopwatch.elapsed
+            report.passwords_hashed += len(hashes)
+            for row, hashed in zip(pending, hashes, strict=True):
+                row.customer.password = hashed
+
+        with transaction.atomic():
+            documents = CustomerDocument.objects.bulk_create(row.document for row in rows.values())
+            for row, document in zip(rows.values(), documents, strict=True):
+                row.customer.document_id = document.pk
+            Customer.objects.bulk_create(row.customer for row in rows.values())
+        report.customers_created += len(rows)
+
+    def _build(self, line: int, record: dict[str, Any]) -> _Row:
+        if "__error__" in record:
+            raise RowError(record["__error__"])
+        email = Customer.objects.normalize_email(text(record, "email"))
+        first_name = text(record, "first_name")
+        if not email or not first_name:
+            msg = "Campos obrigatórios ausentes: email e first_name"
+            raise RowError(msg)
+        if len(email) > USERNAME_MAX_LENGTH:
+            msg = f"E-mail com mais de {USERNAME_MAX_LENGTH} caracteres"
+            raise RowError(msg)
+
+        document = self._document(record)
+
+        phone = re.sub(r"\D", "", text(record, "phone"))
+        try:
+            Customer.phone_validator(phone)
+        except ValidationError as exc:
+            raise RowError(" ".join(exc.messages)) from exc
+
+        gender = text(record, "gender").upper()
+        if gender and gender not in self._genders:
+            msg = f"Gênero inválido: {gender!r}"
+            raise RowError(msg)
+        birth_date = None
+        if raw_birth_date := text(record, "birth_date"):
+            try:
+                birth_date = date.fromisoformat(raw_birth_date)
+            except ValueError as exc:
+                msg = f"Data de nascimento inválida: {raw_birth_date!r}"
+                raise RowError(msg) from exc
+
+        password, password_hash = self._password(record)
+        customer = Customer(
+            # ``username`` é herdado do AbstractUser e único; o login é pelo e-mail.
+            username=email,
+            email=email,
+            password=password_hash,
+            first_name=first_name,
+            last_name=text(record, "last_name"),
+            phone=phone,
+            birth_date=birth_date,
+            gender=gender,
+        )
+        return _Row(line, customer, document, password)
+
+    def _document(self, record: dict[str, Any]) -> CustomerDocument:
+        document_type = text(record, "document_type").upper() or CustomerDocument.DocumentType.CPF
+        if document_type not in self._document_types:
+            msg = f"Tipo de documento inválido: {document_type!r}"
+            raise RowError(msg)
+        try:
+            document_number = CustomerDocument.normalize_number(
+                document_type, text(record, "document_number")
+            )
+        except ValidationError as exc:
+            raise RowError(" ".join(exc.messages)) from exc
+        if not document_number:
+            msg = "Número do documento ausente"
+            raise RowError(msg)
+        return CustomerDocument(document_type=document_type, document_number=document_number)
+
+    @staticmethod
+    def _password(record: dict[str, Any]) -> tuple[str, str]:
+        """``(plain password still to hash, ready hash)``; exactly one of them is set."""
+        password = text(record, "password")
+        password_hash = text(record, "password_hash")
+        if password_hash:
+            try:
+                identify_hasher(password_hash)
+            except ValueError as exc:
+                msg = "Hash de senha em formato desconhecido"
+                raise RowError(msg) from exc
+        elif not password:
+            password_hash = make_password(None)
+        return ("", password_hash) if password_hash else (password, "")
@@ -0,0 +1,35 @@
+"""Customer 360: one customer (or a page of them) with everything around it in fixed queries."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db.models import Prefetch
+
+from customer.models import Customer
+from sales.models import Order, OrderItem
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+RECENT_ORDERS = 10
+# customer + document + loyalty (JOIN), endereços, grupos, pedidos recentes, itens + produto.
+QUERY_BUDGET = 5
+
+
+def overview_queryset(recent_orders: int = RECENT_ORDERS) -> QuerySet[Customer]:
+    """Customers ready for the overview schema in :data:`QUERY_BUDGET` queries, for any count.
+
+    The order prefetch is sliced per customer (a window function under the hood), so a page of
+    customers loads at most ``recent_orders`` orders each, with their items and products.
+    Only live orders are considered: archived ones are past ``ORDER_ARCHIVE_AFTER_DAYS`` and
+    not "recent", and reading them would add two queries to the budget.
+    """
+    orders = Order.objects.order_by("-sale_date", "-pk")[:recent_orders]
+    items = OrderItem.objects.select_related("product").order_by("pk")
+    return Customer.objects.select_related("document", "loyalty").prefetch_related(
+        "adresses",
+        "owned_groups",
+        Prefetch("orders", queryset=orders, to_attr="recent_orders"),
+        Prefetch("recent_orders__items", queryset=items),
+    )
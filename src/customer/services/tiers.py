@@ -0,0 +1,150 @@
+"""Loyalty tier recalculation over the whole program, chunk by chunk.
+
+Each chunk reads ``(program, points, tier, trailing spend)`` in one query, assigns tiers for the
+whole chunk at once with NumPy and writes only the programs whose tier changed, with a single
+``UPDATE ... SET tier = CASE ...``. Spend sums live and archived orders, so a window longer
+than the archive horizon still counts every paid order in it.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Case, ExpressionWrapper, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from customer.models import LoyaltyProgram
+from sales.manager import MONEY
+from sales.models import ArchivedOrder, Order
+from utils.perf import Stopwatch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5_000
+Tier = LoyaltyProgram.Tier
+# Em ordem crescente: o índice no array é o nível calculado.
+TIERS = (Tier.BRONZE, Tier.SILVER, Tier.GOLD)
+
+
+@dataclass(slots=True, frozen=True)
+class TierPolicy:
+    """Minimum points *or* trailing spend for SILVER and GOLD; the higher tier reached wins."""
+
+    silver_points: int = 1_000
+    gold_points: int = 5_000
+    silver_spend: Decimal = Decimal(2_000)
+    gold_spend: Decimal = Decimal(10_000)
+    window: timedelta = timedelta(days=365)
+
+    @classmethod
+    def from_settings(cls) -> TierPolicy:
+        return cls(**getattr(settings, "LOYALTY_TIER_POLICY", {}))
+
+    def assign(self, points: np.ndarray, spend_cents: np.ndarray) -> np.ndarray:
+        """Tier index (0 = BRONZE) for every row, from points and spend arrays."""
+        by_points = np.searchsorted([self.silver_points, self.gold_points], points, side="right")
+        by_spend = np.searchsorted(
+            [int(self.silver_spend * 100), int(self.gold_spend * 100)], spend_cents, side="right"
+        )
+        return np.maximum(by_points, by_spend)
+
+
+@dataclass(slots=True)
+class TierReport:
+    dry_run: bool
+    programs_read: int = 0
+    programs_changed: int = 0
+    elapsed_seconds: float = 0.0
+    # (nível anterior, novo nível) -> quantidade
+    transitions: Counter[tuple[str, str]] = field(default_factory=Counter)
+
+
+def recalculate(
+    policy: TierPolicy | None = None,
+    *,
+    dry_run: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> TierReport:
+    """Recompute every program's tier from its folded points and paid orders in the window."""
+    policy = policy or TierPolicy.from_settings()
+    report = TierReport(dry_run=dry_run)
+    stopwatch = Stopwatch()
+    since = timezone.now() - policy.window
+    live, archived = (
+        Coalesce(
+            Subquery(
+                model.objects.filter(
+                    customer_id=OuterRef("customer_id"),
+                    status=Order.Status.PAID,
+                    sale_date__gte=since,
+                )
+                .order_by()
+                .values("customer_id")
+                .annotate(total=Sum("total_amount"))
+                .values("total")
+            ),
+            Value(Decimal(0)),
+            output_field=MONEY,
+        )
+        for model in (Order, ArchivedOrder)
+    )
+    programs = (
+        LoyaltyProgram.objects.order_by("pk")
+        .annotate(spend=ExpressionWrapper(live + archived, output_field=MONEY))
+        .values_list("pk", "points", "tier", "spend")
+    )
+
+    last_pk = 0
+    while True:
+        rows = list(programs.filter(pk__gt=last_pk)[:chunk_size])
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+        report.programs_read += len(rows)
+        changes = _changes(policy, rows)
+        report.programs_changed += sum(len(pks) for pks in changes.values())
+        for (old, new), pks in changes.items():
+            report.transitions[old, new] += len(pks)
+        if changes and not dry_run:
+            _write(changes)
+
+    report.elapsed_seconds = stopwatch.elapsed
+    logger.info(
+        "Tier recalculation%s: %d read, %d changed in %.2fs",
+        " (dry run)" if dry_run else "",
+        report.programs_read,
+        report.programs_changed,
+        report.elapsed_seconds,
+    )
+    return report
+
+
+def _changes(
+    policy: TierPolicy, rows: list[tuple[int, int, str, Decimal]]
+) -> dict[tuple[str, str], list[int]]:
+    pks = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    points = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    spend_cents = np.fromiter((int(row[3] * 100) for row in rows), dtype=np.int64, count=len(rows))
+    current = np.array([row[2] for row in rows], dtype=object)
+    assigned = np.array(TIERS, dtype=object)[policy.assign(points, spend_cents)]
+    changed = np.flatnonzero(assigned != current)
+    changes: dict[tuple[str, str], list[int]] = {}
+    for i in changed:
+        changes.setdefault((str(current[i]), str(assigned[i])), []).append(int(pks[i]))
+    return changes
+
+
+def _write(changes: dict[tuple[str, str], list[int]]) -> None:
+    by_tier: dict[str, list[int]] = {}
+    for (_, new), pks in changes.items():
+        by_tier.setdefault(new, []).extend(pks)
+    LoyaltyProgram.objects.filter(pk__in=[pk for pks in by_tier.values() for pk in pks]).update(
+        tier=Case(*(When(pk__in=pks, then=Value(tier)) for tier, pks in by_tier.items()))
+    )
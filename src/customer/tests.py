@@ -1,3 +1,121 @@
+from datetime import timedelta
+from decimal import Decimal
+
 from django.test import TestCase
+from django.utils import timezone
+
+from catalog.models import Product
+from customer.models import Address, Customer, CustomerDocument, LoyaltyProgram
+from customer.services import loyalty
+from customer.services.overview import QUERY_BUDGET, RECENT_ORDERS
+from group.models import Group
+from sales.models import Order, OrderItem
+
+
+class CustomerOverviewQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        products = Product.objects.bulk_create(
+            Product(name=f"Produto {i}", description="", price=10, sku=f"OV-{i}", barcode=f"OV-{i}")
+            for i in range(3)
+        )
+        cls.customers = []
+        now = timezone.now()
+        for i in range(101):
+            document = CustomerDocument.objects.create(
+                document_type="OTHER", document_number=str(i)
+            )
+            customer = Customer.objects.create(
+                username=f"ov{i}@example.com",
+                email=f"ov{i}@example.com",
+                first_name=f"Cliente {i}",
+                phone="11999999999",
+                document=document,
+            )
+            LoyaltyProgram.objects.create(customer=customer, points=i)
+            customer.adresses.add(Address.objects.create(name="Casa", city="São Paulo"))
+            Group.objects.create(
+                email=f"grupo{i}@example.com",
+                name=f"Grupo {i}",
+                short_name="G",
+                full_name="Grupo",
+                cnpj="1",
+                phone="1",
+                owner=customer,
+            )
+            for j in range(RECENT_ORDERS + 2):
+                order = Order.objects.create(
+                    customer=customer,
+                    external_id=f"OV-{i}-{j}",
+                    total_amount=Decimal(20),
+                    sale_date=now - timedelta(days=j),
+                )
+                OrderItem.objects.bulk_create(
+                    OrderItem(order=order, product=product, quantity=1, price=product.price)
+                    for product in products[:2]
+                )
+            cls.customers.append(customer)
+
+    def test_overview_fits_query_budget(self) -> None:
+        customer = self.customers[0]
+        with self.assertNumQueries(QUERY_BUDGET):
+            response = self.client.get(f"/customers/{customer.pk}/overview")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["loyalty"]["points"], 0)
+        self.assertEqual(len(body["addresses"]), 1)
+        self.assertEqual(len(body["owned_groups"]), 1)
+        self.assertEqual(len(body["recent_orders"]), RECENT_ORDERS)
+        self.assertEqual(body["recent_orders"][0]["external_id"], "OV-0-0")
+        self.assertEqual(body["recent_orders"][0]["items"][0]["product_name"], "Produto 0")
+
+    def test_overview_page_of_100_keeps_the_budget(self) -> None:
+        with self.assertNumQueries(QUERY_BUDGET):
+            response = self.client.get("/customers/overview", {"page_size": 100})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body["results"]), 100)
+        self.assertIsNotNone(body["next_cursor"])
+        self.assertTrue(all(len(c["recent_orders"]) == RECENT_ORDERS for c in body["results"]))
+
+    def test_str_does_not_query(self) -> None:
+        customer = Customer.objects.get(pk=self.customers[0].pk)
+        program = LoyaltyProgram.objects.get(customer=customer)
+        with self.assertNumQueries(0):
+            str(customer)
+            str(program)
+
+
+class LoyaltyLedgerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.customer = Customer.objects.create(
+            username="ledger@example.com",
+            email="ledger@example.com",
+            document=CustomerDocument.objects.create(document_type="OTHER", document_number="L"),
+        )
+        LoyaltyProgram.objects.create(customer=cls.customer, points=10)
+
+    def test_redeeming_more_than_the_balance_fails(self) -> None:
+        loyalty.earn(self.customer.pk, 5)
+
+        with self.assertRaises(loyalty.InsufficientPoints) as caught:
+            loyalty.redeem(self.customer.pk, 16)
+
+        self.assertEqual(caught.exception.available, 15)
+        self.assertEqual(loyalty.balances([self.customer.pk])[self.customer.pk].balance, 15)
+        loyalty.redeem(self.customer.pk, 15)
+        self.assertEqual(loyalty.balances([self.customer.pk])[self.customer.pk].balance, 0)
+
+    def test_fold_keeps_the_balance(self) -> None:
+        loyalty.earn(self.customer.pk, 30)
+        loyalty.redeem(self.customer.pk, 25)
+        before = loyalty.balances([self.customer.pk])[self.customer.pk]
+
+        folded = loyalty.fold(batch_size=1)
 
-# Create your tests here.
+        after = loyalty.balances([self.customer.pk])[self.customer.pk]
+        self.assertEqual(folded, 2)
+        self.assertEqual((before.points, before.pending_points), (10, 5))
+        self.assertEqual((after.points, after.pending_points), (15, 0))
+        self.assertEqual(loyalty.fold(), 0)
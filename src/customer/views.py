@@ -1,3 +1,88 @@
-from django.shortcuts import render
+import logging
 
-# Create your views here.
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import QuerySet
+from ninja import Query
+from ninja_extra import ControllerBase, api_controller, http_get, http_post, paginate, status
+from ninja_extra.exceptions import NotFound, ValidationError
+
+from customer.models import Customer
+from customer.schemas import (
+    CustomerDetailSchema,
+    CustomerOverviewSchema,
+    CustomerSchema,
+    DocumentLookupInput,
+    LoyaltyBalanceSchema,
+    LoyaltyEntryInput,
+)
+from customer.services import loyalty
+from customer.services.lookup import find_by_document
+from customer.services.overview import overview_queryset
+from utils.exceptions import Conflict
+from utils.pagination import CursorPage, KeysetPagination
+
+logger = logging.getLogger(__name__)
+
+
+@api_controller("/customers", tags=["Clientes"])
+class CustomerController(ControllerBase):
+    @http_get("", response=CursorPage[CustomerSchema])
+    @paginate(KeysetPagination, ordering_field="date_joined")
+    def list_customers(self) -> QuerySet[Customer]:
+        """Most recently joined customers first, paginated by cursor."""
+        return Customer.objects.all()
+
+    @http_get("/overview", response=CursorPage[CustomerOverviewSchema])
+    @paginate(KeysetPagination, ordering_field="date_joined", page_size=100, max_page_size=100)
+    def list_overviews(self) -> QuerySet[Customer]:
+        """Pages of customer overviews, loaded in the same fixed number of queries as one."""
+        return overview_queryset()
+
+    @http_get("/{customer_id}/overview", response=CustomerOverviewSchema)
+    def overview(self, customer_id: int) -> Customer:
+        """Customer with document, loyalty, addresses, owned groups and recent orders."""
+        customer = overview_queryset().filter(pk=customer_id).first()
+        if customer is None:
+            msg = f"Cliente {customer_id} não encontrado"
+            raise NotFound(msg)
+        return customer
+
+    @http_get("/by-document", response=CustomerDetailSchema)
+    def by_document(self, lookup: Query[DocumentLookupInput]) -> Customer:
+        """Find a customer by CPF/CNPJ (punctuation allowed), with document and loyalty."""
+        try:
+            customer = find_by_document(lookup.document_type, lookup.number)
+        except DjangoValidationError as exc:
+            raise ValidationError({"number": exc.messages}) from exc
+        if customer is None:
+            msg = "Cliente não encontrado para o documento informado"
+            raise NotFound(msg)
+        return customer
+
+    @http_get("/{customer_id}/loyalty", response=LoyaltyBalanceSchema)
+    def loyalty_balance(self, customer_id: int) -> loyalty.LoyaltyBalance:
+        """Folded points plus the ledger entries not folded yet."""
+        return self._balance(customer_id)
+
+    @http_post("/{customer_id}/loyalty/entries", response={201: LoyaltyBalanceSchema})
+    def add_loyalty_entry(
+        self, customer_id: int, payload: LoyaltyEntryInput
+    ) -> tuple[int, loyalty.LoyaltyBalance]:
+        """Credit (positive) or redeem (negative) points through the append-only ledger."""
+        self._balance(customer_id)
+        if payload.amount > 0:
+            loyalty.earn(customer_id, payload.amount, payload.reason)
+        else:
+            try:
+                loyalty.redeem(customer_id, -payload.amount, payload.reason)
+            except loyalty.InsufficientPoints as exc:
+                raise Conflict({"detail": str(exc), "available": exc.available}) from exc
+        return status.HTTP_201_CREATED, self._balance(customer_id)
+
+    @staticmethod
+    def _balance(customer_id: int) -> loyalty.LoyaltyBalance:
+        balance = loyalty.balances([customer_id]).get(customer_id)
+        if balance is None:
+            msg = f"Cliente {customer_id} não encontrado"
+            raise NotFound(msg)
+        return balance
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class GroupConfig(AppConfig):
     name = 'group'
+
+    def ready(self) -> None:
+        from group import signals  # noqa: F401, PLC0415
@@ -0,0 +1,23 @@
+from ninja import Field, Schema
+
+
+class NearestStoreInput(Schema):
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
+    k: int = Field(5, gt=0, le=50)
+    max_km: float | None = Field(None, gt=0)
+
+
+class NearestStoreSchema(Schema):
+    id: int
+    name: str
+    group_id: int
+    phone: str
+    street: str = Field(..., alias="address.street")
+    number: str = Field(..., alias="address.number")
+    neighborhood: str = Field(..., alias="address.neighborhood")
+    city: str = Field(..., alias="address.city")
+    state: str = Field(..., alias="address.state")
+    latitude: float = Field(..., alias="address.latitude")
+    longitude: float = Field(..., alias="address.longitude")
+    distance_km: float
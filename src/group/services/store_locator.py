@@ -0,0 +1,192 @@
+"""Per-worker grid index of active store coordinates for nearest-store queries.
+
+Stores are bucketed into square cells of ``STORE_GRID_DEGREES``; a query walks rings of cells
+around the customer's cell and measures only the stores found there, all at once with NumPy.
+Signals keep the index of the current worker up to date; the TTL bounds staleness across
+workers, like the barcode cache.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from django.conf import settings
+
+from group.models import Store
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.db.models import QuerySet
+
+DEFAULT_GRID_DEGREES = 0.25
+DEFAULT_TTL = 600.0
+EARTH_RADIUS_KM = 6_371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+type Cell = tuple[int, int]
+
+
+class NearbyStore(NamedTuple):
+    store_id: int
+    distance_km: float
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Great-circle distances (km) from one point to arrays of points, in degrees."""
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class StoreIndex:
+    def __init__(
+        self, cell_degrees: float = DEFAULT_GRID_DEGREES, ttl: float = DEFAULT_TTL
+    ) -> None:
+        self.cell_degrees = cell_degrees
+        self.ttl = ttl
+        self._coords: dict[int, tuple[float, float]] = {}
+        self._cells: dict[Cell, set[int]] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._coords)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether this worker has built the index; until then, changes need no refresh."""
+        return self._loaded_at is not None
+
+    def cell(self, lat: float, lng: float) -> Cell:
+        # Sem tratamento do antimeridiano: as lojas ficam longe de ±180° de longitude.
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+
+    def rebuild(self) -> None:
+        """Reload every active store with coordinates (one query)."""
+        rows = _indexable_stores().values_list("pk", "address__latitude", "address__longitude")
+        with self._lock:
+            self._coords.clear()
+            self._cells.clear()
+            for store_id, lat, lng in rows:
+                self._add(store_id, lat, lng)
+            self._loaded_at = time.monotonic()
+
+    def refresh(self, store_ids: Iterable[int]) -> None:
+        """Re-read the given stores; inactive, deleted or unlocated ones leave the index."""
+        store_ids = set(store_ids)
+        if not store_ids or not self.loaded:
+            return
+        rows = (
+            _indexable_stores()
+            .filter(pk__in=store_ids)
+            .values_list("pk", "address__latitude", "address__longitude")
+        )
+        with self._lock:
+            for store_id in store_ids:
+                self._remove(store_id)
+            for store_id, lat, lng in rows:
+                self._add(store_id, lat, lng)
+
+    def remove(self, store_id: int) -> None:
+        with self._lock:
+            self._remove(store_id)
+
+    def nearest(
+        self, lat: float, lng: float, k: int = 5, max_km: float | None = None
+    ) -> list[NearbyStore]:
+        """The ``k`` closest stores to ``(lat, lng)``, closest first, within ``max_km`` if given."""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.rebuild()
+        with self._lock:
+            candidates = self._candidates(lat, lng, k, max_km)
+            coords = np.array([self._coords[store_id] for store_id in candidates], dtype=float)
+        if not candidates:
+            return []
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        distances = haversine_km(lat, lng, coords[:, 0], coords[:, 1])
+        if max_km is not None:
+            within = distances <= max_km
+            ids, distances = ids[within], distances[within]
+        if len(ids) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            ids, distances = ids[top], distances[top]
+        order = np.lexsort((ids, distances))
+        return [
+            NearbyStore(int(store_id), float(distance))
+            for store_id, distance in zip(ids[order], distances[order], strict=True)
+        ]
+
+    def _candidates(self, lat: float, lng: float, k: int, max_km: float | None) -> list[int]:
+        """Stores in growing rings of cells until no store outside them can be closer."""
+        ci, cj = self.cell(lat, lng)
+        found: list[int] = []
+        ring = 0
+        while len(found) < len(self._coords):
+            if 8 * ring > len(self._cells):
+                # Anel com mais células que as ocupadas (cliente longe de tudo): mede todas.
+                return list(self._coords)
+            found.extend(self._ring(ci, cj, ring))
+            # Distância mínima até sair do quadrado de células já visitado.
+            edge_lat = min(
+                lat - (ci - ring) * self.cell_degrees, (ci + ring + 1) * self.cell_degrees - lat
+            )
+            edge_lng = min(
+                lng - (cj - ring) * self.cell_degrees, (cj + ring + 1) * self.cell_degrees - lng
+            )
+            widest_lat = min(90.0, abs(lat) + (ring + 1) * self.cell_degrees)
+            reach_km = KM_PER_DEGREE * min(edge_lat, edge_lng * math.cos(math.radians(widest_lat)))
+            if max_km is not None and reach_km >= max_km:
+                break
+            if len(found) >= k:
+                coords = np.array([self._coords[store_id] for store_id in found], dtype=float)
+                kth = np.partition(haversine_km(lat, lng, coords[:, 0], coords[:, 1]), k - 1)[k - 1]
+                if kth <= reach_km:
+                    break
+            ring += 1
+        return found
+
+    def _ring(self, ci: int, cj: int, ring: int) -> Iterable[int]:
+        if ring == 0:
+            yield from self._cells.get((ci, cj), ())
+            return
+        for di in range(-ring, ring + 1):
+            # Linhas de cima e de baixo inteiras; nas demais, só as duas bordas.
+            step = 1 if abs(di) == ring else 2 * ring
+            for dj in range(-ring, ring + 1, step):
+                yield from self._cells.get((ci + di, cj + dj), ())
+
+    def _add(self, store_id: int, lat: float, lng: float) -> None:
+        self._coords[store_id] = (lat, lng)
+        self._cells.setdefault(self.cell(lat, lng), set()).add(store_id)
+
+    def _remove(self, store_id: int) -> None:
+        coords = self._coords.pop(store_id, None)
+        if coords is None:
+            return
+        cell = self.cell(*coords)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(store_id)
+            if not members:
+                del self._cells[cell]
+
+
+def _indexable_stores() -> QuerySet[Store]:
+    return Store.objects.filter(
+        status=True, address__latitude__isnull=False, address__longitude__isnull=False
+    ).order_by()
+
+
+index = StoreIndex(
+    cell_degrees=getattr(settings, "STORE_GRID_DEGREES", DEFAULT_GRID_DEGREES),
+    ttl=getattr(settings, "STORE_INDEX_TTL", DEFAULT_TTL),
+)
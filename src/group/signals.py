@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from customer.models import Address
+from group.models import Store
+from group.services import store_locator
+
+
+@receiver(post_save, sender=Store, dispatch_uid="group.store_locator.store_saved")
+def reindex_saved_store(sender: type[Store], instance: Store, **kwargs: Any) -> None:
+    store_locator.index.refresh([instance.pk])
+
+
+@receiver(post_delete, sender=Store, dispatch_uid="group.store_locator.store_deleted")
+def unindex_deleted_store(sender: type[Store], instance: Store, **kwargs: Any) -> None:
+    store_locator.index.remove(instance.pk)
+
+
+@receiver(post_save, sender=Address, dispatch_uid="group.store_locator.address_saved")
+def reindex_address_stores(sender: type[Address], instance: Address, **kwargs: Any) -> None:
+    # Endereços de clientes também passam aqui e custam a consulta das lojas do endereço: só
+    # vale a pena com o índice já carregado neste worker, que senão lê tudo na primeira busca.
+    if store_locator.index.loaded:
+        store_locator.index.refresh(instance.stores.values_list("pk", flat=True))
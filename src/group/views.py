@@ -1,3 +1,28 @@
-from django.shortcuts import render
+import logging
 
-# Create your views here.
+from ninja import Query
+from ninja_extra import ControllerBase, api_controller, http_get
+
+from group.models import Store
+from group.schemas import NearestStoreInput, NearestStoreSchema
+from group.services import store_locator
+
+logger = logging.getLogger(__name__)
+
+
+@api_controller("/stores", tags=["Lojas"])
+class StoreController(ControllerBase):
+    @http_get("/nearest", response=list[NearestStoreSchema])
+    def nearest(self, query: Query[NearestStoreInput]) -> list[Store]:
+        """Closest active stores to a point, from the in-memory grid index."""
+        nearby = store_locator.index.nearest(query.lat, query.lng, k=query.k, max_km=query.max_km)
+        stores = Store.objects.select_related("address").in_bulk(
+            [store.store_id for store in nearby]
+        )
+        results = []
+        for store_id, distance_km in nearby:
+            store = stores.get(store_id)
+            if store is not None:
+                store.distance_km = distance_km  # type: ignore[attr-defined]
+                results.append(store)
+        return results
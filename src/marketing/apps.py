@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MarketingConfig(AppConfig):
     name = 'marketing'
+
+    def ready(self) -> None:
+        from marketing import signals  # noqa: F401, PLC0415
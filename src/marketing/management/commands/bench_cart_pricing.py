@@ -0,0 +1,134 @@
+import random
+import statistics
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from catalog.models import Product
+from marketing.models import Campaign, Offer
+from marketing.services import pricing
+from utils.perf import Stopwatch, throwaway_transaction
+
+
+def _percentiles(timings: list[float]) -> str:
+    timings.sort()
+    return (
+        f"p50 {statistics.median(timings):.2f}ms, "
+        f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f}ms, máx {timings[-1]:.2f}ms"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a latência de /cart/price para carrinhos grandes com o índice de ofertas em "
+        "memória, comparada a uma consulta de ofertas por item. Tudo roda numa transação "
+        "desfeita ao final."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--products", type=int, default=20_000)
+        parser.add_argument("--offers", type=int, default=2_000)
+        parser.add_argument("--products-per-offer", type=int, default=25)
+        parser.add_argument("--sizes", type=int, nargs="+", default=[60, 200, 1_000])
+        parser.add_argument("--carts", type=int, default=100, help="Carrinhos por tamanho")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rng = random.Random(options["seed"])
+        with throwaway_transaction():
+            product_ids = self._seed(rng, options)
+            stopwatch = Stopwatch()
+            pricing.index.rebuild()
+            self.stdout.write(
+                f"índice: {len(pricing.index):,} produtos com oferta em "
+                f"{stopwatch.elapsed * 1000:.0f}ms"
+            )
+
+            for size in options["sizes"]:
+                carts = [
+                    [
+                        (product_id, rng.randint(1, 4))
+                        for product_id in rng.sample(product_ids, size)
+                    ]
+                    for _ in range(options["carts"])
+                ]
+                timings = []
+                for cart in carts:
+                    stopwatch = Stopwatch()
+                    pricing.price_cart(cart)
+                    timings.append(stopwatch.elapsed * 1000)
+                self.stdout.write(f"{size} itens, {len(carts)} carrinhos: {_percentiles(timings)}")
+
+                # Referência: uma consulta de ofertas vigentes por item, sem o índice.
+                timings = []
+                for cart in carts[:10]:
+                    stopwatch = Stopwatch()
+                    now = timezone.now()
+                    for product_id, _ in cart:
+                        list(
+                            Offer.objects.filter(
+                                products=product_id,
+                                campaign__is_active=True,
+                                campaign__start_date__lte=now,
+                                campaign__end_date__gte=now,
+                            ).values_list("pk", "offer_type", "discount_value")
+                        )
+                    timings.append(stopwatch.elapsed * 1000)
+                self.stdout.write(f"  consulta por item: {_percentiles(timings)}")
+
+    def _seed(self, rng: random.Random, options: dict[str, Any]) -> list[int]:
+        stopwatch = Stopwatch()
+        product_ids = [
+            product.pk
+            for product in Product.objects.bulk_create(
+                (
+                    Product(
+                        name=f"Bench {i}",
+                        description="",
+                        price=rng.randint(100, 50_000) / 100,
+                        sku=f"BENCH-CART-{i}",
+                        barcode=f"BENCH-CART-{i}",
+                    )
+                    for i in range(options["products"])
+                ),
+                batch_size=5_000,
+            )
+        ]
+        now = timezone.now()
+        campaigns = Campaign.objects.bulk_create(
+            Campaign(
+                name=f"Bench {i}",
+                start_date=now - timedelta(days=rng.randint(-5, 30)),
+                end_date=now + timedelta(days=rng.randint(-5, 30)),
+            )
+            for i in range(max(options["offers"] // 20, 1))
+        )
+        types = [offer_type for offer_type, _ in Offer.OFFER_TYPES]
+        offers = Offer.objects.bulk_create(
+            Offer(
+                campaign=rng.choice(campaigns),
+                name=f"Bench {i}",
+                offer_type=(offer_type := rng.choice(types)),
+                discount_value=rng.randint(5, 40)
+                if offer_type == "PERCENTAGE"
+                else rng.randint(1, 20),
+                min_purchase_amount=rng.choice([0, 0, 100, 500]),
+                is_exclusive_for_loyalty=rng.random() < 0.1,  # noqa: PLR2004
+            )
+            for i in range(options["offers"])
+        )
+        Offer.products.through.objects.bulk_create(
+            (
+                Offer.products.through(offer_id=offer.pk, product_id=product_id)
+                for offer in offers
+                for product_id in rng.sample(product_ids, options["products_per_offer"])
+            ),
+            batch_size=5_000,
+        )
+        self.stdout.write(
+            f"{len(product_ids):,} produtos e {len(offers):,} ofertas semeados em "
+            f"{stopwatch.elapsed:.1f}s"
+        )
+        return product_ids
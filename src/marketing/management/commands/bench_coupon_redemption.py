@@ -0,0 +1,132 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections, connections
+from django.db.models import Count
+from django.utils import timezone
+
+from customer.models import Customer, CustomerDocument
+from marketing.models import Coupon, CouponRedemption, Offer
+from marketing.services import coupons
+from utils.perf import Stopwatch
+
+PREFIX = "BENCH-COUPON-"
+
+
+def _naive_redeem(code: str, customer_id: int) -> None:
+    # O padrão antigo: confere is_valid() e os usos do cliente em Python e grava o contador.
+    coupon = Coupon.objects.get(code=code)
+    used = CouponRedemption.objects.filter(coupon=coupon, customer_id=customer_id).count()
+    if not coupon.is_valid() or used >= coupon.max_usages_per_customer:
+        raise coupons.CouponUnavailable(code)
+    coupon.current_usages += 1
+    coupon.save(update_fields=["current_usages"])
+    CouponRedemption.objects.create(coupon=coupon, customer_id=customer_id)
+
+
+def _atomic_redeem(code: str, customer_id: int) -> None:
+    coupons.redeem(code, customer_id)
+
+
+MODES = {"naive": _naive_redeem, "atomic": _atomic_redeem}
+REJECTED = (coupons.CouponUnavailable, coupons.CustomerLimitReached)
+
+
+class Command(BaseCommand):
+    help = (
+        "Teste de carga de resgates concorrentes de um mesmo cupom: mede resgates/s e confere "
+        "se os limites global e por cliente estouraram. Grava e remove registros BENCH-COUPON-* "
+        "(use um banco de teste em arquivo ou PostgreSQL)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--workers", type=int, default=16)
+        parser.add_argument("--attempts", type=int, default=100, help="Resgates por worker")
+        parser.add_argument("--customers", type=int, default=400)
+        parser.add_argument("--max-usages", type=int, default=500)
+        parser.add_argument("--per-customer", type=int, default=1)
+        parser.add_argument("--mode", choices=[*MODES, "all"], default="all")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        modes = list(MODES) if options["mode"] == "all" else [options["mode"]]
+        try:
+            customer_ids = self._seed_customers(options["customers"])
+            for mode in modes:
+                self._run(mode, customer_ids, options)
+        finally:
+            Offer.objects.filter(name__startswith=PREFIX).delete()
+            CustomerDocument.objects.filter(document_number__startswith=PREFIX).delete()
+
+    def _run(self, mode: str, customer_ids: list[int], options: dict[str, Any]) -> None:
+        workers, attempts = options["workers"], options["attempts"]
+        now = timezone.now()
+        coupon = Coupon.objects.create(
+            code=f"{PREFIX}{mode}",
+            offer=Offer.objects.create(name=f"{PREFIX}{mode}", discount_value=10),
+            max_usages=options["max_usages"],
+            max_usages_per_customer=options["per_customer"],
+            valid_from=now - timedelta(hours=1),
+            valid_until=now + timedelta(hours=1),
+        )
+        redeem = MODES[mode]
+
+        def worker(seed: int) -> tuple[int, int]:
+            rng = random.Random(seed)
+            granted = rejected = 0
+            try:
+                for _ in range(attempts):
+                    try:
+                        redeem(coupon.code, rng.choice(customer_ids))
+                    except REJECTED:
+                        rejected += 1
+                    else:
+                        granted += 1
+            finally:
+                close_old_connections()
+                connections.close_all()
+            return granted, rejected
+
+        stopwatch = Stopwatch()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(worker, range(workers)))
+        elapsed = stopwatch.elapsed
+
+        granted = sum(result[0] for result in results)
+        coupon.refresh_from_db()
+        rows = CouponRedemption.objects.filter(coupon=coupon)
+        over_limit = (
+            rows.values("customer_id")
+            .annotate(uses=Count("pk"))
+            .filter(uses__gt=coupon.max_usages_per_customer)
+            .count()
+        )
+        self.stdout.write(
+            f"{mode:>7}: {workers * attempts / elapsed:,.0f} resgates/s "
+            f"({workers} workers x {attempts} em {elapsed:.2f}s), concedidos {granted}, "
+            f"usos {coupon.current_usages}/{coupon.max_usages}, "
+            f"estouro global {max(rows.count() - coupon.max_usages, 0)}, "
+            f"clientes acima do limite {over_limit}, "
+            f"contador divergente {coupon.current_usages - rows.count()}"
+        )
+
+    def _seed_customers(self, count: int) -> list[int]:
+        documents = CustomerDocument.objects.bulk_create(
+            CustomerDocument(document_type="CPF", document_number=f"{PREFIX}{i}")
+            for i in range(count)
+        )
+        return [
+            customer.pk
+            for customer in Customer.objects.bulk_create(
+                Customer(
+                    username=f"{PREFIX}{i}",
+                    email=f"{PREFIX.lower()}{i}@example.com",
+                    password="!",
+                    phone="11999999999",
+                    document_id=document.pk,
+                )
+                for i, document in enumerate(documents)
+            )
+        ]
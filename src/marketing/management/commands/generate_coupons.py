@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from marketing.services.coupon_codes import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_LENGTH,
+    OfferNotFound,
+    generate,
+)
+
+
+def _aware(value: datetime) -> datetime:
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera --count cupons de uso único para uma oferta (ex.: --offer 3 --count 1000000), "
+        "em lotes vetorizados sem colisões, e informa a vazão em códigos/s."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--offer", type=int, required=True)
+        parser.add_argument("--count", type=int, required=True)
+        parser.add_argument("--length", type=int, default=DEFAULT_LENGTH)
+        parser.add_argument("--prefix", default="")
+        parser.add_argument(
+            "--valid-from",
+            type=datetime.fromisoformat,
+            default=None,
+            help="Início da validade (AAAA-MM-DD[THH:MM]); padrão: agora",
+        )
+        parser.add_argument("--valid-days", type=int, default=30)
+        parser.add_argument("--max-usages", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument("--seed", type=int, default=None)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        valid_from = _aware(options["valid_from"] or timezone.now())
+        try:
+            report = generate(
+                options["offer"],
+                options["count"],
+                valid=(valid_from, valid_from + timedelta(days=options["valid_days"])),
+                length=options["length"],
+                prefix=options["prefix"],
+                max_usages=options["max_usages"],
+                batch_size=options["batch_size"],
+                seed=options["seed"],
+            )
+        except (OfferNotFound, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.created:,} cupons criados para a oferta {report.offer_id} em "
+                f"{report.batches} lotes, {report.elapsed_seconds:.2f}s "
+                f"({report.codes_per_second:,.0f} códigos/s); colisões: "
+                f"{report.duplicates_in_memory} em memória, {report.existing_in_db} no banco, "
+                f"{report.conflicts_on_insert} na inserção"
+            )
+        )
@@ -0,0 +1,29 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from marketing.services.rfm import DEFAULT_CHUNK_SIZE, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula os segmentos RFM dos clientes. Por padrão só reprocessa quem teve pedidos "
+        "desde a última execução; --full recalcula a base inteira (agende um completo por dia)."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--full", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        report = run(full=options["full"], chunk_size=options["chunk_size"])
+        for segment, count in sorted(report.counts.items()):
+            self.stdout.write(f"{segment}: {count}")
+        kind = "completa" if report.full else "incremental"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Segmentação {kind}: {report.customers_scored} clientes calculados, "
+                f"{report.customers_removed} removidos em {report.elapsed_seconds:.2f}s "
+                f"(pedidos até o ID {report.order_watermark})"
+            )
+        )
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0004_loyalty_points_ledger'),
+        ('marketing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SegmentationRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full', models.BooleanField(default=False, verbose_name='Completa')),
+                ('order_watermark', models.BigIntegerField(verbose_name="Marca d'água (ID do pedido)")),
+                ('customers_scored', models.PositiveIntegerField(default=0, verbose_name='Clientes calculados')),
+                ('started_at', models.DateTimeField(verbose_name='Início')),
+                ('finished_at', models.DateTimeField(verbose_name='Fim')),
+            ],
+            options={
+                'verbose_name': 'Execução da segmentação',
+                'verbose_name_plural': 'Execuções da segmentação',
+                'ordering': ['-finished_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CustomerSegment',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='segment', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Cliente')),
+                ('last_order_at', models.DateTimeField(verbose_name='Último pedido')),
+                ('frequency', models.PositiveIntegerField(verbose_name='Pedidos')),
+                ('monetary', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Valor gasto')),
+                ('recency_score', models.PositiveSmallIntegerField(verbose_name='Escore de recência')),
+                ('frequency_score', models.PositiveSmallIntegerField(verbose_name='Escore de frequência')),
+                ('monetary_score', models.PositiveSmallIntegerField(verbose_name='Escore de valor')),
+                ('segment', models.CharField(choices=[('CHAMPIONS', 'Campeões'), ('LOYAL', 'Fiéis'), ('PROMISING', 'Promissores'), ('NEEDS_ATTENTION', 'Precisam de atenção'), ('AT_RISK', 'Em risco'), ('HIBERNATING', 'Hibernando')], max_length=20, verbose_name='Segmento')),
+                ('computed_at', models.DateTimeField(verbose_name='Calculado em')),
+            ],
+            options={
+                'verbose_name': 'Segmento do cliente',
+                'verbose_name_plural': 'Segmentos dos clientes',
+                'indexes': [models.Index(fields=['segment'], name='customer_segment_idx')],
+            },
+        ),
+    ]
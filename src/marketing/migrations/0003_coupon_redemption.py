@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0002_customer_segments'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CouponRedemption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('redeemed_at', models.DateTimeField(auto_now_add=True, verbose_name='Resgatado em')),
+                ('coupon', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='redemptions', to='marketing.coupon', verbose_name='Cupom')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coupon_redemptions', to=settings.AUTH_USER_MODEL, verbose_name='Cliente')),
+            ],
+            options={
+                'verbose_name': 'Resgate de cupom',
+                'verbose_name_plural': 'Resgates de cupons',
+                'ordering': ['-redeemed_at'],
+                'indexes': [models.Index(fields=['coupon', 'customer'], name='coupon_redemption_customer_idx')],
+            },
+        ),
+    ]
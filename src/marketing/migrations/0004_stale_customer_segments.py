@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:07
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketing', '0003_coupon_redemption'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleCustomerSegment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('marked_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Marcado em')),
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stale_segment', to=settings.AUTH_USER_MODEL, verbose_name='Cliente')),
+            ],
+            options={
+                'verbose_name': 'Segmento a recalcular',
+                'verbose_name_plural': 'Segmentos a recalcular',
+            },
+        ),
+    ]
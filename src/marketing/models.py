@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from catalog.models import Product
+from customer.models import Customer
 
 
 class Campaign(models.Model):
@@ -44,8 +46,6 @@ class Coupon(models.Model):
         return self.code
 
     def is_valid(self) -> bool:
-        from django.utils import timezone
-
         now = timezone.now()
         return (
             self.is_active
@@ -86,6 +86,32 @@ class Offer(models.Model):
         return self.name
 
 
+class CouponRedemption(models.Model):
+    """Uso de um cupom por um cliente; conta para o ``max_usages_per_customer``."""
+
+    coupon = models.ForeignKey[Coupon](
+        Coupon, on_delete=models.CASCADE, related_name="redemptions", verbose_name=_("Cupom")
+    )
+    customer = models.ForeignKey[Customer](
+        Customer,
+        on_delete=models.CASCADE,
+        related_name="coupon_redemptions",
+        verbose_name=_("Cliente"),
+    )
+    redeemed_at = models.DateTimeField(_("Resgatado em"), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Resgate de cupom")
+        verbose_name_plural = _("Resgates de cupons")
+        ordering = ["-redeemed_at"]
+        indexes = [
+            models.Index(fields=["coupon", "customer"], name="coupon_redemption_customer_idx")
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.coupon_id} - {self.customer_id}"
+
+
 class Contact(models.Model):
     class Type(models.TextChoices):
         PHONE = "PHONE", _("Telefone")
@@ -130,3 +156,80 @@ class SocialMedia(models.Model):
 
     def __str__(self) -> str:
         return f"{self.type} - {self.value}"
+
+
+class CustomerSegment(models.Model):
+    """Escores RFM (1 a 5) e o segmento de cada cliente com pedidos, recalculados em lote."""
+
+    class Segment(models.TextChoices):
+        CHAMPIONS = "CHAMPIONS", _("Campeões")
+        LOYAL = "LOYAL", _("Fiéis")
+        PROMISING = "PROMISING", _("Promissores")
+        NEEDS_ATTENTION = "NEEDS_ATTENTION", _("Precisam de atenção")
+        AT_RISK = "AT_RISK", _("Em risco")
+        HIBERNATING = "HIBERNATING", _("Hibernando")
+
+    customer = models.OneToOneField[Customer](
+        Customer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="segment",
+        verbose_name=_("Cliente"),
+    )
+    last_order_at = models.DateTimeField(_("Último pedido"))
+    frequency = models.PositiveIntegerField(_("Pedidos"))
+    monetary = models.DecimalField(_("Valor gasto"), max_digits=14, decimal_places=2)
+    recency_score = models.PositiveSmallIntegerField(_("Escore de recência"))
+    frequency_score = models.PositiveSmallIntegerField(_("Escore de frequência"))
+    monetary_score = models.PositiveSmallIntegerField(_("Escore de valor"))
+    segment = models.CharField(_("Segmento"), max_length=20, choices=Segment.choices)
+    computed_at = models.DateTimeField(_("Calculado em"))
+
+    class Meta:
+        verbose_name = _("Segmento do cliente")
+        verbose_name_plural = _("Segmentos dos clientes")
+        indexes = [models.Index(fields=["segment"], name="customer_segment_idx")]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.customer_id} - {self.segment} "
+            f"({self.recency_score}{self.frequency_score}{self.monetary_score})"
+        )
+
+
+class StaleCustomerSegment(models.Model):
+    """Cliente com pedidos alterados desde a última segmentação, a recalcular na próxima."""
+
+    customer = models.OneToOneField[Customer](
+        Customer,
+        on_delete=models.CASCADE,
+        related_name="stale_segment",
+        verbose_name=_("Cliente"),
+    )
+    # Renovado a cada nova marcação do cliente: a segmentação só apaga as marcações que leu.
+    marked_at = models.DateTimeField(_("Marcado em"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Segmento a recalcular")
+        verbose_name_plural = _("Segmentos a recalcular")
+
+    def __str__(self) -> str:
+        return str(self.customer_id)
+
+
+class SegmentationRun(models.Model):
+    """Execução do job RFM; ``order_watermark`` é o maior ID de pedido já considerado."""
+
+    full = models.BooleanField(_("Completa"), default=False)
+    order_watermark = models.BigIntegerField(_("Marca d'água (ID do pedido)"))
+    customers_scored = models.PositiveIntegerField(_("Clientes calculados"), default=0)
+    started_at = models.DateTimeField(_("Início"))
+    finished_at = models.DateTimeField(_("Fim"))
+
+    class Meta:
+        verbose_name = _("Execução da segmentação")
+        verbose_name_plural = _("Execuções da segmentação")
+        ordering = ["-finished_at"]
+
+    def __str__(self) -> str:
+        return f"{self.finished_at:%Y-%m-%d %H:%M} - {self.customers_scored}"
@@ -0,0 +1,148 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Self
+
+from ninja import Field, Schema
+from pydantic import model_validator
+
+from marketing.services.coupon_codes import DEFAULT_LENGTH, MAX_COUNT, MAX_LENGTH, MIN_LENGTH
+
+
+class SegmentCountSchema(Schema):
+    segment: str
+    customers: int
+
+
+class CustomerSegmentSchema(Schema):
+    customer_id: int
+    segment: str
+    recency_score: int
+    frequency_score: int
+    monetary_score: int
+    last_order_at: datetime
+    frequency: int
+    monetary: Decimal
+    computed_at: datetime
+
+
+class CartItemInput(Schema):
+    product_id: int
+    quantity: int = Field(..., gt=0)
+
+
+class CartInput(Schema):
+    items: list[CartItemInput] = Field(..., min_length=1, max_length=1_000)
+    customer_id: int | None = None
+
+
+class CartLineSchema(Schema):
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    subtotal: Decimal
+    discount: Decimal
+    total: Decimal
+    offer_id: int | None
+
+
+class CartPriceSchema(Schema):
+    lines: list[CartLineSchema]
+    subtotal: Decimal
+    discount: Decimal
+    total: Decimal
+
+
+class RedeemCouponInput(Schema):
+    customer_id: int
+
+
+class CouponRedemptionSchema(Schema):
+    id: int
+    coupon_id: int
+    code: str
+    offer_id: int
+    customer_id: int
+    redeemed_at: datetime
+    usages: int
+    remaining: int
+
+
+class CouponStatusSchema(Schema):
+    code: str
+    offer_id: int
+    valid: bool
+    remaining: int
+
+
+class CouponFilterStatsSchema(Schema):
+    items: int = Field(..., alias="bloom.items")
+    capacity: int = Field(..., alias="bloom.capacity")
+    bits: int = Field(..., alias="bloom.bits")
+    hashes: int = Field(..., alias="bloom.hashes")
+    size_bytes: int = Field(..., alias="bloom.size_bytes")
+    fill_ratio: float = Field(..., alias="bloom.fill_ratio")
+    target_false_positive_rate: float = Field(..., alias="bloom.target_error_rate")
+    expected_false_positive_rate: float = Field(..., alias="bloom.expected_error_rate")
+    checks: int
+    rejected: int
+    false_positives: int
+    observed_false_positive_rate: float
+
+
+class CouponGenerationInput(Schema):
+    offer_id: int
+    count: int = Field(..., gt=0, le=MAX_COUNT)
+    length: int = Field(DEFAULT_LENGTH, ge=MIN_LENGTH, le=MAX_LENGTH)
+    prefix: str = Field("", max_length=20, pattern=r"^[A-Z0-9-]*$")
+    valid_from: datetime
+    valid_until: datetime
+    max_usages: int = Field(1, gt=0)
+    max_usages_per_customer: int = Field(1, gt=0)
+
+    @model_validator(mode="after")
+    def ordered(self) -> Self:
+        if self.valid_until < self.valid_from:
+            msg = "O fim da validade deve ser posterior ao início"
+            raise ValueError(msg)
+        return self
+
+
+class CouponGenerationSchema(Schema):
+    offer_id: int
+    requested: int
+    created: int
+    batches: int
+    duplicates_in_memory: int
+    existing_in_db: int
+    conflicts_on_insert: int
+    elapsed_seconds: float
+    codes_per_second: float
+
+
+class ProductPerformanceSchema(Schema):
+    product_id: int
+    units: int
+    orders: int
+    gross_revenue: Decimal
+    discount: Decimal
+    revenue: Decimal
+    baseline_revenue: Decimal
+
+
+class CampaignReportSchema(Schema):
+    campaign_id: int
+    name: str
+    budget: Decimal
+    start: datetime
+    end: datetime
+    baseline_start: datetime
+    computed_at: datetime
+    units: int
+    gross_revenue: Decimal
+    discount: Decimal
+    revenue: Decimal
+    baseline_revenue: Decimal
+    incremental_revenue: Decimal
+    lift: float | None
+    return_on_budget: float | None
+    products: list[ProductPerformanceSchema]
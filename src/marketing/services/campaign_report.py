@@ -0,0 +1,222 @@
+"""Campaign performance from one grouped SQL query, cached per campaign.
+
+The report covers the paid order items of the campaign's offer products sold inside its window
+(up to now, for a running campaign) and, for the lift, the same products over a baseline of equal
+length just before the start. One ``GROUP BY product`` query computes both sides with filtered
+aggregates; the order discount is allocated to items as in the sales rollups. Windows that reach
+back to the newest archived order also read the archived items, one more query.
+
+Reports are cached with Django's cache per campaign for ``CAMPAIGN_REPORT_CACHE_TTL`` seconds and
+dropped when orders land in a campaign's window or baseline, on the ``orders_changed`` signal
+the sales app sends after every transaction that touches orders. With the default per-process
+cache the TTL bounds what other workers see; a shared backend makes the invalidation global.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from marketing.models import Campaign, Offer
+from sales.manager import MONEY, line_total
+from sales.models import ArchivedOrderItem, Order, OrderItem
+from sales.services import archive
+from sales.services.rollups import LINE_DISCOUNT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+    from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL = 300
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+LINE_TOTAL = line_total()
+
+
+class CampaignNotFound(Exception):  # noqa: N818
+    pass
+
+
+@dataclass(slots=True)
+class ProductPerformance:
+    product_id: int
+    units: int = 0
+    orders: int = 0
+    gross_revenue: Decimal = ZERO
+    discount: Decimal = ZERO
+    baseline_revenue: Decimal = ZERO
+
+    @property
+    def revenue(self) -> Decimal:
+        return self.gross_revenue - self.discount
+
+
+@dataclass(slots=True)
+class CampaignReport:
+    campaign_id: int
+    name: str
+    budget: Decimal
+    start: datetime
+    end: datetime
+    baseline_start: datetime
+    computed_at: datetime
+    products: list[ProductPerformance] = field(default_factory=list)
+
+    @property
+    def units(self) -> int:
+        return sum(product.units for product in self.products)
+
+    @property
+    def gross_revenue(self) -> Decimal:
+        return sum((product.gross_revenue for product in self.products), ZERO)
+
+    @property
+    def discount(self) -> Decimal:
+        """Discount cost: the order discounts allocated to the campaign's items."""
+        return sum((product.discount for product in self.products), ZERO)
+
+    @property
+    def revenue(self) -> Decimal:
+        return self.gross_revenue - self.discount
+
+    @property
+    def baseline_revenue(self) -> Decimal:
+        return sum((product.baseline_revenue for product in self.products), ZERO)
+
+    @property
+    def incremental_revenue(self) -> Decimal:
+        return self.revenue - self.baseline_revenue
+
+    @property
+    def lift(self) -> float | None:
+        """Revenue over the baseline, minus one; ``None`` without baseline sales."""
+        baseline = self.baseline_revenue
+        return float(self.revenue / baseline - 1) if baseline else None
+
+    @property
+    def return_on_budget(self) -> float | None:
+        return (
+            float((self.incremental_revenue - self.budget) / self.budget) if self.budget else None
+        )
+
+
+def cache_key(campaign_id: int) -> str:
+    return f"marketing:campaign_report:{campaign_id}"
+
+
+def get(campaign_id: int) -> CampaignReport:
+    """The campaign's report, from the cache or computed and cached."""
+    report = cache.get(cache_key(campaign_id))
+    if report is None:
+        report = compute(campaign_id)
+        cache.set(
+            cache_key(campaign_id),
+            report,
+            getattr(settings, "CAMPAIGN_REPORT_CACHE_TTL", DEFAULT_CACHE_TTL),
+        )
+    return report
+
+
+def compute(campaign_id: int, now: datetime | None = None) -> CampaignReport:
+    campaign = Campaign.objects.filter(pk=campaign_id).first()
+    if campaign is None:
+        msg = f"Campanha {campaign_id} não encontrada"
+        raise CampaignNotFound(msg)
+    now = now or timezone.now()
+    end = min(campaign.end_date, now)
+    report = CampaignReport(
+        campaign_id=campaign.pk,
+        name=campaign.name,
+        budget=campaign.budget,
+        start=campaign.start_date,
+        end=end,
+        baseline_start=campaign.start_date - max(end - campaign.start_date, timedelta(0)),
+        computed_at=now,
+    )
+    if end <= campaign.start_date:
+        return report
+
+    sources: list[QuerySet[OrderItem] | QuerySet[ArchivedOrderItem]] = [OrderItem.objects.all()]
+    archived_until = archive.newest_sale_date()
+    if archived_until is not None and archived_until >= report.baseline_start:
+        sources.append(ArchivedOrderItem.objects.all())
+    products: dict[int, ProductPerformance] = {}
+    for items in sources:
+        for row in _grouped(items, campaign.pk, report):
+            product = products.setdefault(row["product_id"], ProductPerformance(row["product_id"]))
+            product.units += row["units"]
+            product.orders += row["orders"]
+            # O rateio do desconto sai do SQLite sem arredondar.
+            product.gross_revenue += _money(row["gross"])
+            product.discount += _money(row["discount"])
+            product.baseline_revenue += _money(row["baseline_gross"]) - _money(
+                row["baseline_discount"]
+            )
+    report.products = sorted(products.values(), key=lambda p: (-p.revenue, p.product_id))
+    return report
+
+
+def _money(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def _grouped(
+    items: QuerySet[OrderItem] | QuerySet[ArchivedOrderItem],
+    campaign_id: int,
+    report: CampaignReport,
+) -> QuerySet:
+    in_campaign = Q(order__sale_date__gte=report.start)
+    baseline = ~in_campaign
+    return (
+        items.filter(
+            order__status=Order.Status.PAID,
+            order__sale_date__gte=report.baseline_start,
+            order__sale_date__lte=report.end,
+            # IN (subconsulta): um produto em várias ofertas da campanha não duplica linhas.
+            product_id__in=Offer.products.through.objects.filter(
+                offer__campaign_id=campaign_id
+            ).values("product_id"),
+        )
+        .order_by()
+        .values("product_id")
+        .annotate(
+            units=Sum("quantity", filter=in_campaign, default=0),
+            orders=Count("order_id", filter=in_campaign, distinct=True),
+            gross=Cast(Sum(LINE_TOTAL, filter=in_campaign, default=0), output_field=MONEY),
+            discount=Cast(Sum(LINE_DISCOUNT, filter=in_campaign, default=0.0), output_field=MONEY),
+            baseline_gross=Cast(Sum(LINE_TOTAL, filter=baseline, default=0), output_field=MONEY),
+            baseline_discount=Cast(
+                Sum(LINE_DISCOUNT, filter=baseline, default=0.0), output_field=MONEY
+            ),
+        )
+    )
+
+
+def forget(campaign_ids: Iterable[int]) -> None:
+    cache.delete_many([cache_key(campaign_id) for campaign_id in campaign_ids])
+
+
+def invalidate(sale_dates: Iterable[datetime]) -> None:
+    """Drop the reports whose window or baseline may include orders sold on ``sale_dates``."""
+    dates = list(sale_dates)
+    if not dates:
+        return
+    first, last = min(dates), max(dates)
+    campaigns = Campaign.objects.filter(end_date__gte=first).values_list(
+        "pk", "start_date", "end_date"
+    )
+    # O período de comparação tem no máximo a duração da campanha.
+    forget(pk for pk, start, end in campaigns if start - (end - start) <= last)
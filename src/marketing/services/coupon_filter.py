@@ -0,0 +1,159 @@
+"""Per-worker Bloom filter of coupon codes, so invalid codes are rejected without a query.
+
+Holds every code whose coupon has not expired yet, active or not (reactivating a coupon must not
+need a rebuild). A code outside the filter certainly has no usable coupon; a code inside it may
+still be a false positive, which the database lookup settles and which is counted.
+
+Freshness, without per-request queries:
+
+* coupons saved in this worker are added by the ``Coupon`` signal;
+* every ``COUPON_FILTER_REFRESH`` seconds, coupons with an id above the highest one loaded minus
+  ``COUPON_FILTER_OVERLAP`` are read again (one indexed query) and the codes the filter still
+  rejects are added, which covers other workers and bulk inserts that bypass signals. Ids are
+  taken before commit, so a coupon can become visible after a higher id was loaded; the overlap
+  picks it up unless more than ``COUPON_FILTER_OVERLAP`` coupons were created meanwhile;
+* every ``COUPON_FILTER_TTL`` seconds, or when the filter is over capacity, it is rebuilt, which
+  drops deleted and expired codes. Bloom filters cannot remove keys.
+
+The filter loads on the first check of each worker rather than in ``AppConfig.ready()``, which
+must not query the database.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.utils import timezone
+
+from marketing.models import Coupon
+from utils.bloom import BloomFilter, BloomStats
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_REFRESH = 5.0
+DEFAULT_TTL = 3_600.0
+DEFAULT_OVERLAP = 1_000
+# Folga para os cupons criados até a próxima reconstrução sem degradar a taxa de erro.
+HEADROOM = 2
+MIN_CAPACITY = 1_024
+
+
+@dataclass(slots=True, frozen=True)
+class CouponFilterStats:
+    bloom: BloomStats
+    checks: int
+    rejected: int
+    false_positives: int
+
+    @property
+    def observed_false_positive_rate(self) -> float:
+        """Share of unknown codes that got past the filter (and cost a query)."""
+        unknown = self.rejected + self.false_positives
+        return self.false_positives / unknown if unknown else 0.0
+
+
+class CouponCodeFilter:
+    def __init__(
+        self,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        refresh: float = DEFAULT_REFRESH,
+        ttl: float = DEFAULT_TTL,
+        overlap: int = DEFAULT_OVERLAP,
+    ) -> None:
+        self.error_rate = error_rate
+        self.refresh = refresh
+        self.ttl = ttl
+        self.overlap = overlap
+        self._bloom: BloomFilter | None = None
+        self._watermark = 0
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.rejected = 0
+        self.false_positives = 0
+
+    def rebuild(self) -> BloomFilter:
+        """Reload every code of a coupon that has not expired (one query)."""
+        rows = list(
+            Coupon.objects.filter(valid_until__gte=timezone.now())
+            .order_by()
+            .values_list("pk", "code")
+        )
+        bloom = BloomFilter(max(len(rows) * HEADROOM, MIN_CAPACITY), self.error_rate)
+        bloom.update(code for _, code in rows)
+        with self._lock:
+            self._bloom = bloom
+            self._watermark = max((pk for pk, _ in rows), default=0)
+            self._loaded_at = self._refreshed_at = time.monotonic()
+        logger.info(
+            "Coupon filter rebuilt: %d codes, %d bytes", len(rows), bloom.stats().size_bytes
+        )
+        return bloom
+
+    def add(self, code: str) -> None:
+        self.update([code])
+
+    def update(self, codes: Iterable[str]) -> None:
+        """Add codes saved in this worker; a filter not loaded yet will read them anyway."""
+        bloom = self._bloom
+        if bloom is not None:
+            bloom.update(codes)
+
+    def might_exist(self, code: str) -> bool:
+        bloom = self._fresh()
+        self.checks += 1
+        if code in bloom:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_false_positive(self) -> None:
+        self.false_positives += 1
+
+    def stats(self) -> CouponFilterStats:
+        return CouponFilterStats(
+            bloom=self._fresh().stats(),
+            checks=self.checks,
+            rejected=self.rejected,
+            false_positives=self.false_positives,
+        )
+
+    def _fresh(self) -> BloomFilter:
+        now = time.monotonic()
+        bloom = self._bloom
+        if bloom is None or now - self._loaded_at > self.ttl or len(bloom) > bloom.capacity:
+            return self.rebuild()
+        if now - self._refreshed_at > self.refresh:
+            self._load_new(bloom)
+        return bloom
+
+    def _load_new(self, bloom: BloomFilter) -> None:
+        rows = list(
+            Coupon.objects.filter(pk__gt=self._watermark - self.overlap)
+            .order_by()
+            .values_list("pk", "code")
+        )
+        with self._lock:
+            if rows:
+                # A folga relê códigos já carregados: só entra o que o filtro ainda recusa.
+                bloom.update(code for _, code in rows if code not in bloom)
+                self._watermark = max(self._watermark, *(pk for pk, _ in rows))
+            self._refreshed_at = time.monotonic()
+
+
+codes = CouponCodeFilter(
+    error_rate=getattr(settings, "COUPON_FILTER_ERROR_RATE", DEFAULT_ERROR_RATE),
+    refresh=getattr(settings, "COUPON_FILTER_REFRESH", DEFAULT_REFRESH),
+    ttl=getattr(settings, "COUPON_FILTER_TTL", DEFAULT_TTL),
+    overlap=getattr(settings, "COUPON_FILTER_OVERLAP", DEFAULT_OVERLAP),
+)
@@ -0,0 +1,140 @@
+"""Coupon redemption that holds its limits under concurrent redeemers.
+
+The global limit is claimed with a single conditional ``UPDATE ... SET current_usages =
+current_usages + 1 WHERE current_usages < max_usages AND is_active AND now BETWEEN valid_from AND
+valid_until``: the check and the increment are one statement, so concurrent redemptions can
+neither overshoot ``max_usages`` nor lose increments. The per-customer limit is checked against
+``CouponRedemption`` (indexed by coupon and customer) in the same transaction, after the claim:
+the UPDATE keeps the coupon row locked until commit, so redemptions of one coupon count the
+customer's previous uses one at a time, and a rejected redemption rolls the claim back.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from customer.models import Customer
+from marketing.models import Coupon, CouponRedemption
+from marketing.services import coupon_filter
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class CouponNotFound(Exception):  # noqa: N818
+    pass
+
+
+class CustomerNotFound(Exception):  # noqa: N818
+    pass
+
+
+class CouponUnavailable(Exception):  # noqa: N818
+    """The coupon is inactive, outside its validity window or out of usages."""
+
+
+class CustomerLimitReached(Exception):  # noqa: N818
+    pass
+
+
+@dataclass(slots=True)
+class CouponStatus:
+    code: str
+    offer_id: int
+    valid: bool
+    remaining: int
+
+
+@dataclass(slots=True)
+class Redemption:
+    id: int
+    coupon_id: int
+    code: str
+    offer_id: int
+    customer_id: int
+    redeemed_at: datetime
+    usages: int
+    remaining: int
+
+
+def check(code: str) -> CouponStatus:
+    """Whether ``code`` can be redeemed right now; unknown codes raise :class:`CouponNotFound`."""
+    _ensure_known(code)
+    coupon = Coupon.objects.filter(code=code).first()
+    if coupon is None:
+        coupon_filter.codes.record_false_positive()
+        msg = f"Cupom {code} não encontrado"
+        raise CouponNotFound(msg)
+    return CouponStatus(
+        code=code,
+        offer_id=coupon.offer_id,
+        valid=coupon.is_valid(),
+        remaining=max(coupon.max_usages - coupon.current_usages, 0),
+    )
+
+
+def redeem(code: str, customer_id: int, *, now: datetime | None = None) -> Redemption:
+    """Use ``code`` once for ``customer_id``, or raise without consuming anything."""
+    _ensure_known(code)
+    now = now or timezone.now()
+    if not Customer.objects.filter(pk=customer_id).exists():
+        msg = f"Cliente {customer_id} não encontrado"
+        raise CustomerNotFound(msg)
+    claimable = Coupon.objects.filter(
+        code=code,
+        is_active=True,
+        valid_from__lte=now,
+        valid_until__gte=now,
+        current_usages__lt=F("max_usages"),
+    )
+    with transaction.atomic():
+        if not claimable.update(current_usages=F("current_usages") + 1):
+            raise _unavailable(code, now)
+        coupon = Coupon.objects.values(
+            "pk", "offer_id", "current_usages", "max_usages", "max_usages_per_customer"
+        ).get(code=code)
+        used = CouponRedemption.objects.filter(
+            coupon_id=coupon["pk"], customer_id=customer_id
+        ).count()
+        if used >= coupon["max_usages_per_customer"]:
+            # Sai da transação com exceção: o incremento acima é desfeito.
+            msg = f"Cliente {customer_id} já usou o cupom {code} {used} vez(es)"
+            raise CustomerLimitReached(msg)
+        redemption = CouponRedemption.objects.create(
+            coupon_id=coupon["pk"], customer_id=customer_id
+        )
+    return Redemption(
+        id=redemption.pk,
+        coupon_id=coupon["pk"],
+        code=code,
+        offer_id=coupon["offer_id"],
+        customer_id=customer_id,
+        redeemed_at=redemption.redeemed_at,
+        usages=coupon["current_usages"],
+        remaining=coupon["max_usages"] - coupon["current_usages"],
+    )
+
+
+def _ensure_known(code: str) -> None:
+    if not coupon_filter.codes.might_exist(code):
+        msg = f"Cupom {code} não encontrado"
+        raise CouponNotFound(msg)
+
+
+def _unavailable(code: str, now: datetime) -> Exception:
+    """Why the claim matched no row; only read on the failure path."""
+    coupon = Coupon.objects.filter(code=code).first()
+    if coupon is None:
+        coupon_filter.codes.record_false_positive()
+        return CouponNotFound(f"Cupom {code} não encontrado")
+    if not coupon.is_active or not coupon.valid_from <= now <= coupon.valid_until:
+        return CouponUnavailable(f"Cupom {code} inativo ou fora da validade")
+    return CouponUnavailable(f"Cupom {code} esgotado")
@@ -0,0 +1,189 @@
+"""Cart pricing against a per-worker index of product -> offers of running campaigns.
+
+The index is loaded with one query over the offer/product link table, keeping only offers whose
+campaign is active and not over yet; the date window itself is checked at pricing time, so a
+campaign that starts later needs no reload. Signals on ``Offer``/``Campaign`` and on the
+offer's product links drop the index of the current worker, which reloads on the next cart; the
+TTL bounds staleness across workers, like the barcode cache.
+
+Pricing a cart costs one query for product prices (plus one for the loyalty check when a
+customer is given): every line picks its best eligible offer from the index in a single pass.
+Offers do not stack; each line gets at most one.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from catalog.models import Product
+from customer.models import LoyaltyProgram
+from marketing.models import Offer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+
+DEFAULT_TTL = 60.0
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+
+class OfferRule(NamedTuple):
+    offer_id: int
+    offer_type: str
+    discount_value: Decimal
+    min_purchase_amount: Decimal
+    loyalty_only: bool
+    starts: datetime
+    ends: datetime
+
+    def discount(self, price: Decimal, quantity: int) -> Decimal:
+        """Discount on ``quantity`` units at ``price``, never more than the line itself."""
+        subtotal = price * quantity
+        if self.offer_type == "PERCENTAGE":
+            discount = (subtotal * self.discount_value / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+        elif self.offer_type == "FIXED_AMOUNT":
+            # Valor fixo por unidade.
+            discount = self.discount_value * quantity
+        else:
+            # BOGO: leve 2, pague 1.
+            discount = price * (quantity // 2)
+        return min(discount, subtotal)
+
+
+class OfferIndex:
+    def __init__(self, ttl: float = DEFAULT_TTL) -> None:
+        self.ttl = ttl
+        self._offers: dict[int, tuple[OfferRule, ...]] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offers)
+
+    def rebuild(self) -> None:
+        """Reload every offer of an active campaign that has not ended yet (one query)."""
+        rows = (
+            Offer.products.through.objects.filter(
+                offer__campaign__is_active=True, offer__campaign__end_date__gte=timezone.now()
+            )
+            .order_by()
+            .values_list(
+                "product_id",
+                "offer_id",
+                "offer__offer_type",
+                "offer__discount_value",
+                "offer__min_purchase_amount",
+                "offer__is_exclusive_for_loyalty",
+                "offer__campaign__start_date",
+                "offer__campaign__end_date",
+            )
+        )
+        offers: dict[int, list[OfferRule]] = {}
+        for product_id, *rule in rows:
+            offers.setdefault(product_id, []).append(OfferRule(*rule))
+        with self._lock:
+            self._offers = {product_id: tuple(rules) for product_id, rules in offers.items()}
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def offers(self, product_ids: Iterable[int]) -> dict[int, tuple[OfferRule, ...]]:
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl:
+            self.rebuild()
+        offers = self._offers
+        return {
+            product_id: offers[product_id] for product_id in product_ids if product_id in offers
+        }
+
+
+index = OfferIndex(ttl=getattr(settings, "OFFER_INDEX_TTL", DEFAULT_TTL))
+
+
+class UnknownProducts(Exception):  # noqa: N818
+    def __init__(self, product_ids: list[int]) -> None:
+        self.product_ids = product_ids
+        super().__init__(f"Produtos não encontrados: {product_ids}")
+
+
+@dataclass(slots=True)
+class CartLine:
+    product_id: int
+    quantity: int
+    unit_price: Decimal
+    discount: Decimal = ZERO
+    offer_id: int | None = None
+
+    @property
+    def subtotal(self) -> Decimal:
+        return self.unit_price * self.quantity
+
+    @property
+    def total(self) -> Decimal:
+        return self.subtotal - self.discount
+
+
+@dataclass(slots=True)
+class CartPrice:
+    lines: list[CartLine] = field(default_factory=list)
+    subtotal: Decimal = ZERO
+    discount: Decimal = ZERO
+
+    @property
+    def total(self) -> Decimal:
+        return self.subtotal - self.discount
+
+
+def price_cart(
+    items: Iterable[tuple[int, int]],
+    customer_id: int | None = None,
+    now: datetime | None = None,
+) -> CartPrice:
+    """Price ``(product_id, quantity)`` items with the best offer per line.
+
+    Repeated products are merged into one line. ``min_purchase_amount`` is checked against the
+    cart subtotal and loyalty-only offers require the customer to be in the loyalty program.
+    """
+    quantities: Counter[int] = Counter()
+    for product_id, quantity in items:
+        quantities[product_id] += quantity
+    prices = dict(Product.objects.filter(pk__in=quantities).values_list("pk", "price"))
+    missing = sorted(quantities.keys() - prices.keys())
+    if missing:
+        raise UnknownProducts(missing)
+    loyal = (
+        customer_id is not None and LoyaltyProgram.objects.filter(customer_id=customer_id).exists()
+    )
+    now = now or timezone.now()
+
+    cart = CartPrice(
+        lines=[
+            CartLine(product_id, quantity, prices[product_id])
+            for product_id, quantity in quantities.items()
+        ]
+    )
+    cart.subtotal = sum((line.subtotal for line in cart.lines), ZERO)
+    offers = index.offers(quantities)
+    for line in cart.lines:
+        for rule in offers.get(line.product_id, ()):
+            if (
+                rule.starts <= now <= rule.ends
+                and cart.subtotal >= rule.min_purchase_amount
+                and (loyal or not rule.loyalty_only)
+            ):
+                discount = rule.discount(line.unit_price, line.quantity)
+                if discount > line.discount:
+                    line.discount, line.offer_id = discount, rule.offer_id
+        cart.discount += line.discount
+    return cart
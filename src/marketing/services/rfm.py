@@ -0,0 +1,333 @@
+"""RFM segmentation: order aggregates streamed from the database, scored with NumPy quantiles.
+
+A full run aggregates every customer's non-cancelled orders, live and archived, in one
+streaming GROUP BY per table. An incremental run only re-aggregates changed customers and takes
+the quantile edges from the stored segments of everybody else. A customer is changed when
+``orders_changed`` queued them (see :func:`mark_stale`), which covers orders that commit out of
+id order and status changes on old orders, or when they have orders above the last run's
+watermark (the highest order id seen), which covers inserts that bypass the signal.
+"""
+
+from __future__ import annotations
+
+import logging
+import operator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from functools import reduce
+from itertools import batched
+from typing import TYPE_CHECKING
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from marketing.models import CustomerSegment, SegmentationRun, StaleCustomerSegment
+from sales.models import ArchivedOrder, Order
+from utils.perf import Stopwatch
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5_000
+QUANTILES = (0.2, 0.4, 0.6, 0.8)
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+MICROSECOND = timedelta(microseconds=1)
+Segment = CustomerSegment.Segment
+SCORED_FIELDS = [
+    "last_order_at",
+    "frequency",
+    "monetary",
+    "recency_score",
+    "frequency_score",
+    "monetary_score",
+    "segment",
+    "computed_at",
+]
+
+
+@dataclass(slots=True)
+class Aggregates:
+    """One row per customer: last order (epoch microseconds), order count and spend (cents).
+
+    Integers keep the round trip to ``DateTimeField``/``DecimalField`` exact.
+    """
+
+    customer_ids: np.ndarray
+    last_order: np.ndarray
+    frequency: np.ndarray
+    monetary: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, datetime, int, Decimal]]) -> Aggregates:
+        ids, last, frequency, monetary = [], [], [], []
+        for customer_id, last_order_at, count, amount in rows:
+            ids.append(customer_id)
+            last.append((last_order_at - EPOCH) // MICROSECOND)
+            frequency.append(count)
+            monetary.append(int((amount or 0) * 100))
+        return cls(
+            np.array(ids, dtype=np.int64),
+            np.array(last, dtype=np.int64),
+            np.array(frequency, dtype=np.int64),
+            np.array(monetary, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+
+    def without(self, customer_ids: np.ndarray) -> Aggregates:
+        keep = ~np.isin(self.customer_ids, customer_ids)
+        return Aggregates(
+            self.customer_ids[keep],
+            self.last_order[keep],
+            self.frequency[keep],
+            self.monetary[keep],
+        )
+
+    @classmethod
+    def combined(cls, parts: Iterable[Aggregates]) -> Aggregates:
+        """One row per customer across ``parts``: latest order, summed count and spend."""
+        rows = reduce(Aggregates.concat, parts)
+        if not len(rows):
+            return rows
+        order = np.argsort(rows.customer_ids, kind="stable")
+        ids = rows.customer_ids[order]
+        starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        return cls(
+            ids[starts],
+            np.maximum.reduceat(rows.last_order[order], starts),
+            np.add.reduceat(rows.frequency[order], starts),
+            np.add.reduceat(rows.monetary[order], starts),
+        )
+
+    def concat(self, other: Aggregates) -> Aggregates:
+        return Aggregates(
+            np.concatenate([self.customer_ids, other.customer_ids]),
+            np.concatenate([self.last_order, other.last_order]),
+            np.concatenate([self.frequency, other.frequency]),
+            np.concatenate([self.monetary, other.monetary]),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Edges:
+    """Quintile boundaries of the population; scores are 1 (worst) to 5 (best)."""
+
+    last_order: np.ndarray
+    frequency: np.ndarray
+    monetary: np.ndarray
+
+    @classmethod
+    def of(cls, population: Aggregates) -> Edges:
+        if not len(population):
+            empty = np.array([])
+            return cls(empty, empty, empty)
+        return cls(
+            np.quantile(population.last_order, QUANTILES),
+            np.quantile(population.frequency, QUANTILES),
+            np.quantile(population.monetary, QUANTILES),
+        )
+
+    def score(self, aggregates: Aggregates) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # A more recent last order is a larger timestamp, so all three grow with the score.
+        # The score is 1 + the number of edges strictly below the value: a value equal to an
+        # edge stays in the lower quintile, so a tie spanning several edges (most customers
+        # with a single order) scores 1 instead of jumping to the top of the tied run.
+        return (
+            np.searchsorted(self.last_order, aggregates.last_order, side="left") + 1,
+            np.searchsorted(self.frequency, aggregates.frequency, side="left") + 1,
+            np.searchsorted(self.monetary, aggregates.monetary, side="left") + 1,
+        )
+
+
+def segments(recency: np.ndarray, frequency: np.ndarray, monetary: np.ndarray) -> np.ndarray:
+    """Segment name per customer from R/F/M scores (first matching rule wins)."""
+    value = (frequency + monetary) / 2
+    return np.select(
+        [
+            (recency >= 4) & (value >= 4),  # noqa: PLR2004
+            (recency >= 3) & (value >= 3),  # noqa: PLR2004
+            recency >= 4,  # noqa: PLR2004
+            (recency <= 2) & (value >= 3),  # noqa: PLR2004
+            recency <= 2,  # noqa: PLR2004
+        ],
+        [Segment.CHAMPIONS, Segment.LOYAL, Segment.PROMISING, Segment.AT_RISK, Segment.HIBERNATING],
+        default=Segment.NEEDS_ATTENTION,
+    )
+
+
+@dataclass(slots=True)
+class SegmentationReport:
+    full: bool
+    customers_scored: int = 0
+    customers_removed: int = 0
+    order_watermark: int = 0
+    elapsed_seconds: float = 0.0
+    counts: dict[str, int] = field(default_factory=dict)
+
+
+def mark_stale(customer_ids: Iterable[int]) -> None:
+    """Queue ``customer_ids`` for the next incremental run, in one upsert.
+
+    Runs on ``orders_changed``, once per transaction. A customer already queued keeps their row
+    and gets a new ``marked_at``, so a run that read the older mark leaves it for the next one.
+    """
+    customer_ids = set(customer_ids)
+    if customer_ids:
+        marked_at = timezone.now()
+        StaleCustomerSegment.objects.bulk_create(
+            [
+                StaleCustomerSegment(customer_id=customer_id, marked_at=marked_at)
+                for customer_id in customer_ids
+            ],
+            update_conflicts=True,
+            unique_fields=["customer"],
+            update_fields=["marked_at"],
+        )
+
+
+def run(*, full: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> SegmentationReport:
+    """Score customers and store their segments; incremental unless ``full`` or never run."""
+    stopwatch = Stopwatch()
+    started_at = timezone.now()
+    last_run = SegmentationRun.objects.order_by("-finished_at").first()
+    full = full or last_run is None
+    watermark = Order.objects.aggregate(watermark=Max("pk"))["watermark"] or 0
+    report = SegmentationReport(full=full, order_watermark=watermark)
+    stale = list(StaleCustomerSegment.objects.values_list("customer_id", "marked_at"))
+
+    # O histórico inclui os pedidos arquivados; só os vivos avançam a marca d'água.
+    sources = (
+        Order.objects.exclude(status=Order.Status.CANCELLED).filter(
+            customer__isnull=False, pk__lte=watermark
+        ),
+        ArchivedOrder.objects.exclude(status=Order.Status.CANCELLED).filter(customer__isnull=False),
+    )
+    if full:
+        scored = Aggregates.combined(
+            Aggregates.from_rows(_aggregate(orders, chunk_size)) for orders in sources
+        )
+        population = scored
+    else:
+        changed = sorted(
+            {customer_id for customer_id, _ in stale}.union(
+                Order.objects.filter(
+                    pk__gt=last_run.order_watermark, pk__lte=watermark, customer__isnull=False
+                )
+                .order_by()
+                .values_list("customer_id", flat=True)
+                .distinct()
+            )
+        )
+        scored = Aggregates.combined(
+            Aggregates.from_rows(
+                row
+                for ids in batched(changed, chunk_size)
+                for row in _aggregate(orders.filter(customer_id__in=ids), chunk_size)
+            )
+            for orders in sources
+        )
+        population = _stored(chunk_size).without(np.array(changed, dtype=np.int64)).concat(scored)
+
+    scores = Edges.of(population).score(scored)
+    names = segments(*scores)
+    with transaction.atomic():
+        _write(scored, scores, names, started_at, chunk_size)
+        # Clientes sem pedidos válidos saem da tabela.
+        if full:
+            report.customers_removed, _ = CustomerSegment.objects.filter(
+                computed_at__lt=started_at
+            ).delete()
+        else:
+            gone = sorted(set(changed).difference(scored.customer_ids.tolist()))
+            for ids in batched(gone, chunk_size):
+                removed, _ = CustomerSegment.objects.filter(customer_id__in=ids).delete()
+                report.customers_removed += removed
+        # Só as marcações lidas: as renovadas durante a execução ficam para a próxima.
+        for marks in batched(stale, 500):
+            StaleCustomerSegment.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(customer_id=customer_id, marked_at=marked_at)
+                        for customer_id, marked_at in marks
+                    ),
+                )
+            ).delete()
+        SegmentationRun.objects.create(
+            full=full,
+            order_watermark=watermark,
+            customers_scored=len(scored),
+            started_at=started_at,
+            finished_at=timezone.now(),
+        )
+
+    report.customers_scored = len(scored)
+    labels, counts = np.unique(names, return_counts=True) if len(names) else ([], [])
+    report.counts = {str(label): int(count) for label, count in zip(labels, counts, strict=True)}
+    report.elapsed_seconds = stopwatch.elapsed
+    logger.info(
+        "RFM segmentation (%s): %d customers scored in %.2fs",
+        "full" if full else "incremental",
+        report.customers_scored,
+        report.elapsed_seconds,
+    )
+    return report
+
+
+def _aggregate(
+    orders: QuerySet[Order] | QuerySet[ArchivedOrder], chunk_size: int
+) -> Iterator[tuple[int, datetime, int, Decimal]]:
+    return (
+        orders.order_by("customer_id")
+        .values("customer_id")
+        .annotate(last=Max("sale_date"), frequency=Count("pk"), monetary=Sum("total_amount"))
+        .values_list("customer_id", "last", "frequency", "monetary")
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _stored(chunk_size: int) -> Aggregates:
+    return Aggregates.from_rows(
+        CustomerSegment.objects.order_by()
+        .values_list("customer_id", "last_order_at", "frequency", "monetary")
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _write(
+    scored: Aggregates,
+    scores: tuple[np.ndarray, np.ndarray, np.ndarray],
+    names: np.ndarray,
+    computed_at: datetime,
+    chunk_size: int,
+) -> None:
+    recency, frequency, monetary = scores
+    rows = (
+        CustomerSegment(
+            customer_id=int(scored.customer_ids[i]),
+            last_order_at=EPOCH + int(scored.last_order[i]) * MICROSECOND,
+            frequency=int(scored.frequency[i]),
+            monetary=Decimal(int(scored.monetary[i])).scaleb(-2),
+            recency_score=int(recency[i]),
+            frequency_score=int(frequency[i]),
+            monetary_score=int(monetary[i]),
+            segment=str(names[i]),
+            computed_at=computed_at,
+        )
+        for i in range(len(scored))
+    )
+    for chunk in batched(rows, chunk_size):
+        CustomerSegment.objects.bulk_create(
+            chunk,
+            update_conflicts=True,
+            unique_fields=["customer"],
+            update_fields=SCORED_FIELDS,
+        )
@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from marketing.models import Campaign, Coupon, Offer
+from marketing.services import campaign_report, coupon_filter, pricing, rfm
+from sales.models import Order
+from sales.signals import orders_changed
+
+
+@receiver([post_save, post_delete], sender=Offer, dispatch_uid="marketing.pricing.offer")
+def drop_index_on_offer(sender: type[Offer], instance: Offer, **kwargs: Any) -> None:
+    pricing.index.invalidate()
+    if instance.campaign_id is not None:
+        campaign_report.forget([instance.campaign_id])
+
+
+@receiver([post_save, post_delete], sender=Campaign, dispatch_uid="marketing.pricing.campaign")
+def drop_index_on_campaign(sender: type[Campaign], instance: Campaign, **kwargs: Any) -> None:
+    pricing.index.invalidate()
+    campaign_report.forget([instance.pk])
+
+
+@receiver(m2m_changed, sender=Offer.products.through, dispatch_uid="marketing.pricing.products")
+def drop_index_on_offer_products(sender: type[Any], instance: Any, **kwargs: Any) -> None:
+    action, reverse = kwargs["action"], kwargs["reverse"]
+    if action == "pre_clear" and reverse:
+        # O post_clear chega sem pk_set: guardamos as ofertas antes que o vínculo suma.
+        instance._cleared_offer_ids = list(  # noqa: SLF001
+            instance.offers.values_list("pk", flat=True)
+        )
+    if action.startswith("pre_"):
+        return
+    pricing.index.invalidate()
+    # Do lado do produto (product.offers.add), as ofertas vêm em pk_set.
+    if not reverse:
+        offer_ids = [instance.pk]
+    elif action == "post_clear":
+        offer_ids = getattr(instance, "_cleared_offer_ids", [])
+    else:
+        offer_ids = kwargs["pk_set"] or ()
+    campaign_report.forget(
+        Offer.objects.filter(pk__in=offer_ids, campaign__isnull=False).values_list(
+            "campaign_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Coupon, dispatch_uid="marketing.coupon_filter.coupon")
+def add_coupon_code(sender: type[Coupon], instance: Coupon, **kwargs: Any) -> None:
+    # Códigos removidos ou trocados ficam no filtro (só falsos positivos) até a reconstrução.
+    coupon_filter.codes.add(instance.code)
+
+
+@receiver(orders_changed, dispatch_uid="marketing.campaign_report.orders_changed")
+def drop_reports_on_changed_orders(
+    sender: type[Order], sale_dates: set[datetime], **kwargs: Any
+) -> None:
+    # Já depois do commit: antes dele, outro worker poderia recalcular e guardar números antigos.
+    campaign_report.invalidate(sale_dates)
+
+
+@receiver(orders_changed, dispatch_uid="marketing.rfm.orders_changed")
+def mark_changed_customers(sender: type[Order], customer_ids: set[int], **kwargs: Any) -> None:
+    rfm.mark_stale(customer_ids)
@@ -1,3 +1,184 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from catalog.models import Product
+from customer.models import Customer, CustomerDocument
+from marketing.models import (
+    Campaign,
+    Coupon,
+    CouponRedemption,
+    CustomerSegment,
+    Offer,
+    StaleCustomerSegment,
+)
+from marketing.services import campaign_report, coupons, rfm
+from marketing.services.rfm import Aggregates, Edges
+from sales.models import Order
+
+
+def _aggregates(frequency: list[int]) -> Aggregates:
+    size = len(frequency)
+    return Aggregates(
+        np.arange(1, size + 1, dtype=np.int64),
+        np.arange(size, dtype=np.int64),
+        np.array(frequency, dtype=np.int64),
+        np.arange(size, dtype=np.int64) * 100,
+    )
+
+
+class RfmScoreTests(SimpleTestCase):
+    def test_tied_frequencies_score_in_the_lowest_quintile(self) -> None:
+        # 85% dos clientes com um único pedido: as quatro primeiras bordas valem 1.
+        population = _aggregates([1] * 85 + [2] * 10 + [5] * 5)
+        edges = Edges.of(population)
+
+        _, frequency, _ = edges.score(population)
+
+        self.assertEqual(set(frequency[:85]), {1})
+        self.assertTrue((frequency[85:] > 1).all())
+        self.assertGreaterEqual(frequency[95:].min(), frequency[85:95].max())
+
+    def test_values_equal_to_an_edge_stay_in_the_lower_quintile(self) -> None:
+        population = _aggregates(list(range(1, 101)))
+        # Bordas 18, 26, 34 e 42.
+        edges = Edges.of(_aggregates([10, 20, 30, 40, 50]))
+
+        _, frequency, _ = edges.score(population)
+
+        self.assertEqual(frequency[[0, 17, 18, 25, 26, 49]].tolist(), [1, 1, 2, 2, 3, 5])
+
+
+class RfmIncrementalRunTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.now = timezone.now()
+        cls.customers = [
+            Customer.objects.create(
+                username=f"rfm{i}@example.com",
+                email=f"rfm{i}@example.com",
+                document=CustomerDocument.objects.create(
+                    document_type="OTHER", document_number=f"RFM-{i}"
+                ),
+            )
+            for i in range(2)
+        ]
+        # IDs com folga: o pedido atrasado entra abaixo da marca d'água.
+        for pk, customer in ((10, cls.customers[0]), (20, cls.customers[1])):
+            Order.objects.create(
+                pk=pk,
+                customer=customer,
+                external_id=f"RFM-{pk}",
+                total_amount=Decimal(50),
+                sale_date=cls.now - timedelta(days=30),
+            )
+        rfm.run(full=True)
+
+    def test_order_committed_below_the_watermark_is_scored(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.create(
+                pk=15,
+                customer=self.customers[0],
+                external_id="RFM-15",
+                total_amount=Decimal(30),
+                sale_date=self.now,
+            )
+
+        report = rfm.run()
+
+        self.assertFalse(report.full)
+        self.assertEqual(report.customers_scored, 1)
+        segment = CustomerSegment.objects.get(customer=self.customers[0])
+        self.assertEqual(segment.frequency, 2)
+        self.assertEqual(segment.monetary, Decimal(80))
+        self.assertFalse(StaleCustomerSegment.objects.exists())
+
+    def test_cancelled_old_order_removes_the_segment(self) -> None:
+        order = Order.objects.get(pk=10)
+        order.status = Order.Status.CANCELLED
+        with self.captureOnCommitCallbacks(execute=True):
+            order.save()
+
+        report = rfm.run()
+
+        self.assertEqual(report.customers_removed, 1)
+        self.assertFalse(CustomerSegment.objects.filter(customer=self.customers[0]).exists())
+        self.assertTrue(CustomerSegment.objects.filter(customer=self.customers[1]).exists())
+
+
+class CouponRedemptionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        now = timezone.now()
+        cls.customers = [
+            Customer.objects.create(
+                username=f"cupom{i}@example.com",
+                email=f"cupom{i}@example.com",
+                document=CustomerDocument.objects.create(
+                    document_type="OTHER", document_number=f"CUP-{i}"
+                ),
+            )
+            for i in range(3)
+        ]
+        cls.coupon = Coupon.objects.create(
+            code="CUPOM-TESTE",
+            offer=Offer.objects.create(name="Oferta", discount_value=Decimal(10)),
+            max_usages=2,
+            max_usages_per_customer=1,
+            valid_from=now - timedelta(days=1),
+            valid_until=now + timedelta(days=1),
+        )
+
+    def _usages(self) -> int:
+        self.coupon.refresh_from_db()
+        return self.coupon.current_usages
+
+    def test_max_usages_holds(self) -> None:
+        coupons.redeem(self.coupon.code, self.customers[0].pk)
+        last = coupons.redeem(self.coupon.code, self.customers[1].pk)
+
+        with self.assertRaises(coupons.CouponUnavailable):
+            coupons.redeem(self.coupon.code, self.customers[2].pk)
+
+        self.assertEqual((last.usages, last.remaining), (2, 0))
+        self.assertEqual(self._usages(), 2)
+        self.assertEqual(CouponRedemption.objects.filter(coupon=self.coupon).count(), 2)
+
+    def test_customer_limit_rolls_back_the_increment(self) -> None:
+        coupons.redeem(self.coupon.code, self.customers[0].pk)
+
+        with self.assertRaises(coupons.CustomerLimitReached):
+            coupons.redeem(self.coupon.code, self.customers[0].pk)
+
+        self.assertEqual(self._usages(), 1)
+        self.assertEqual(coupons.check(self.coupon.code).remaining, 1)
+        coupons.redeem(self.coupon.code, self.customers[1].pk)
+        self.assertEqual(self._usages(), 2)
+
+
+class CampaignReportInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        now = timezone.now()
+        cls.campaign = Campaign.objects.create(
+            name="Campanha", start_date=now - timedelta(days=7), end_date=now
+        )
+        cls.product = Product.objects.create(
+            name="Produto", description="", price=Decimal(10), sku="CR-1", barcode="CR-1"
+        )
+        offer = Offer.objects.create(
+            name="Oferta", campaign=cls.campaign, discount_value=Decimal(10)
+        )
+        offer.products.add(cls.product)
+
+    def test_clearing_offers_from_the_product_side_drops_the_report(self) -> None:
+        key = campaign_report.cache_key(self.campaign.pk)
+        cache.set(key, "relatório")
+
+        self.product.offers.clear()
+
+        self.assertIsNone(cache.get(key))
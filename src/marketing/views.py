@@ -1,3 +1,115 @@
-from django.shortcuts import render
+import logging
 
-# Create your views here.
+from django.db.models import Count
+from ninja_extra import ControllerBase, api_controller, http_get, http_post, status
+from ninja_extra.exceptions import NotFound, ValidationError
+
+from marketing.models import CustomerSegment
+from marketing.schemas import (
+    CampaignReportSchema,
+    CartInput,
+    CartPriceSchema,
+    CouponFilterStatsSchema,
+    CouponGenerationInput,
+    CouponGenerationSchema,
+    CouponRedemptionSchema,
+    CouponStatusSchema,
+    CustomerSegmentSchema,
+    RedeemCouponInput,
+    SegmentCountSchema,
+)
+from marketing.services import campaign_report, coupon_codes, coupon_filter, coupons, pricing
+from utils.exceptions import Conflict
+
+logger = logging.getLogger(__name__)
+
+
+@api_controller("/segments", tags=["Marketing"])
+class SegmentController(ControllerBase):
+    @http_get("", response=list[SegmentCountSchema])
+    def segment_counts(self) -> list[dict[str, object]]:
+        """Customers per RFM segment, from the last segmentation run."""
+        return list(
+            CustomerSegment.objects.order_by("segment")
+            .values("segment")
+            .annotate(customers=Count("pk")),
+        )
+
+    @http_get("/customers/{customer_id}", response=CustomerSegmentSchema)
+    def customer_segment(self, customer_id: int) -> CustomerSegment:
+        segment = CustomerSegment.objects.filter(customer_id=customer_id).first()
+        if segment is None:
+            msg = f"Cliente {customer_id} sem segmento calculado"
+            raise NotFound(msg)
+        return segment
+
+
+@api_controller("/campaigns", tags=["Marketing"])
+class CampaignController(ControllerBase):
+    @http_get("/{campaign_id}/report", response=CampaignReportSchema)
+    def report(self, campaign_id: int) -> campaign_report.CampaignReport:
+        """Revenue, discount cost and lift over the baseline, cached per campaign."""
+        try:
+            return campaign_report.get(campaign_id)
+        except campaign_report.CampaignNotFound as exc:
+            raise NotFound(str(exc)) from exc
+
+
+@api_controller("/cart", tags=["Carrinho"])
+class CartController(ControllerBase):
+    @http_post("/price", response=CartPriceSchema)
+    def price(self, payload: CartInput) -> pricing.CartPrice:
+        """Best running offer per line for the whole cart, from the in-memory offer index."""
+        try:
+            return pricing.price_cart(
+                ((item.product_id, item.quantity) for item in payload.items),
+                payload.customer_id,
+            )
+        except pricing.UnknownProducts as exc:
+            raise NotFound(str(exc)) from exc
+
+
+@api_controller("/coupons", tags=["Marketing"])
+class CouponController(ControllerBase):
+    @http_get("/filter/stats", response=CouponFilterStatsSchema)
+    def filter_stats(self) -> coupon_filter.CouponFilterStats:
+        """Size and false-positive rates of this worker's coupon code filter."""
+        return coupon_filter.codes.stats()
+
+    @http_post("/generate", response={201: CouponGenerationSchema})
+    def generate(self, payload: CouponGenerationInput) -> tuple[int, coupon_codes.GenerationReport]:
+        """Create exactly ``count`` unique single-use codes for an offer, in vectorized batches."""
+        try:
+            report = coupon_codes.generate(
+                payload.offer_id,
+                payload.count,
+                valid=(payload.valid_from, payload.valid_until),
+                length=payload.length,
+                prefix=payload.prefix,
+                max_usages=payload.max_usages,
+                max_usages_per_customer=payload.max_usages_per_customer,
+            )
+        except coupon_codes.OfferNotFound as exc:
+            raise NotFound(str(exc)) from exc
+        except ValueError as exc:
+            raise ValidationError(str(exc)) from exc
+        return status.HTTP_201_CREATED, report
+
+    @http_get("/{code}", response=CouponStatusSchema)
+    def check(self, code: str) -> coupons.CouponStatus:
+        """Certainly invalid codes are rejected by the in-process filter, without a query."""
+        try:
+            return coupons.check(code)
+        except coupons.CouponNotFound as exc:
+            raise NotFound(str(exc)) from exc
+
+    @http_post("/{code}/redeem", response={201: CouponRedemptionSchema})
+    def redeem(self, code: str, payload: RedeemCouponInput) -> tuple[int, coupons.Redemption]:
+        """Use a coupon once; global and per-customer limits hold under concurrent requests."""
+        try:
+            redemption = coupons.redeem(code, payload.customer_id)
+        except (coupons.CouponNotFound, coupons.CustomerNotFound) as exc:
+            raise NotFound(str(exc)) from exc
+        except (coupons.CouponUnavailable, coupons.CustomerLimitReached) as exc:
+            raise Conflict(str(exc)) from exc
+        return status.HTTP_201_CREATED, redemption
@@ -0,0 +1,40 @@
+from datetime import datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from sales.services.archive import DEFAULT_CHUNK_SIZE, archivable, archive, default_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Move pedidos pagos ou cancelados mais antigos que o horizonte (ORDER_ARCHIVE_AFTER_DAYS) "
+        "para as tabelas de arquivo, em transações de --chunk-size pedidos."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--before",
+            type=datetime.fromisoformat,
+            default=None,
+            help="Data de corte (AAAA-MM-DD); substitui o horizonte configurado",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Só conta os pedidos")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        cutoff = options["before"] or default_cutoff()
+        if timezone.is_naive(cutoff):
+            cutoff = timezone.make_aware(cutoff)
+        if options["dry_run"]:
+            self.stdout.write(f"{archivable(cutoff)} pedidos vendidos antes de {cutoff} a arquivar")
+            return
+        report = archive(cutoff, chunk_size=options["chunk_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{report.orders_archived} pedidos e {report.items_archived} itens arquivados "
+                f"em {report.chunks} lotes, {report.elapsed_seconds:.2f}s "
+                f"({report.orders_per_second:,.0f} pedidos/s, vendas antes de {cutoff})"
+            )
+        )
@@ -0,0 +1,71 @@
+import random
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from catalog.models import Product
+from sales.services.ingestion import IncomingItem, IncomingOrder, ingest
+from utils.perf import Stopwatch, throwaway_transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a ingestão de lotes de pedidos do PDV (pedidos/s), incluindo o reenvio de um "
+        "lote já gravado. Tudo roda numa transação desfeita ao final."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batches", type=int, default=20)
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--items", type=int, default=5, help="Itens por pedido")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rng = random.Random(options["seed"])
+        with throwaway_transaction():
+            product_ids = [
+                product.pk
+                for product in Product.objects.bulk_create(
+                    Product(
+                        name=f"Bench {i}",
+                        description="",
+                        price=rng.randint(100, 5_000) / 100,
+                        sku=f"BENCH-INGEST-{i}",
+                        barcode=f"BENCH-INGEST-{i}",
+                    )
+                    for i in range(500)
+                )
+            ]
+            now = timezone.now()
+            batches = [
+                [
+                    IncomingOrder(
+                        external_id=f"BENCH-{b}-{i}",
+                        sale_date=now - timedelta(minutes=rng.randrange(10_000)),
+                        items=[
+                            IncomingItem(product_id, rng.randint(1, 3))
+                            for product_id in rng.sample(product_ids, options["items"])
+                        ],
+                    )
+                    for i in range(options["batch_size"])
+                ]
+                for b in range(options["batches"])
+            ]
+
+            created = 0
+            stopwatch = Stopwatch()
+            for batch in batches:
+                created += ingest(batch).created
+            elapsed = stopwatch.elapsed
+            replay = ingest(batches[0])
+
+        self.stdout.write(
+            f"{created} pedidos em {elapsed:.2f}s: {created / elapsed:,.0f} pedidos/s "
+            f"({options['batches']} lotes de {options['batch_size']}, {options['items']} itens)"
+        )
+        self.stdout.write(
+            f"reenvio de um lote: {len(replay.duplicates)} duplicados, {replay.created} criados, "
+            f"{replay.orders_per_second:,.0f} pedidos/s"
+        )
@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from sales.services.rollups import DEFAULT_CHUNK_SIZE, refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Consolida as vendas diárias por loja e por produto. Por padrão só refaz os dias a partir "
+        "da última execução e os marcados como alterados; --full reconstrói tudo."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--full", action="store_true")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        report = refresh(full=options["full"], chunk_size=options["chunk_size"])
+        kind = "completa" if report.full else "incremental"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Consolidação {kind}: {report.days_refreshed} dias, {report.rows_written} linhas "
+                f"em {report.elapsed_seconds:.2f}s (vendas até {report.sale_date_watermark})"
+            )
+        )
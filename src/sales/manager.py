@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import TYPE_CHECKING, Self
+
+from django.db import models
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Abs, Coalesce
+
+if TYPE_CHECKING:
+    # Só para o verificador de tipos: resolvem as referências em texto de ``QuerySet["..."]``.
+    from sales.models import Order, OrderItem  # noqa: F401
+
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+# Meio centavo: absorve o arredondamento de bancos que somam decimais em ponto flutuante (SQLite).
+TOTAL_TOLERANCE = Decimal("0.005")
+
+
+def line_total(prefix: str = "") -> ExpressionWrapper:
+    """``quantity * price`` of an item, from ``OrderItem`` or through a relation ``prefix``."""
+    return ExpressionWrapper(F(f"{prefix}quantity") * F(f"{prefix}price"), output_field=MONEY)
+
+
+class OrderItemQuerySet(models.QuerySet["OrderItem"]):
+    def with_line_total(self) -> Self:
+        """Annotate ``line_total``, the SQL counterpart of ``OrderItem.total_price``."""
+        return self.annotate(line_total=line_total())
+
+
+class OrderQuerySet(models.QuerySet["Order"]):
+    def with_totals(self) -> Self:
+        """Annotate ``items_subtotal`` and ``expected_total`` (subtotal minus the discount).
+
+        Orders without items get a zero subtotal. Aggregates over ``items``, so every order row
+        becomes a GROUP BY; don't combine with other multi-valued joins.
+        """
+        return self.annotate(
+            items_subtotal=Coalesce(
+                Sum(line_total("items__")), Value(Decimal(0)), output_field=MONEY
+            ),
+            expected_total=ExpressionWrapper(
+                F("items_subtotal") - F("discount_applied"), output_field=MONEY
+            ),
+        )
+
+    def with_mismatched_totals(self) -> Self:
+        """Orders whose ``total_amount`` differs from ``expected_total``, plus ``difference``."""
+        return (
+            self.with_totals()
+            .annotate(
+                difference=ExpressionWrapper(
+                    F("total_amount") - F("expected_total"), output_field=MONEY
+                )
+            )
+            .alias(gap=Abs("difference"))
+            .filter(gap__gt=TOTAL_TOLERANCE)
+        )
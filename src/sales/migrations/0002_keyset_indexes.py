@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-16 23:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['sale_date', 'id'], name='order_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0002_initial'),
+        ('sales', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='store',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='group.store', verbose_name='Loja'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_product_price_history'),
+        ('group', '0002_initial'),
+        ('sales', '0003_order_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollupRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full', models.BooleanField(default=False, verbose_name='Completa')),
+                ('sale_date_watermark', models.DateTimeField(null=True, verbose_name="Marca d'água (data da venda)")),
+                ('days_refreshed', models.PositiveIntegerField(default=0, verbose_name='Dias consolidados')),
+                ('rows_written', models.PositiveIntegerField(default=0, verbose_name='Linhas gravadas')),
+                ('started_at', models.DateTimeField(verbose_name='Início')),
+                ('finished_at', models.DateTimeField(verbose_name='Fim')),
+            ],
+            options={
+                'verbose_name': 'Execução da consolidação de vendas',
+                'verbose_name_plural': 'Execuções da consolidação de vendas',
+                'ordering': ['-finished_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StaleSalesDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(db_index=True, verbose_name='Dia')),
+            ],
+            options={
+                'verbose_name': 'Dia de vendas a reconsolidar',
+                'verbose_name_plural': 'Dias de vendas a reconsolidar',
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyProductSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Dia')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Unidades')),
+                ('gross_revenue', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Receita bruta')),
+                ('discount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Desconto')),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Receita líquida')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='catalog.category', verbose_name='Categoria')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='catalog.product', verbose_name='Produto')),
+                ('store', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_product_sales', to='group.store', verbose_name='Loja')),
+            ],
+            options={
+                'verbose_name': 'Venda diária por produto',
+                'verbose_name_plural': 'Vendas diárias por produto',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day', 'store'], name='daily_product_sales_idx'), models.Index(fields=['day', 'category'], name='daily_category_sales_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailyStoreSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Dia')),
+                ('orders', models.PositiveIntegerField(default=0, verbose_name='Pedidos')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Unidades')),
+                ('gross_revenue', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Receita bruta')),
+                ('discount', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Desconto')),
+                ('revenue', models.DecimalField(decimal_places=2, max_digits=14, verbose_name='Receita líquida')),
+                ('store', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='group.store', verbose_name='Loja')),
+            ],
+            options={
+                'verbose_name': 'Venda diária por loja',
+                'verbose_name_plural': 'Vendas diárias por loja',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['day', 'store'], name='daily_store_sales_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('group', '0002_initial'),
+        ('sales', '0004_daily_sales_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['status', 'sale_date'], name='order_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_product_price_history'),
+        ('group', '0002_initial'),
+        ('sales', '0005_order_status_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedOrder',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('external_id', models.CharField(max_length=255, unique=True, verbose_name='ID externo')),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Valor total')),
+                ('discount_applied', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Desconto aplicado')),
+                ('sale_date', models.DateTimeField(verbose_name='Data da venda')),
+                ('status', models.CharField(choices=[('PENDING', 'Pendente'), ('PAID', 'Pago'), ('CANCELLED', 'Cancelado')], max_length=20, verbose_name='Status')),
+                ('archived_at', models.DateTimeField(verbose_name='Arquivado em')),
+                ('customer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_orders', to=settings.AUTH_USER_MODEL, verbose_name='Cliente')),
+                ('store', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_orders', to='group.store', verbose_name='Loja')),
+            ],
+            options={
+                'verbose_name': 'Pedido arquivado',
+                'verbose_name_plural': 'Pedidos arquivados',
+                'ordering': ['-sale_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedOrderItem',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('quantity', models.PositiveIntegerField(default=1, verbose_name='Quantidade')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Preço')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='sales.archivedorder', verbose_name='Pedido')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_items', to='catalog.product', verbose_name='Produto')),
+            ],
+            options={
+                'verbose_name': 'Item de pedido arquivado',
+                'verbose_name_plural': 'Itens de pedidos arquivados',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedorder',
+            index=models.Index(fields=['status', 'sale_date'], name='archived_order_status_date_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def drop_duplicate_days(apps, schema_editor):
+    # Antes da restrição única: fica a primeira marcação de cada dia.
+    StaleSalesDay = apps.get_model('sales', 'StaleSalesDay')
+    keep = list(
+        StaleSalesDay.objects.values('day').annotate(first=models.Min('pk')).values_list('first', flat=True)
+    )
+    StaleSalesDay.objects.exclude(pk__in=keep).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0006_order_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stalesalesday',
+            name='marked_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Marcado em'),
+        ),
+        migrations.RunPython(drop_duplicate_days, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='stalesalesday',
+            name='day',
+            field=models.DateField(unique=True, verbose_name='Dia'),
+        ),
+    ]
@@ -3,10 +3,13 @@
 from decimal import Decimal
 
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
-from catalog.models import Product
+from catalog.models import Category, Product
 from customer.models import Customer
+from group.models import Store
+from sales.manager import OrderItemQuerySet, OrderQuerySet
 
 
 # Create your models here.
@@ -23,6 +26,14 @@ class Order(models.Model):
         null=True,
         related_name="orders",
     )
+    store = models.ForeignKey[Store | None](
+        Store,
+        on_delete=models.SET_NULL,
+        verbose_name=_("Loja"),
+        null=True,
+        blank=True,
+        related_name="orders",
+    )
     external_id = models.CharField(_("ID externo"), max_length=255, unique=True)
     total_amount = models.DecimalField(_("Valor total"), max_digits=10, decimal_places=2)
     discount_applied = models.DecimalField(
@@ -37,10 +48,16 @@ class Order(models.Model):
         default=Status.PENDING,
     )
 
+    objects = OrderQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Pedido")
         verbose_name_plural = _("Pedidos")
         ordering = ["-sale_date"]
+        indexes = [
+            models.Index(fields=["sale_date", "id"], name="order_keyset_idx"),
+            models.Index(fields=["status", "sale_date"], name="order_status_date_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.external_id} - {self.customer!s} - {self.total_amount}"
@@ -59,6 +76,8 @@ class OrderItem(models.Model):
     quantity = models.PositiveIntegerField(_("Quantidade"), default=1)
     price = models.DecimalField(_("Preço"), max_digits=10, decimal_places=2)
 
+    objects = OrderItemQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Item do pedido")
         verbose_name_plural = _("Itens do pedido")
@@ -70,3 +89,176 @@ class OrderItem(models.Model):
     @property
     def total_price(self) -> Decimal:
         return self.quantity * self.price
+
+
+class DailyStoreSales(models.Model):
+    """Pedidos pagos de um dia numa loja (``store`` nulo: vendas sem loja); mantido em lote."""
+
+    day = models.DateField(_("Dia"))
+    store = models.ForeignKey[Store | None](
+        Store,
+        on_delete=models.SET_NULL,
+        verbose_name=_("Loja"),
+        null=True,
+        related_name="daily_sales",
+    )
+    orders = models.PositiveIntegerField(_("Pedidos"), default=0)
+    units = models.PositiveIntegerField(_("Unidades"), default=0)
+    gross_revenue = models.DecimalField(_("Receita bruta"), max_digits=14, decimal_places=2)
+    discount = models.DecimalField(_("Desconto"), max_digits=14, decimal_places=2)
+    revenue = models.DecimalField(_("Receita líquida"), max_digits=14, decimal_places=2)
+
+    class Meta:
+        verbose_name = _("Venda diária por loja")
+        verbose_name_plural = _("Vendas diárias por loja")
+        ordering = ["-day"]
+        indexes = [models.Index(fields=["day", "store"], name="daily_store_sales_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.day} - {self.store_id} - {self.revenue}"
+
+
+class DailyProductSales(models.Model):
+    """Itens de pedidos pagos por dia, loja e produto, com o desconto do pedido rateado."""
+
+    day = models.DateField(_("Dia"))
+    store = models.ForeignKey[Store | None](
+        Store,
+        on_delete=models.SET_NULL,
+        verbose_name=_("Loja"),
+        null=True,
+        related_name="daily_product_sales",
+    )
+    product = models.ForeignKey[Product](
+        Product,
+        on_delete=models.CASCADE,
+        verbose_name=_("Produto"),
+        related_name="daily_sales",
+    )
+    # Categoria do produto no momento da consolidação.
+    category = models.ForeignKey[Category | None](
+        Category,
+        on_delete=models.SET_NULL,
+        verbose_name=_("Categoria"),
+        null=True,
+        related_name="daily_sales",
+    )
+    units = models.PositiveIntegerField(_("Unidades"), default=0)
+    gross_revenue = models.DecimalField(_("Receita bruta"), max_digits=14, decimal_places=2)
+    discount = models.DecimalField(_("Desconto"), max_digits=14, decimal_places=2)
+    revenue = models.DecimalField(_("Receita líquida"), max_digits=14, decimal_places=2)
+
+    class Meta:
+        verbose_name = _("Venda diária por produto")
+        verbose_name_plural = _("Vendas diárias por produto")
+        ordering = ["-day"]
+        indexes = [
+            models.Index(fields=["day", "store"], name="daily_product_sales_idx"),
+            models.Index(fields=["day", "category"], name="daily_category_sales_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} - {self.product_id} - {self.revenue}"
+
+
+class StaleSalesDay(models.Model):
+    """Dia com pedidos alterados abaixo da marca d'água, a reconsolidar no próximo refresh."""
+
+    day = models.DateField(_("Dia"), unique=True)
+    # Renovado a cada nova marcação do dia: a consolidação só apaga as marcações que leu.
+    marked_at = models.DateTimeField(_("Marcado em"), default=timezone.now)
+
+    class Meta:
+        verbose_name = _("Dia de vendas a reconsolidar")
+        verbose_name_plural = _("Dias de vendas a reconsolidar")
+
+    def __str__(self) -> str:
+        return str(self.day)
+
+
+class SalesRollupRun(models.Model):
+    """Execução da consolidação; ``sale_date_watermark`` é a maior data de venda já considerada."""
+
+    full = models.BooleanField(_("Completa"), default=False)
+    sale_date_watermark = models.DateTimeField(_("Marca d'água (data da venda)"), null=True)
+    days_refreshed = models.PositiveIntegerField(_("Dias consolidados"), default=0)
+    rows_written = models.PositiveIntegerField(_("Linhas gravadas"), default=0)
+    started_at = models.DateTimeField(_("Início"))
+    finished_at = models.DateTimeField(_("Fim"))
+
+    class Meta:
+        verbose_name = _("Execução da consolidação de vendas")
+        verbose_name_plural = _("Execuções da consolidação de vendas")
+        ordering = ["-finished_at"]
+
+    def __str__(self) -> str:
+        return f"{self.finished_at:%Y-%m-%d %H:%M} - {self.days_refreshed}"
+
+
+class ArchivedOrder(models.Model):
+    """Pedido fechado (pago ou cancelado) movido do ``Order`` após o horizonte de arquivamento.
+
+    Mesmas colunas e mesmo ID do pedido original; consultas históricas leem as duas tabelas.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    customer = models.ForeignKey[Customer | None](
+        Customer,
+        on_delete=models.SET_NULL,
+        verbose_name=_("Cliente"),
+        null=True,
+        related_name="archived_orders",
+    )
+    store = models.ForeignKey[Store | None](
+        Store,
+        on_delete=models.SET_NULL,
+        verbose_name=_("Loja"),
+        null=True,
+        blank=True,
+        related_name="archived_orders",
+    )
+    external_id = models.CharField(_("ID externo"), max_length=255, unique=True)
+    total_amount = models.DecimalField(_("Valor total"), max_digits=10, decimal_places=2)
+    discount_applied = models.DecimalField(
+        _("Desconto aplicado"), max_digits=10, decimal_places=2, default=0
+    )
+    sale_date = models.DateTimeField(_("Data da venda"))
+    status = models.CharField(_("Status"), max_length=20, choices=Order.Status.choices)
+    archived_at = models.DateTimeField(_("Arquivado em"))
+
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Pedido arquivado")
+        verbose_name_plural = _("Pedidos arquivados")
+        ordering = ["-sale_date"]
+        indexes = [
+            models.Index(fields=["status", "sale_date"], name="archived_order_status_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.external_id} - {self.sale_date:%Y-%m-%d} - {self.total_amount}"
+
+
+class ArchivedOrderItem(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    order = models.ForeignKey[ArchivedOrder](
+        ArchivedOrder, on_delete=models.CASCADE, verbose_name=_("Pedido"), related_name="items"
+    )
+    product = models.ForeignKey[Product](
+        Product,
+        on_delete=models.CASCADE,
+        verbose_name=_("Produto"),
+        related_name="archived_items",
+    )
+    quantity = models.PositiveIntegerField(_("Quantidade"), default=1)
+    price = models.DecimalField(_("Preço"), max_digits=10, decimal_places=2)
+
+    objects = OrderItemQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = _("Item de pedido arquivado")
+        verbose_name_plural = _("Itens de pedidos arquivados")
+
+    def __str__(self) -> str:
+        return f"{self.order_id} - {self.product_id} - {self.quantity}"
@@ -0,0 +1,105 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Self
+
+from ninja import Field, Schema
+from pydantic import model_validator
+
+from sales.models import Order
+from sales.services.ingestion import MAX_BATCH_SIZE
+from sales.services.rollups import Dimension
+from utils.records import ImportFormat
+
+MAX_REPORT_DAYS = 731
+
+
+class OrderSchema(Schema):
+    id: int
+    external_id: str
+    customer_id: int | None
+    total_amount: Decimal
+    discount_applied: Decimal
+    sale_date: datetime
+    status: str
+
+
+class IngestItemInput(Schema):
+    product_id: int
+    quantity: int = Field(..., gt=0)
+    price: Decimal | None = Field(None, ge=0, max_digits=10, decimal_places=2)
+
+
+class IngestOrderInput(Schema):
+    external_id: str = Field(..., min_length=1, max_length=255)
+    sale_date: datetime
+    customer_id: int | None = None
+    store_id: int | None = None
+    status: Order.Status = Order.Status.PAID
+    discount_applied: Decimal = Field(Decimal(0), ge=0, max_digits=10, decimal_places=2)
+    total_amount: Decimal | None = Field(None, max_digits=10, decimal_places=2)
+    items: list[IngestItemInput] = Field(..., max_length=1_000)
+
+
+class IngestBatchInput(Schema):
+    orders: list[IngestOrderInput] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class IngestErrorSchema(Schema):
+    line: int
+    external_id: str = Field(..., alias="key")
+    message: str
+
+
+class IngestionReportSchema(Schema):
+    received: int
+    created: int
+    items_created: int
+    duplicates: list[str]
+    errors: list[IngestErrorSchema]
+    elapsed_seconds: float
+    orders_per_second: float
+
+
+class PeriodInput(Schema):
+    start: date
+    end: date
+
+    @model_validator(mode="after")
+    def ordered(self) -> Self:
+        if self.end < self.start:
+            msg = "O fim do período deve ser posterior ao início"
+            raise ValueError(msg)
+        return self
+
+
+class SalesReportInput(PeriodInput):
+    dimension: Dimension = "day"
+    store_id: int | None = None
+    category_id: int | None = None
+    limit: int | None = Field(None, gt=0, le=1_000)
+
+    @model_validator(mode="after")
+    def bounded(self) -> Self:
+        if (self.end - self.start).days >= MAX_REPORT_DAYS:
+            msg = f"O período deve ter no máximo {MAX_REPORT_DAYS} dias"
+            raise ValueError(msg)
+        return self
+
+
+class OrderExportInput(PeriodInput):
+    fmt: ImportFormat = ImportFormat.CSV
+    status: list[Order.Status] = Field(default_factory=list)
+
+
+class SalesReportRowSchema(Schema):
+    # Só o campo da dimensão pedida vem preenchido.
+    day: date | None = None
+    store_id: int | None = None
+    product_id: int | None = None
+    category_id: int | None = None
+    # Contagem de pedidos só existe nas dimensões dia e loja sem filtro de categoria.
+    orders: int | None = None
+    units: int
+    gross_revenue: Decimal
+    discount: Decimal
+    revenue: Decimal
@@ -0,0 +1,144 @@
+"""Archival of closed orders past the horizon, so ``Order``/``OrderItem`` stay small.
+
+Each chunk is one transaction: the oldest closed orders are claimed with ``SKIP LOCKED`` (where
+supported), copied with their items into ``ArchivedOrder``/``ArchivedOrderItem`` under the same
+ids and then deleted from the live tables. Archive tables are used on every backend instead of
+PostgreSQL declarative partitions, which Django migrations cannot manage on an existing table.
+
+Readers that need the whole history (rollups, RFM, loyalty tiers, related products, exports,
+ingestion dedupe, total reconciliation) query both sides. The ``/orders`` listing and the
+customer overview show recent activity and read the live table only.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from sales.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+from utils.perf import Stopwatch
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1_000
+DEFAULT_ARCHIVE_AFTER_DAYS = 730
+DEFAULT_NEWEST_CACHE_TTL = 300
+NEWEST_CACHE_KEY = "sales:archive:newest_sale_date"
+_MISSING = object()
+CLOSED = (Order.Status.PAID, Order.Status.CANCELLED)
+ORDER_FIELDS = (
+    "id",
+    "customer_id",
+    "store_id",
+    "external_id",
+    "total_amount",
+    "discount_applied",
+    "sale_date",
+    "status",
+)
+ITEM_FIELDS = ("id", "order_id", "product_id", "quantity", "price")
+
+
+@dataclass(slots=True)
+class ArchiveReport:
+    cutoff: datetime
+    orders_archived: int = 0
+    items_archived: int = 0
+    chunks: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def orders_per_second(self) -> float:
+        return self.orders_archived / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def default_cutoff() -> datetime:
+    days = getattr(settings, "ORDER_ARCHIVE_AFTER_DAYS", DEFAULT_ARCHIVE_AFTER_DAYS)
+    return timezone.now() - timedelta(days=days)
+
+
+def newest_sale_date() -> datetime | None:
+    """Latest ``sale_date`` in the archive (``None`` while it is empty), cached.
+
+    :func:`archive` drops the cached value after moving orders; with a per-process cache, other
+    workers see the new value within ``ORDER_ARCHIVE_CACHE_TTL`` seconds.
+    """
+    newest = cache.get(NEWEST_CACHE_KEY, _MISSING)
+    if newest is _MISSING:
+        newest = ArchivedOrder.objects.aggregate(newest=Max("sale_date"))["newest"]
+        cache.set(
+            NEWEST_CACHE_KEY,
+            newest,
+            getattr(settings, "ORDER_ARCHIVE_CACHE_TTL", DEFAULT_NEWEST_CACHE_TTL),
+        )
+    return newest
+
+
+def archivable(cutoff: datetime) -> int:
+    return Order.objects.filter(status__in=CLOSED, sale_date__lt=cutoff).count()
+
+
+def archive(
+    cutoff: datetime | None = None, *, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> ArchiveReport:
+    """Move closed orders sold before ``cutoff`` (default: the configured horizon)."""
+    report = ArchiveReport(cutoff=cutoff or default_cutoff())
+    stopwatch = Stopwatch()
+    while True:
+        with transaction.atomic():
+            orders, items = _move_chunk(report.cutoff, chunk_size)
+        if not orders:
+            break
+        report.chunks += 1
+        report.orders_archived += orders
+        report.items_archived += items
+    if report.orders_archived:
+        cache.delete(NEWEST_CACHE_KEY)
+    report.elapsed_seconds = stopwatch.elapsed
+    logger.info(
+        "Archived %d orders (%d items) sold before %s in %.2fs",
+        report.orders_archived,
+        report.items_archived,
+        report.cutoff,
+        report.elapsed_seconds,
+    )
+    return report
+
+
+def _move_chunk(cutoff: datetime, chunk_size: int) -> tuple[int, int]:
+    rows = list(
+        Order.objects.filter(status__in=CLOSED, sale_date__lt=cutoff)
+        .select_for_update(skip_locked=True)
+        .order_by("sale_date", "pk")
+        .values_list(*ORDER_FIELDS)[:chunk_size]
+    )
+    if not rows:
+        return 0, 0
+    archived_at = timezone.now()
+    ArchivedOrder.objects.bulk_create(
+        ArchivedOrder(**dict(zip(ORDER_FIELDS, row, strict=True)), archived_at=archived_at)
+        for row in rows
+    )
+    pks = [row[0] for row in rows]
+    items = OrderItem.objects.filter(order_id__in=pks)
+    archived_items = ArchivedOrderItem.objects.bulk_create(
+        ArchivedOrderItem(**dict(zip(ITEM_FIELDS, row, strict=True)))
+        for row in items.values_list(*ITEM_FIELDS)
+    )
+    # DELETE direto, sem sinais: mover para o arquivo não muda os totais consolidados, que
+    # leem as duas tabelas, e os itens já saíram antes do pedido.
+    items._raw_delete(items.db)  # noqa: SLF001
+    orders = Order.objects.filter(pk__in=pks)
+    orders._raw_delete(orders.db)  # noqa: SLF001
+    return len(rows), len(archived_items)
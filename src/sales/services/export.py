@@ -0,0 +1,102 @@
+"""Order exports as lazy row tuples: ``values_list`` over a chunked cursor, no model instances.
+
+Rows are filtered by status and sale date, which the ``(status, sale_date)`` indexes serve, and
+come out in sale order: live and archived orders are read as two sorted streams and merged.
+Consumers encode and send them as they arrive, so memory stays flat whatever the period.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from datetime import datetime, time, timedelta
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from django.utils import timezone
+
+from sales.models import ArchivedOrder, ArchivedOrderItem, Order, OrderItem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from datetime import date
+
+    from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 2_000
+ORDER_FIELDS = (
+    "id",
+    "external_id",
+    "customer_id",
+    "store_id",
+    "sale_date",
+    "status",
+    "total_amount",
+    "discount_applied",
+)
+# Cabeçalho do export de itens -> caminho no values_list.
+ITEM_COLUMNS = {
+    "order_id": "order_id",
+    "external_id": "order__external_id",
+    "sale_date": "order__sale_date",
+    "status": "order__status",
+    "product_id": "product_id",
+    "sku": "product__sku",
+    "quantity": "quantity",
+    "price": "price",
+    "line_total": "line_total",
+}
+ITEM_FIELDS = tuple(ITEM_COLUMNS)
+
+
+def orders(
+    period: tuple[date, date],
+    statuses: Sequence[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[object, ...]]:
+    """Order rows in ``ORDER_FIELDS`` order, sold within ``period`` (both days inclusive)."""
+    live, archived = (
+        _filter(model.objects.all(), "", period, statuses)
+        .order_by("sale_date", "pk")
+        .values_list(*ORDER_FIELDS)
+        .iterator(chunk_size)
+        for model in (Order, ArchivedOrder)
+    )
+    return heapq.merge(live, archived, key=itemgetter(ORDER_FIELDS.index("sale_date"), 0))
+
+
+def items(
+    period: tuple[date, date],
+    statuses: Sequence[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[tuple[object, ...]]:
+    """Item rows in ``ITEM_FIELDS`` order for the orders :func:`orders` would export."""
+    live, archived = (
+        _filter(model.objects.with_line_total(), "order__", period, statuses)
+        .order_by("order__sale_date", "order_id", "pk")
+        .values_list(*ITEM_COLUMNS.values())
+        .iterator(chunk_size)
+        for model in (OrderItem, ArchivedOrderItem)
+    )
+    return heapq.merge(live, archived, key=itemgetter(ITEM_FIELDS.index("sale_date"), 0))
+
+
+def _filter[T: QuerySet](
+    rows: T, prefix: str, period: tuple[date, date], statuses: Sequence[str]
+) -> T:
+    start, end = period
+    rows = rows.filter(
+        **{
+            f"{prefix}sale_date__gte": _midnight(start),
+            f"{prefix}sale_date__lt": _midnight(end + timedelta(days=1)),
+        }
+    )
+    if statuses:
+        rows = rows.filter(**{f"{prefix}status__in": statuses})
+    return rows
+
+
+def _midnight(day: date) -> datetime:
+    return timezone.make_aware(datetime.combine(day, time.min))
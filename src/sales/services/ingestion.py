@@ -0,0 +1,217 @@
+"""Idempotent batch ingestion of POS sales: a fixed number of queries per batch.
+
+Whatever the batch size, ingesting it costs one query for existing ``external_id`` values, one
+for products, one for customers, one for stores and two INSERTs (orders and items) in a single
+transaction. After commit, ``orders_changed`` is sent once with the sale dates and customers, as
+saving the orders one by one would, and queues their days for the rollups. Replaying a batch is
+harmless: orders already stored are reported as duplicates and skipped.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from django.db import IntegrityError, transaction
+
+from catalog.models import Product
+from customer.models import Customer
+from group.models import Store
+from sales.models import ArchivedOrder, Order, OrderItem
+from sales.signals import order_changes
+from utils.perf import Stopwatch
+from utils.records import RowFailure
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+CENT = Decimal("0.01")
+MAX_BATCH_SIZE = 2_000
+# Cada nova tentativa relê os pedidos já gravados; depois da última o lote volta como conflito.
+MAX_ATTEMPTS = 3
+
+
+@dataclass(slots=True, frozen=True)
+class IncomingItem:
+    product_id: int
+    quantity: int
+    # Sem preço informado, vale o preço atual do produto.
+    price: Decimal | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class IncomingOrder:
+    external_id: str
+    sale_date: datetime
+    items: Sequence[IncomingItem]
+    customer_id: int | None = None
+    store_id: int | None = None
+    status: str = Order.Status.PAID
+    discount_applied: Decimal = Decimal(0)
+    # Sem total informado: soma dos itens menos o desconto.
+    total_amount: Decimal | None = None
+
+
+@dataclass(slots=True)
+class IngestionReport:
+    received: int = 0
+    created: int = 0
+    items_created: int = 0
+    duplicates: list[str] = field(default_factory=list)
+    errors: list[RowFailure] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def orders_per_second(self) -> float:
+        return self.received / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+def ingest(batch: Sequence[IncomingOrder]) -> IngestionReport:
+    """Store the orders of ``batch`` not seen before, with their items; bad ones are reported."""
+    stopwatch = Stopwatch()
+    for _ in range(MAX_ATTEMPTS):
+        report = IngestionReport(received=len(batch))
+        try:
+            _ingest(batch, report)
+        except IntegrityError:
+            # Outro envio do mesmo lote gravou parte dos pedidos entre a checagem e o INSERT.
+            continue
+        break
+    else:
+        # Nada foi gravado: reenviar o lote depois é seguro.
+        report = IngestionReport(received=len(batch))
+        msg = "Conflito com uma gravação concorrente; reenvie o lote"
+        report.errors = [
+            RowFailure(line, order.external_id, msg) for line, order in enumerate(batch, start=1)
+        ]
+    report.elapsed_seconds = stopwatch.elapsed
+    logger.info(
+        "Ingested %d/%d orders (%d duplicates, %d errors) at %.0f orders/s",
+        report.created,
+        report.received,
+        len(report.duplicates),
+        len(report.errors),
+        report.orders_per_second,
+    )
+    return report
+
+
+def _ingest(batch: Sequence[IncomingOrder], report: IngestionReport) -> None:
+    incoming = _new_orders(batch, report)
+    prices = dict(
+        Product.objects.filter(
+            pk__in={item.product_id for order in incoming.values() for item in order.items}
+        ).values_list("pk", "price")
+    )
+    customer_ids = set(
+        Customer.objects.filter(
+            pk__in={order.customer_id for order in incoming.values() if order.customer_id}
+        ).values_list("pk", flat=True)
+    )
+    store_ids = set(
+        Store.objects.filter(
+            pk__in={order.store_id for order in incoming.values() if order.store_id}
+        ).values_list("pk", flat=True)
+    )
+
+    orders: list[Order] = []
+    items: list[list[OrderItem]] = []
+    for line, order in enumerate(batch, start=1):
+        if incoming.get(order.external_id) is not order:
+            continue
+        try:
+            built, built_items = _build(order, prices, customer_ids, store_ids)
+        except ValueError as exc:
+            report.errors.append(RowFailure(line, order.external_id, str(exc)))
+            continue
+        orders.append(built)
+        items.append(built_items)
+    if not orders:
+        return
+
+    with transaction.atomic():
+        Order.objects.bulk_create(orders)
+        for order, order_items in zip(orders, items, strict=True):
+            for item in order_items:
+                item.order_id = order.pk
+        created_items = OrderItem.objects.bulk_create(
+            item for order_items in items for item in order_items
+        )
+        # bulk_create não dispara sinais: ``orders_changed`` sai depois do commit como nas
+        # gravações pelo ORM, e com ele os dias das vendas entram na fila da consolidação.
+        order_changes.add((order.sale_date, order.customer_id) for order in orders)
+    report.created = len(orders)
+    report.items_created = len(created_items)
+
+
+def _new_orders(
+    batch: Sequence[IncomingOrder], report: IngestionReport
+) -> dict[str, IncomingOrder]:
+    """First occurrence of every ``external_id`` not stored yet; the rest goes to the report."""
+    incoming: dict[str, IncomingOrder] = {}
+    for line, order in enumerate(batch, start=1):
+        if order.external_id in incoming:
+            report.duplicates.append(order.external_id)
+        elif not order.items:
+            report.errors.append(RowFailure(line, order.external_id, "Pedido sem itens"))
+        else:
+            incoming[order.external_id] = order
+    # Pedidos já arquivados também contam como recebidos (uma consulta só, com UNION).
+    existing = (
+        Order.objects.filter(external_id__in=incoming)
+        .order_by()
+        .values_list("external_id", flat=True)
+        .union(
+            ArchivedOrder.objects.filter(external_id__in=incoming)
+            .order_by()
+            .values_list("external_id", flat=True),
+            all=True,
+        )
+    )
+    for external_id in existing:
+        del incoming[external_id]
+        report.duplicates.append(external_id)
+    return incoming
+
+
+def _build(
+    order: IncomingOrder, prices: dict[int, Decimal], customer_ids: set[int], store_ids: set[int]
+) -> tuple[Order, list[OrderItem]]:
+    if order.customer_id and order.customer_id not in customer_ids:
+        msg = f"Cliente {order.customer_id} não encontrado"
+        raise ValueError(msg)
+    if order.store_id and order.store_id not in store_ids:
+        msg = f"Loja {order.store_id} não encontrada"
+        raise ValueError(msg)
+    missing = sorted({item.product_id for item in order.items} - prices.keys())
+    if missing:
+        msg = f"Produtos não encontrados: {missing}"
+        raise ValueError(msg)
+
+    items = [
+        OrderItem(
+            product_id=item.product_id,
+            quantity=item.quantity,
+            price=prices[item.product_id] if item.price is None else item.price,
+        )
+        for item in order.items
+    ]
+    total = order.total_amount
+    if total is None:
+        total = sum((item.quantity * item.price for item in items), Decimal(0))
+        total -= order.discount_applied
+    built = Order(
+        external_id=order.external_id,
+        customer_id=order.customer_id,
+        store_id=order.store_id,
+        sale_date=order.sale_date,
+        status=order.status,
+        discount_applied=order.discount_applied,
+        total_amount=total.quantize(CENT),
+    )
+    return built, items
@@ -0,0 +1,274 @@
+"""Daily sales rollups by store and by product, so reports never scan orders.
+
+A full refresh rebuilds both tables from every paid order, live or archived. An incremental
+refresh re-aggregates the days from the last run's ``sale_date`` watermark onwards (the
+watermark day included, as it may have been partial) plus the days queued in ``StaleSalesDay``
+by order changes below the watermark: late POS batches, status changes, edits. Affected days
+are deleted and rewritten in one transaction, so readers see either the old or the new totals
+of a day.
+"""
+
+from __future__ import annotations
+
+import logging
+import operator
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, time
+from decimal import Decimal
+from functools import reduce
+from itertools import batched
+from typing import TYPE_CHECKING, Literal
+
+from django.db import transaction
+from django.db.models import (
+    Count,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    Max,
+    Q,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Cast, NullIf, TruncDate
+from django.utils import timezone
+
+from sales.manager import MONEY, line_total
+from sales.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    DailyProductSales,
+    DailyStoreSales,
+    Order,
+    OrderItem,
+    SalesRollupRun,
+    StaleSalesDay,
+)
+from utils.perf import Stopwatch
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import date
+
+    from django.db.models import QuerySet
+
+    from sales.manager import OrderItemQuerySet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5_000
+LINE_TOTAL = line_total()
+# Desconto do pedido rateado pelos itens, na proporção do valor de cada um. A divisão é feita
+# em ponto flutuante porque o SQLite guarda valores redondos como INTEGER e truncaria o resultado;
+# a soma volta a ser decimal com duas casas.
+LINE_DISCOUNT = ExpressionWrapper(
+    Cast(LINE_TOTAL * F("order__discount_applied"), output_field=FloatField())
+    / NullIf(F("order__total_amount") + F("order__discount_applied"), Value(Decimal(0))),
+    output_field=FloatField(),
+)
+
+type Dimension = Literal["day", "store", "product", "category"]
+# Campo agrupado de cada dimensão; dia e loja saem da tabela por loja, que conta pedidos.
+DIMENSION_FIELDS: dict[Dimension, str] = {
+    "day": "day",
+    "store": "store_id",
+    "product": "product_id",
+    "category": "category_id",
+}
+
+
+@dataclass(slots=True)
+class RollupReport:
+    full: bool
+    days_refreshed: int = 0
+    rows_written: int = 0
+    sale_date_watermark: datetime | None = None
+    elapsed_seconds: float = 0.0
+
+
+def mark_stale(sale_dates: Iterable[datetime]) -> None:
+    """Queue the days of ``sale_dates`` for the next refresh, in one upsert.
+
+    Runs on ``orders_changed``, once per transaction. A day already queued keeps its row and gets
+    a new ``marked_at``, so a refresh that read the older mark leaves it for the next run.
+    """
+    days = {timezone.localdate(sale_date) for sale_date in sale_dates}
+    if days:
+        marked_at = timezone.now()
+        StaleSalesDay.objects.bulk_create(
+            [StaleSalesDay(day=day, marked_at=marked_at) for day in days],
+            update_conflicts=True,
+            unique_fields=["day"],
+            update_fields=["marked_at"],
+        )
+
+
+def refresh(*, full: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> RollupReport:
+    """Rebuild the affected days of both rollups; everything if ``full`` or never run."""
+    stopwatch = Stopwatch()
+    started_at = timezone.now()
+    last_run = SalesRollupRun.objects.first()
+    full = full or last_run is None or last_run.sale_date_watermark is None
+    watermark = Order.objects.aggregate(watermark=Max("sale_date"))["watermark"]
+    report = RollupReport(full=full, sale_date_watermark=watermark)
+    stale = list(StaleSalesDay.objects.values_list("day", "marked_at"))
+
+    sold = Q(status=Order.Status.PAID)
+    days = Q()
+    if not full:
+        since = timezone.localdate(last_run.sale_date_watermark)
+        stale_days = {day for day, _ in stale if day < since}
+        start = timezone.make_aware(datetime.combine(since, time.min))
+        sold &= Q(sale_date__gte=start) | Q(sale_date__date__in=stale_days)
+        days = Q(day__gte=since) | Q(day__in=stale_days)
+
+    with transaction.atomic():
+        DailyProductSales.objects.filter(days).delete()
+        DailyStoreSales.objects.filter(days).delete()
+        refreshed: set[date] = set()
+        # Pedidos arquivados continuam nos totais: cada tabela gera suas próprias linhas, que os
+        # relatórios somam.
+        for orders, items in (
+            (Order.objects.filter(sold), OrderItem.objects.all()),
+            (ArchivedOrder.objects.filter(sold), ArchivedOrderItem.objects.all()),
+        ):
+            report.rows_written += _write(orders, items, refreshed, chunk_size)
+        report.days_refreshed = len(refreshed)
+        # Só o que foi lido: dias marcados de novo durante a consolidação ficam para a próxima.
+        for marks in batched(stale, 500):
+            StaleSalesDay.objects.filter(
+                reduce(operator.or_, (Q(day=day, marked_at=marked_at) for day, marked_at in marks))
+            ).delete()
+        SalesRollupRun.objects.create(
+            full=full,
+            sale_date_watermark=watermark,
+            days_refreshed=report.days_refreshed,
+            rows_written=report.rows_written,
+            started_at=started_at,
+            finished_at=timezone.now(),
+        )
+
+    report.elapsed_seconds = stopwatch.elapsed
+    logger.info(
+        "Sales rollup (%s): %d days, %d rows in %.2fs",
+        "full" if full else "incremental",
+        report.days_refreshed,
+        report.rows_written,
+        report.elapsed_seconds,
+    )
+    return report
+
+
+def report(
+    dimension: Dimension,
+    period: tuple[date, date],
+    *,
+    store_id: int | None = None,
+    category_id: int | None = None,
+    limit: int | None = None,
+) -> list[dict[str, object]]:
+    """Totals per ``dimension`` over ``period`` (both days inclusive), from the rollups only.
+
+    Day and store totals come from the per-store table and include the order count; product
+    and category totals (or any filtered by category) come from the per-product table.
+    """
+    field = DIMENSION_FIELDS[dimension]
+    by_store = dimension in {"day", "store"} and category_id is None
+    rows: QuerySet[DailyStoreSales] | QuerySet[DailyProductSales] = (
+        DailyStoreSales.objects.all() if by_store else DailyProductSales.objects.all()
+    )
+    rows = rows.filter(day__range=period)
+    if store_id is not None:
+        rows = rows.filter(store_id=store_id)
+    if category_id is not None:
+        rows = rows.filter(category_id=category_id)
+    totals = {
+        "units": Sum("units"),
+        "gross_revenue": Sum("gross_revenue"),
+        "discount": Sum("discount"),
+        "revenue": Sum("revenue"),
+    }
+    if by_store:
+        totals["orders"] = Sum("orders")
+    rows = rows.order_by().values(field).annotate(**totals)
+    rows = rows.order_by(field) if dimension == "day" else rows.order_by("-revenue", field)
+    return list(rows[:limit] if limit else rows)
+
+
+def _write(
+    orders: QuerySet[Order] | QuerySet[ArchivedOrder],
+    items: OrderItemQuerySet,
+    days: set[date],
+    chunk_size: int,
+) -> int:
+    """Aggregate ``orders`` into both tables, adding their days to ``days``.
+
+    Returns the number of rows written.
+    """
+    units: Counter[tuple[date, int | None]] = Counter()
+    lines = (
+        items.filter(order__in=orders)
+        .annotate(day=TruncDate("order__sale_date"))
+        .order_by()
+        .values("day", "order__store_id", "product_id", "product__category_id")
+        .annotate(
+            units=Sum("quantity"),
+            gross=Sum(LINE_TOTAL),
+            discount=Cast(Sum(LINE_DISCOUNT, default=0.0), output_field=MONEY),
+        )
+        .values_list(
+            "day",
+            "order__store_id",
+            "product_id",
+            "product__category_id",
+            "units",
+            "gross",
+            "discount",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    written = 0
+    for chunk in batched(lines, chunk_size):
+        rollups = []
+        for day, store_id, product_id, category_id, quantity, gross, discount in chunk:
+            units[day, store_id] += quantity
+            rollups.append(
+                DailyProductSales(
+                    day=day,
+                    store_id=store_id,
+                    product_id=product_id,
+                    category_id=category_id,
+                    units=quantity,
+                    gross_revenue=gross,
+                    discount=discount,
+                    revenue=gross - discount,
+                )
+            )
+        written += len(DailyProductSales.objects.bulk_create(rollups))
+
+    totals = (
+        orders.annotate(day=TruncDate("sale_date"))
+        .order_by()
+        .values("day", "store_id")
+        .annotate(orders=Count("pk"), revenue=Sum("total_amount"), discount=Sum("discount_applied"))
+        .values_list("day", "store_id", "orders", "revenue", "discount")
+        .iterator(chunk_size=chunk_size)
+    )
+    for chunk in batched(totals, chunk_size):
+        rollups = []
+        for day, store_id, count, revenue, discount in chunk:
+            days.add(day)
+            rollups.append(
+                DailyStoreSales(
+                    day=day,
+                    store_id=store_id,
+                    orders=count,
+                    units=units[day, store_id],
+                    gross_revenue=revenue + discount,
+                    discount=discount,
+                    revenue=revenue,
+                )
+            )
+        written += len(DailyStoreSales.objects.bulk_create(rollups))
+    return written
@@ -0,0 +1,67 @@
+from datetime import datetime
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from sales.models import Order, OrderItem
+from sales.services import rollups
+from utils.transactions import CommitBatch
+
+# Enviado depois do commit, uma vez por transação, com as datas de venda (``sale_dates``) e os
+# clientes (``customer_ids``) dos pedidos criados, alterados ou excluídos nela, inclusive pela
+# ingestão em lote.
+orders_changed = Signal()
+
+# Pedido alterado: ``(sale_date, customer_id)`` quando a instância traz os dois, ou só o ID.
+type OrderChange = tuple[datetime, int | None] | int
+
+
+def _send_orders_changed(changes: set[OrderChange]) -> None:
+    # Itens e pedidos sem data utilizável entram pelo ID e são resolvidos numa consulta só.
+    known = {change for change in changes if isinstance(change, tuple)}
+    order_ids = changes - known
+    if order_ids:
+        known.update(Order.objects.filter(pk__in=order_ids).values_list("sale_date", "customer_id"))
+    if known:
+        orders_changed.send(
+            sender=Order,
+            sale_dates={sale_date for sale_date, _ in known},
+            customer_ids={customer_id for _, customer_id in known if customer_id is not None},
+        )
+
+
+order_changes = CommitBatch[OrderChange](_send_orders_changed)
+
+
+def _change(order: Order) -> OrderChange:
+    # A instância pode trazer a data como texto ou sem fuso: nesse caso vale o que foi gravado.
+    sale_date = order.sale_date
+    if isinstance(sale_date, datetime) and timezone.is_aware(sale_date):
+        return sale_date, order.customer_id
+    return order.pk
+
+
+@receiver(post_save, sender=Order, dispatch_uid="sales.orders_changed.order_saved")
+def record_saved_order(sender: type[Order], instance: Order, **kwargs: Any) -> None:
+    order_changes.add([_change(instance)])
+
+
+@receiver(post_delete, sender=Order, dispatch_uid="sales.orders_changed.order_deleted")
+def record_deleted_order(sender: type[Order], instance: Order, **kwargs: Any) -> None:
+    order_changes.add([(instance.sale_date, instance.customer_id)])
+
+
+@receiver(post_save, sender=OrderItem, dispatch_uid="sales.orders_changed.item_saved")
+def record_saved_item(sender: type[OrderItem], instance: OrderItem, **kwargs: Any) -> None:
+    # Sem receptor de post_delete para itens: a exclusão em cascata dos pedidos continua rápida.
+    if OrderItem.order.is_cached(instance):
+        order_changes.add([_change(instance.order)])
+    else:
+        order_changes.add([instance.order_id])
+
+
+@receiver(orders_changed, dispatch_uid="sales.rollups.orders_changed")
+def mark_changed_days(sender: type[Order], sale_dates: set[datetime], **kwargs: Any) -> None:
+    rollups.mark_stale(sale_dates)
@@ -1,3 +1,98 @@
+from collections.abc import Callable, Sequence
+from decimal import Decimal
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from catalog.models import Product
+from sales.models import Order, OrderItem
+from sales.services import ingestion
+from sales.services.ingestion import (
+    MAX_ATTEMPTS,
+    IncomingItem,
+    IncomingOrder,
+    IngestionReport,
+    ingest,
+)
+
+type NewOrders = Callable[[Sequence[IncomingOrder], IngestionReport], dict[str, IncomingOrder]]
+
+
+class OrderIngestionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.product = Product.objects.create(
+            name="Produto", description="", price=Decimal(10), sku="ING-1", barcode="ING-1"
+        )
+
+    def _order(self, external_id: str, product_id: int | None = None) -> IncomingOrder:
+        return IncomingOrder(
+            external_id=external_id,
+            sale_date=timezone.now(),
+            items=[IncomingItem(product_id=product_id or self.product.pk, quantity=2)],
+        )
+
+    def test_duplicates_are_reported_not_inserted(self) -> None:
+        ingest([self._order("ING-A")])
+
+        report = ingest([self._order("ING-A"), self._order("ING-B"), self._order("ING-B")])
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual(sorted(report.duplicates), ["ING-A", "ING-B"])
+        self.assertEqual(Order.objects.filter(external_id="ING-A").count(), 1)
+        self.assertEqual(OrderItem.objects.filter(order__external_id="ING-B").count(), 1)
+
+    def test_bad_row_does_not_abort_the_batch(self) -> None:
+        report = ingest([self._order("ING-A"), self._order("ING-X", product_id=999_999)])
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual([(error.line, error.key) for error in report.errors], [(2, "ING-X")])
+        self.assertEqual(Order.objects.get(external_id="ING-A").total_amount, Decimal(20))
+        self.assertFalse(Order.objects.filter(external_id="ING-X").exists())
+
+    def test_concurrent_insert_is_retried_as_duplicate(self) -> None:
+        batch = [self._order("ING-A"), self._order("ING-B")]
+        with mock.patch.object(
+            ingestion, "_new_orders", side_effect=self._racing_new_orders(steal=1)
+        ):
+            report = ingest(batch)
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.duplicates, ["ING-A"])
+        self.assertEqual(report.errors, [])
+        self.assertEqual(Order.objects.filter(external_id__in=["ING-A", "ING-B"]).count(), 2)
+
+    def test_persistent_race_reports_the_batch_as_conflict(self) -> None:
+        batch = [self._order(f"ING-{i}") for i in range(MAX_ATTEMPTS + 1)]
+        with mock.patch.object(
+            ingestion, "_new_orders", side_effect=self._racing_new_orders(steal=MAX_ATTEMPTS)
+        ):
+            report = ingest(batch)
+
+        self.assertEqual(report.created, 0)
+        self.assertEqual([error.key for error in report.errors], [o.external_id for o in batch])
+        # Só as gravações do concorrente ficaram no banco.
+        self.assertEqual(Order.objects.filter(external_id__startswith="ING-").count(), MAX_ATTEMPTS)
+
+    def _racing_new_orders(self, steal: int) -> NewOrders:
+        """``_new_orders`` with another writer storing the next order right after the check."""
+        new_orders = ingestion._new_orders  # noqa: SLF001
+        stolen = 0
+
+        def racing(
+            batch: Sequence[IncomingOrder], report: IngestionReport
+        ) -> dict[str, IncomingOrder]:
+            nonlocal stolen
+            incoming = new_orders(batch, report)
+            if stolen < steal and incoming:
+                order = next(iter(incoming.values()))
+                Order.objects.create(
+                    external_id=order.external_id,
+                    total_amount=Decimal(20),
+                    sale_date=order.sale_date,
+                )
+                stolen += 1
+            return incoming
 
-# Create your tests here.
+        return racing
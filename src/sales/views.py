@@ -1,3 +1,110 @@
-from django.shortcuts import render
+import logging
+from collections.abc import Iterable, Sequence
 
-# Create your views here.
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from ninja import Query
+from ninja_extra import ControllerBase, api_controller, http_get, http_post, paginate
+
+from sales.models import Order
+from sales.schemas import (
+    IngestBatchInput,
+    IngestionReportSchema,
+    OrderExportInput,
+    OrderSchema,
+    SalesReportInput,
+    SalesReportRowSchema,
+)
+from sales.services import export, ingestion, rollups
+from utils.pagination import CursorPage, KeysetPagination
+from utils.records import write_records
+
+logger = logging.getLogger(__name__)
+
+
+@api_controller("/orders", tags=["Vendas"])
+class OrderController(ControllerBase):
+    @http_get("", response=CursorPage[OrderSchema])
+    @paginate(KeysetPagination, ordering_field="sale_date")
+    def list_orders(self) -> QuerySet[Order]:
+        """Latest sales first, paginated by cursor.
+
+        Lists the live table only: orders past the archive horizon are read through ``/export``.
+        """
+        return Order.objects.all()
+
+    @http_post("/batch", response=IngestionReportSchema)
+    def ingest_batch(self, payload: IngestBatchInput) -> ingestion.IngestionReport:
+        """Store a POS batch in one transaction; orders already received are skipped."""
+        return ingestion.ingest(
+            [
+                ingestion.IncomingOrder(
+                    external_id=order.external_id,
+                    sale_date=order.sale_date,
+                    customer_id=order.customer_id,
+                    store_id=order.store_id,
+                    status=order.status,
+                    discount_applied=order.discount_applied,
+                    total_amount=order.total_amount,
+                    items=[
+                        ingestion.IncomingItem(item.product_id, item.quantity, item.price)
+                        for item in order.items
+                    ],
+                )
+                for order in payload.orders
+            ]
+        )
+
+    @http_get("/export", response={200: None})
+    def export_orders(self, query: Query[OrderExportInput]) -> StreamingHttpResponse:
+        """Orders of the period as CSV or NDJSON, streamed (gzip when the client accepts it)."""
+        rows = export.orders((query.start, query.end), query.status)
+        return _streaming_export(self.context.request, rows, export.ORDER_FIELDS, query, "pedidos")
+
+    @http_get("/export/items", response={200: None})
+    def export_items(self, query: Query[OrderExportInput]) -> StreamingHttpResponse:
+        """Items of the same orders as ``/export``, one line each with its line total."""
+        rows = export.items((query.start, query.end), query.status)
+        return _streaming_export(
+            self.context.request, rows, export.ITEM_FIELDS, query, "itens-pedidos"
+        )
+
+
+@api_controller("/reports/sales", tags=["Relatórios"])
+class SalesReportController(ControllerBase):
+    @http_get("", response=list[SalesReportRowSchema])
+    def sales_report(self, query: Query[SalesReportInput]) -> list[dict[str, object]]:
+        """Revenue, discount and units per day, store, product or category, from the daily rollups.
+
+        Totals reflect the last rollup refresh, not orders stored since then.
+        """
+        return rollups.report(
+            query.dimension,
+            (query.start, query.end),
+            store_id=query.store_id,
+            category_id=query.category_id,
+            limit=query.limit,
+        )
+
+
+def _streaming_export(
+    request: HttpRequest,
+    rows: Iterable[Sequence[object]],
+    fields: Sequence[str],
+    query: OrderExportInput,
+    name: str,
+) -> StreamingHttpResponse:
+    content = write_records(rows, fields, query.fmt)
+    gzipped = "gzip" in request.headers.get("Accept-Encoding", "")
+    response = StreamingHttpResponse(
+        compress_sequence(content) if gzipped else content,
+        content_type=f"{query.fmt.content_type}; charset=utf-8",
+    )
+    if gzipped:
+        response.headers["Content-Encoding"] = "gzip"
+    patch_vary_headers(response, ["Accept-Encoding"])
+    filename = f"{name}-{query.start}-{query.end}.{query.fmt}"
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,100 @@
+"""Bloom filter: a compact set that can answer "certainly absent" without the original keys.
+
+Sized from the expected number of keys and the target false-positive rate. Each key is hashed
+once with BLAKE2b; the ``k`` bit positions come from double hashing (``h1 + i * h2``), so bulk
+loads run as a few NumPy operations over all keys at once. Keys can be added but never removed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+MASK64 = (1 << 64) - 1
+
+
+@dataclass(slots=True, frozen=True)
+class BloomStats:
+    items: int
+    capacity: int
+    bits: int
+    hashes: int
+    size_bytes: int
+    fill_ratio: float
+    target_error_rate: float
+
+    @property
+    def expected_error_rate(self) -> float:
+        """False-positive probability at the current fill: every probed bit already set."""
+        return self.fill_ratio**self.hashes
+
+
+def _digests(keys: Iterable[str]) -> np.ndarray:
+    raw = b"".join(hashlib.blake2b(key.encode(), digest_size=16).digest() for key in keys)
+    return np.frombuffer(raw, dtype="<u8").reshape(-1, 2)
+
+
+class BloomFilter:
+    """Thread-safe for concurrent readers and writers; ``in`` never takes the lock."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if not 0 < error_rate < 1:
+            msg = "error_rate must be between 0 and 1"
+            raise ValueError(msg)
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.bits = max(64, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / self.capacity * math.log(2)))
+        self.items = 0
+        self._array = bytearray((self.bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.items
+
+    def __contains__(self, key: str) -> bool:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        array, bits = self._array, self.bits
+        for i in range(self.hashes):
+            position = ((h1 + i * h2) & MASK64) % bits
+            if not array[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    def add(self, key: str) -> None:
+        self.update([key])
+
+    def update(self, keys: Iterable[str]) -> None:
+        digests = _digests(keys)
+        if not len(digests):
+            return
+        h1, h2 = digests[:, :1], digests[:, 1:] | np.uint64(1)
+        # Aritmética em uint64 dá a volta em 2**64, igual ao ``& MASK64`` da consulta.
+        positions = (h1 + np.arange(self.hashes, dtype=np.uint64) * h2) % np.uint64(self.bits)
+        positions = positions.ravel()
+        masks = np.left_shift(1, positions & np.uint64(7)).astype(np.uint8)
+        with self._lock:
+            np.bitwise_or.at(np.frombuffer(self._array, dtype=np.uint8), positions >> 3, masks)
+            self.items += len(digests)
+
+    def stats(self) -> BloomStats:
+        set_bits = int(np.unpackbits(np.frombuffer(self._array, dtype=np.uint8)).sum())
+        return BloomStats(
+            items=self.items,
+            capacity=self.capacity,
+            bits=self.bits,
+            hashes=self.hashes,
+            size_bytes=len(self._array),
+            fill_ratio=set_bits / self.bits,
+            target_error_rate=self.error_rate,
+        )
@@ -0,0 +1,9 @@
+from django.utils.translation import gettext_lazy as _
+from ninja_extra import status
+from ninja_extra.exceptions import APIException
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = _("O recurso está em um estado que não permite esta operação.")
+    default_code = "conflict"
@@ -0,0 +1,62 @@
+"""Password hashing spread over a process pool.
+
+PBKDF2 is pure CPU work under the GIL, so threads do not help: ``make_password`` runs in
+worker processes and only the resulting strings travel back.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Self
+
+from django.contrib.auth.hashers import make_password
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from types import TracebackType
+
+
+def _setup_worker() -> None:
+    # Under spawn/forkserver the worker is a fresh interpreter; DJANGO_SETTINGS_MODULE is
+    # inherited from the parent environment.
+    import django  # noqa: PLC0415
+
+    django.setup()
+
+
+def _hash(password: str) -> str:
+    return make_password(password)
+
+
+class PasswordHasherPool:
+    """Hash batches of passwords with ``workers`` processes (``1`` hashes in-process).
+
+    Use it as a context manager so the pool is started once and reused across batches.
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> Self:
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_setup_worker)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def hash(self, passwords: Sequence[str]) -> list[str]:
+        if self._pool is None:
+            return [_hash(password) for password in passwords]
+        # A few tasks per worker keeps them all busy without paying IPC per password.
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._pool.map(_hash, passwords, chunksize=chunksize))
@@ -0,0 +1,30 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+
+@dataclass(slots=True)
+class Stopwatch:
+    """Monotonic wall clock for throughput reports (rows/s, orders/s, codes/s)."""
+
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def rate(self, count: int) -> float:
+        """Items per second since the stopwatch started (0.0 before any time has passed)."""
+        elapsed = self.elapsed
+        return count / elapsed if elapsed > 0 else 0.0
+
+
+@contextmanager
+def throwaway_transaction() -> Iterator[None]:
+    """Run a benchmark inside a transaction that is always rolled back, seeded rows included."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
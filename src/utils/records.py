@@ -0,0 +1,126 @@
+"""Lazy CSV/NDJSON readers and writers shared by the bulk import and export paths."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from enum import StrEnum
+from itertools import batched
+from typing import IO, TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+# Only the first errors are kept with their row numbers; the rest are just counted.
+MAX_REPORTED_ERRORS = 1_000
+# Linhas por bloco de bytes na escrita: poucas escritas no socket sem acumular o arquivo.
+ROWS_PER_CHUNK = 500
+
+
+class ImportFormat(StrEnum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+    @property
+    def content_type(self) -> str:
+        return "text/csv" if self is ImportFormat.CSV else "application/x-ndjson"
+
+    @classmethod
+    def from_filename(cls, filename: str) -> ImportFormat:
+        """Guess the format from the file extension (.ndjson/.jsonl, anything else is CSV)."""
+        lowered = filename.lower()
+        if lowered.endswith((".ndjson", ".jsonl")):
+            return cls.NDJSON
+        return cls.CSV
+
+
+class RowError(Exception):
+    """A single input row that cannot be imported; the rest of the chunk still goes in."""
+
+
+@dataclass(slots=True)
+class RowFailure:
+    line: int
+    key: str
+    message: str
+
+
+def iter_records(stream: IO[str], fmt: ImportFormat) -> Iterator[tuple[int, dict[str, Any]]]:
+    """Yield ``(line_number, record)`` lazily; only the current line is held in memory.
+
+    Unparseable NDJSON lines are yielded as ``{"__error__": message}`` so callers can report
+    them as row errors instead of aborting the stream.
+    """
+    if fmt is ImportFormat.CSV:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_number, raw in enumerate(stream, start=1):
+        stripped = raw.strip()
+        if not stripped:
+            continue
+        try:
+            record = json.loads(stripped)
+        except json.JSONDecodeError as exc:
+            yield line_number, {"__error__": f"JSON inválido: {exc.msg}"}
+            continue
+        if not isinstance(record, dict):
+            yield line_number, {"__error__": "Cada linha deve ser um objeto JSON"}
+            continue
+        yield line_number, record
+
+
+def text(record: dict[str, Any], key: str) -> str:
+    value = record.get(key)
+    return "" if value is None else str(value).strip()
+
+
+def write_records(
+    rows: Iterable[Sequence[Any]],
+    fields: Sequence[str],
+    fmt: ImportFormat,
+    *,
+    rows_per_chunk: int = ROWS_PER_CHUNK,
+) -> Iterator[bytes]:
+    """Encode ``rows`` lazily as UTF-8 CSV (with a header) or NDJSON objects keyed by ``fields``.
+
+    Yields one ``bytes`` block per ``rows_per_chunk`` rows; only the current block is held.
+    Dates become ISO 8601 and decimals keep their exact digits (as strings in NDJSON).
+    """
+    buffer = io.StringIO()
+    if fmt is ImportFormat.CSV:
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(fields)
+
+        def write(row: Sequence[Any]) -> None:
+            writer.writerow([_plain(value) for value in row])
+
+    else:
+
+        def write(row: Sequence[Any]) -> None:
+            record = dict(zip(fields, row, strict=True))
+            buffer.write(json.dumps(record, default=_plain, ensure_ascii=False))
+            buffer.write("\n")
+
+    for chunk in batched(rows, rows_per_chunk):
+        for row in chunk:
+            write(row)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Só o cabeçalho do CSV, quando não há linhas.
+        yield buffer.getvalue().encode()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
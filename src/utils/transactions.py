@@ -0,0 +1,47 @@
+"""Work deferred to the end of a transaction, batched so it runs once per commit."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+
+@dataclass(slots=True, eq=False)
+class _Flush[T]:
+    batch: CommitBatch[T]
+    values: set[T] = field(default_factory=set)
+
+    def __call__(self) -> None:
+        self.batch.flush(self.values)
+
+
+class CommitBatch[T]:
+    """Values gathered during a transaction and handed to ``flush`` once, after it commits.
+
+    The first :meth:`add` of a transaction registers one ``on_commit`` callback; later adds join
+    its set, so a transaction that saves a thousand rows still flushes once. The set lives in the
+    callback itself: if the transaction (or the savepoint that registered it) rolls back, the
+    values go with it. Adds inside a savepoint get their own callback for the same reason. Outside
+    ``atomic`` the flush runs at once, like ``on_commit``.
+    """
+
+    def __init__(self, flush: Callable[[set[T]], None], using: str = DEFAULT_DB_ALIAS) -> None:
+        self.flush = flush
+        self.using = using
+
+    def add(self, values: Iterable[T]) -> None:
+        values = set(values)
+        if not values:
+            return
+        connection = transaction.get_connection(self.using)
+        savepoints = set(connection.savepoint_ids)
+        for sids, callback, _ in connection.run_on_commit:
+            if isinstance(callback, _Flush) and callback.batch is self and sids == savepoints:
+                callback.values |= values
+                return
+        transaction.on_commit(_Flush(self, values), using=self.using)